@@ -0,0 +1,45 @@
+"""
+Micro-benchmark of cassette recording, opening and lookups.
+
+    python -m benchmarks.bench_cassette --count 50000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from fixtures.cassette import Cassette
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=50000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "cassette")
+    body = json.dumps({"id": 1, "name": "doggie", "status": "available"}).encode()
+    headers = {"Content-Type": "application/json"}
+
+    start = time.perf_counter()
+    cassette = Cassette(path, mode="record")
+    for i in range(args.count):
+        cassette.record("GET", f"http://host/v2/pet/{i}", None, 200, headers, body)
+    cassette.close()
+    print(f"{'record':<10} {time.perf_counter() - start:>8.3f}s")
+
+    start = time.perf_counter()
+    cassette = Cassette(path, mode="replay")
+    print(f"{'open':<10} {time.perf_counter() - start:>8.3f}s")
+
+    start = time.perf_counter()
+    for i in range(args.count):
+        cassette.play("GET", f"http://host/v2/pet/{i}")
+    elapsed = time.perf_counter() - start
+    print(f"{'lookup':<10} {elapsed:>8.3f}s {args.count / elapsed:>14,.0f} lookups/sec")
+    cassette.close()
+
+
+if __name__ == "__main__":
+    main()
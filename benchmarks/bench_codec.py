@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of JSON encoding and decoding of large pet payloads.
+
+Compares the previous handling (requests encodes with stdlib json, the response is
+decoded by the request log, the response log and Validator.structure) with one shared
+decode per body, for every available codec.
+
+    python -m benchmarks.bench_codec --count 200 --pets 500
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.bench_converter import make_payloads
+from common import codec as codecs
+from common.codec import CODECS
+
+
+class Message:
+    """
+    Stand-in for a Response: only the attributes codec.decode reads
+    """
+
+    status_code = 200
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+def measure(label: str, func, count: int) -> float:
+    start = time.process_time()
+    for _ in range(count):
+        func()
+    elapsed = time.process_time() - start
+    print(f"{label:<44} {elapsed * 1000 / count:>10.3f} ms CPU/exchange")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200, help="exchanges to measure")
+    parser.add_argument("--pets", type=int, default=500, help="pets per body")
+    args = parser.parse_args()
+
+    payload = make_payloads(args.pets)
+    content = json.dumps(payload).encode("utf-8")
+    print(
+        f"{args.count} exchanges of {args.pets} pets ({len(content):,} bytes per body)"
+    )
+
+    def previous():
+        body = json.dumps(payload).encode("utf-8")
+        json.loads(body)  # Request log
+        json.loads(content)  # Response log
+        json.loads(content)  # Validator.structure
+
+    baseline = measure("stdlib, decoded three times", previous, args.count)
+    for name, cls in CODECS.items():
+        try:
+            codecs.codec = cls()
+        except ImportError:
+            print(f"{name:<44} {'not installed':>10}")
+            continue
+
+        def shared():
+            codecs.codec.dumps(payload)  # The request log reuses the payload
+            message = Message(content)
+            codecs.decode(message)  # Response log
+            codecs.decode(message)  # Validator.structure, from the cache
+
+        elapsed = measure(f"{name}, decoded once", shared, args.count)
+        print(f"{'':<44} {1 - elapsed / baseline:>10.0%} CPU saved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Micro-benchmark of OpenAPI contract validation of response bodies.
+
+    python -m benchmarks.bench_contract --count 20000
+"""
+
+import argparse
+import time
+
+from fixtures.contract import Contract
+from fixtures.factory import ModelFactory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    contract = Contract.load()
+    print(f"{'load':<10} {time.perf_counter() - start:>8.3f}s")
+
+    factory = ModelFactory(seed=1)
+    cases = {
+        "pet": ("GET", "/pet/1", factory.pets(args.count)),
+        "order": ("GET", "/store/order/1", factory.orders(args.count)),
+        "user": ("GET", "/user/name", factory.users(args.count)),
+    }
+    for name, (method, path, objects) in cases.items():
+        bodies = [obj.to_dict() for obj in objects]
+        start = time.perf_counter()
+        for body in bodies:
+            contract.violations_of(method, path, 200, body)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} {elapsed:>8.3f}s {args.count / elapsed:>14,.0f} bodies/sec")
+
+
+if __name__ == "__main__":
+    main()
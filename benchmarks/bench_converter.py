@@ -0,0 +1,73 @@
+"""
+Micro-benchmark of response structuring and model unstructuring.
+
+    python -m benchmarks.bench_converter --count 20000
+"""
+
+import argparse
+import time
+
+import attr
+import cattr
+
+from fixtures.converter import structure, unstructure
+from fixtures.petstore.pet.model import Category, Pet
+
+
+def make_payloads(count: int) -> list:
+    return [
+        {
+            "id": index,
+            "category": {"id": index % 10, "name": f"category-{index % 10}"},
+            "name": f"pet-{index}",
+            "photoUrls": [f"https://example.com/{index}.jpg"],
+            "tags": [{"id": 1, "name": "bench"}],
+            "status": "available",
+        }
+        for index in range(count)
+    ]
+
+
+def measure(label: str, func, items: list) -> float:
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - start
+    rate = len(items) / elapsed
+    print(f"{label:<40} {rate:>14,.0f} objects/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.count)
+    pets = [
+        Pet(
+            id=index,
+            category=Category(id=1, name="bench"),
+            name=f"pet-{index}",
+            photoUrls=[],
+            tags=[],
+        )
+        for index in range(args.count)
+    ]
+
+    print(f"Structuring {args.count} Pet payloads")
+    measure(
+        "cattr.structure (global converter)",
+        lambda p: cattr.structure(p, Pet),
+        payloads,
+    )
+    measure("fixtures.converter.structure", lambda p: structure(p, Pet), payloads)
+
+    print(f"Unstructuring {args.count} Pet objects")
+    measure("attr.asdict", attr.asdict, pets)
+    measure("fixtures.converter.unstructure", unstructure, pets)
+    measure("Pet.to_dict", Pet.to_dict, pets)
+
+
+if __name__ == "__main__":
+    main()
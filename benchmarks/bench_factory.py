@@ -0,0 +1,32 @@
+"""
+Micro-benchmark of bulk test-data generation.
+
+    python -m benchmarks.bench_factory --count 100000
+"""
+
+import argparse
+import time
+
+from fixtures.factory import ModelFactory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    factory = ModelFactory(seed=args.seed)
+    start = time.perf_counter()
+    factory.pools
+    print(f"{'value pools':<10} {time.perf_counter() - start:>8.3f}s")
+
+    for kind in ("pets", "orders", "users"):
+        start = time.perf_counter()
+        getattr(factory, kind)(args.count)
+        elapsed = time.perf_counter() - start
+        print(f"{kind:<10} {elapsed:>8.3f}s {args.count / elapsed:>14,.0f} objects/sec")
+
+
+if __name__ == "__main__":
+    main()
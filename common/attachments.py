@@ -0,0 +1,192 @@
+import gzip
+import hashlib
+import logging
+import queue
+import threading
+from uuid import uuid4
+
+from allure_commons import plugin_manager
+from allure_commons.types import AttachmentType
+
+logger = logging.getLogger("api")
+
+# Bodies larger than this (in bytes) are cut before they are attached (0 disables the limit)
+MAX_SIZE = 64 * 1024
+# Bodies larger than this (in bytes) are stored gzip-compressed (0 disables compression)
+COMPRESS_OVER = 0
+# Attachments waiting for the writer thread; attach() blocks while the queue is full
+QUEUE_SIZE = 64
+
+_TRUNCATED = "\n... [truncated {} bytes]"
+
+
+def _allure_reporter():
+    """
+    Returns the AllureReporter of the running allure-pytest plugin, None without --alluredir
+    """
+    for plugin in plugin_manager.get_plugins():
+        reporter = getattr(plugin, "allure_logger", None)
+        if reporter is not None:
+            return reporter
+    return None
+
+
+def _report_attached_data(body: bytes, file_name: str):
+    plugin_manager.hook.report_attached_data(body=body, file_name=file_name)
+
+
+class AttachmentWriter:
+    def __init__(
+        self,
+        max_size: int = MAX_SIZE,
+        compress_over: int = COMPRESS_OVER,
+        queue_size: int = QUEUE_SIZE,
+        reporter=_allure_reporter,
+        write=_report_attached_data,
+    ):
+        """
+        Attaches bodies to the Allure report without writing them on the test thread.
+        The attachment entry is added to the current step immediately, the file is written by
+        a background thread. A body whose content was attached before is not written again:
+        the new entry points at the existing file.
+        :param max_size: Bytes kept per attachment (0 disables the limit).
+        :param compress_over: Bodies larger than this are stored as .gz (0 disables compression).
+        :param queue_size: Files waiting to be written before attach() blocks.
+        :param reporter: Returns the AllureReporter to add entries to, or None.
+        :param write: Writes (body, file name) into the results directory.
+        """
+        self.max_size = max_size
+        self.compress_over = compress_over
+        self.reporter = reporter
+        self.write = write
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.thread = None
+        self.written = {}
+        self.attached = 0
+        self.deduplicated = 0
+        self.truncated = 0
+        self.compressed = 0
+        self.failed = 0
+        self.bytes_written = 0
+
+    def attach(self, body, name: str = None, attachment_type=None, extension=None):
+        """
+        Attaches a body to the current test step, same arguments as allure.attach
+        :param body: str or bytes.
+        :param name: Attachment name shown in the report.
+        :param attachment_type: allure.attachment_type member or a MIME type.
+        :param extension: File extension when attachment_type is a MIME type.
+        """
+        reporter = self.reporter()
+        if reporter is None:
+            return
+        mime_type, extension = attachment_type, extension or "attach"
+        if isinstance(attachment_type, AttachmentType):
+            mime_type, extension = attachment_type.mime_type, attachment_type.extension
+
+        data = self._truncate(body)
+        if self.compress_over and len(data) > self.compress_over:
+            data = gzip.compress(data, compresslevel=5)
+            mime_type, extension = "application/gzip", f"{extension}.gz"
+            name = f"{name} (gzip)" if name else name
+            with self.lock:
+                self.compressed += 1
+
+        digest = hashlib.sha1(data)
+        digest.update(extension.encode("utf-8"))
+        with self.lock:
+            self.attached += 1
+            uuid = self.written.get(digest.digest())
+            duplicate = uuid is not None
+            if duplicate:
+                self.deduplicated += 1
+            else:
+                uuid = self.written[digest.digest()] = uuid4()
+        # The same uuid yields the same file name, so a duplicate reuses the written file
+        file_name = reporter._attach(
+            uuid, name=name, attachment_type=mime_type, extension=extension
+        )
+        if not duplicate:
+            self._start()
+            self.queue.put((data, file_name))
+
+    def _truncate(self, body) -> bytes:
+        if body is None:
+            body = b""
+        elif isinstance(body, str):
+            body = body.encode("utf-8")
+        if not self.max_size or len(body) <= self.max_size:
+            return body
+        with self.lock:
+            self.truncated += 1
+        # Decoding with "ignore" drops a multi-byte character cut in half
+        kept = body[: self.max_size].decode("utf-8", "ignore").encode("utf-8")
+        return kept + _TRUNCATED.format(len(body) - len(kept)).encode("utf-8")
+
+    def _start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self._run, name="allure-attachments", daemon=True
+                )
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            data, file_name = self.queue.get()
+            try:
+                self.write(data, file_name)
+                self.bytes_written += len(data)
+            except Exception:
+                self.failed += 1
+                logger.exception("could not write attachment %s", file_name)
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """
+        Blocks until every queued attachment is written
+        """
+        if self.thread is not None:
+            self.queue.join()
+
+    def stats(self) -> dict:
+        return {
+            "attached": self.attached,
+            "deduplicated": self.deduplicated,
+            "truncated": self.truncated,
+            "compressed": self.compressed,
+            "failed": self.failed,
+            "bytes written": self.bytes_written,
+        }
+
+
+writer = AttachmentWriter()
+
+
+def configure(max_size: int = None, compress_over: int = None, queue_size: int = None):
+    """
+    Configures the attachment writer
+    :param max_size: Bytes kept per attachment (0 disables the limit).
+    :param compress_over: Bodies larger than this are stored as .gz (0 disables compression).
+    :param queue_size: Files waiting to be written before attach() blocks.
+    """
+    global writer
+    writer.flush()
+    writer = AttachmentWriter(
+        max_size=writer.max_size if max_size is None else max_size,
+        compress_over=writer.compress_over if compress_over is None else compress_over,
+        queue_size=writer.queue.maxsize if queue_size is None else queue_size,
+    )
+
+
+def attach(body, name: str = None, attachment_type=None, extension=None):
+    """
+    Drop-in replacement for allure.attach, see AttachmentWriter.attach
+    """
+    writer.attach(body, name=name, attachment_type=attachment_type, extension=extension)
+
+
+def flush():
+    writer.flush()
@@ -0,0 +1,114 @@
+import json
+
+# Attribute the decoded body is kept under on a Response or PreparedRequest
+_DECODED = "_decoded_json"
+_UNSET = object()
+
+
+class StdlibCodec:
+    """
+    JSON codec backed by the standard library
+    """
+
+    name = "stdlib"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """
+    JSON codec backed by orjson (optional dependency)
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, obj) -> bytes:
+        return self._dumps(obj)
+
+    def loads(self, data):
+        return self._loads(data)
+
+
+CODECS = {"stdlib": StdlibCodec, "orjson": OrjsonCodec}
+
+codec = StdlibCodec()
+
+
+def configure(name: str = None):
+    """
+    Selects the JSON codec used for request bodies, response decoding and logging
+    :param name: "stdlib", "orjson" or "auto" (orjson when it is installed).
+    """
+    global codec
+    if name is None:
+        return
+    if name == "auto":
+        try:
+            codec = OrjsonCodec()
+        except ImportError:
+            codec = StdlibCodec()
+        return
+    if name not in CODECS:
+        raise ValueError(
+            f"Unknown JSON codec {name!r}, expected one of: auto, {', '.join(CODECS)}"
+        )
+    codec = CODECS[name]()
+
+
+def encode_json_argument(kwargs: dict, body_argument: str = "data"):
+    """
+    Replaces the json keyword argument of a request with a body encoded by the codec
+    :param kwargs: Request keyword arguments, modified in place.
+    :param body_argument: Keyword the HTTP library takes raw bytes under ("data", "content").
+    :return: The original object, None when the request has no JSON body.
+    """
+    payload = kwargs.pop("json", None)
+    if payload is None:
+        return None
+    kwargs[body_argument] = codec.dumps(payload)
+    kwargs["headers"] = {
+        "Content-Type": "application/json",
+        **kwargs.get("headers", {}),
+    }
+    return payload
+
+
+def remember(message, decoded):
+    """
+    Stores the decoded body of a Response or PreparedRequest, e.g. the object a request
+    body was encoded from, so decode() does not parse it again
+    """
+    setattr(message, _DECODED, decoded)
+
+
+def forget(message):
+    """
+    Drops the decoded body, e.g. from a copy that must not share it with the original
+    """
+    message.__dict__.pop(_DECODED, None)
+
+
+def decode(message):
+    """
+    Decodes the JSON body of a Response (content) or PreparedRequest (body) once; later
+    calls for the same object return the same decoded value
+    :raises ValueError: The body is not valid JSON.
+    """
+    decoded = getattr(message, _DECODED, _UNSET)
+    if decoded is _UNSET:
+        body = message.content if hasattr(message, "status_code") else message.body
+        decoded = codec.loads(body)
+        setattr(message, _DECODED, decoded)
+    return decoded
@@ -1,61 +1,164 @@
+import inspect
 import json
 import logging
-import pprint
 from functools import wraps
-from json import JSONDecodeError
+
+from requests import Response
+
+from common import codec
 
 logger = logging.getLogger("api")
 
+INFO = logging.INFO
+
+# Bodies longer than this (in characters) are cut before they are formatted
+MAX_BODY_LENGTH = 2000
+# Emit single-line key=value records instead of pretty-printed bodies
+STRUCTURED = False
+
+
+def configure(max_body_length: int = None, structured: bool = None):
+    """
+    Configures the request logging
+    :param max_body_length: Maximum number of body characters written per record (0 disables the limit).
+    :param structured: Emit key=value records instead of pretty-printed ones.
+    """
+    global MAX_BODY_LENGTH, STRUCTURED
+    if max_body_length is not None:
+        MAX_BODY_LENGTH = max_body_length
+    if structured is not None:
+        STRUCTURED = structured
+
+
+def _format_body(body, pretty: bool, message=None):
+    """
+    Decodes and (when it fits the size cap) pretty-prints a request or response body
+    :param body: bytes, str or None
+    :param pretty: Indent JSON bodies
+    :param message: Response or PreparedRequest the body belongs to; its decoded JSON is
+        shared with validation instead of being parsed again.
+    :return: str or None
+    """
+    if not body:
+        return None
+    truncated = MAX_BODY_LENGTH and len(body) > MAX_BODY_LENGTH
+    if truncated:
+        body = body[:MAX_BODY_LENGTH]
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    if truncated:
+        return f"{body}..."
+    if pretty and len(body) > 20:
+        try:
+            decoded = codec.decode(message) if message is not None else json.loads(body)
+            return "\n" + json.dumps(decoded, indent=4, ensure_ascii=False)
+        except ValueError:
+            pass
+    return body
+
+
+class _Record:
+    """
+    Lazily formatted log record: the formatting only runs when a handler emits it
+    """
+
+    __slots__ = ("res", "is_request", "streamed")
+
+    def __init__(self, res, is_request: bool, streamed: bool = False):
+        self.res = res
+        self.is_request = is_request
+        self.streamed = streamed
+
+    def __str__(self):
+        res = self.res
+        fields = {
+            "event": "request" if self.is_request else "response",
+            "method": res.request.method,
+            "url": res.request.url,
+        }
+        if self.is_request:
+            message = res.request
+            body = message.body
+        else:
+            fields["status"] = res.status_code
+            fields["elapsed_ms"] = round(res.elapsed.total_seconds() * 1000, 1)
+            message = res
+            # A streamed body belongs to the caller, reading it here would consume it
+            body = None if self.streamed else res.content
+        fields["body"] = _format_body(body, pretty=not STRUCTURED, message=message)
+
+        if STRUCTURED:
+            return " ".join(
+                f"{key}={json.dumps(value, ensure_ascii=False) if isinstance(value, str) else value}"
+                for key, value in fields.items()
+                if value is not None
+            )
+
+        text = f"{'Request' if self.is_request else 'Response'} method: {fields['method']}, url: {fields['url']}"
+        if not self.is_request:
+            text += f", status: {fields['status']}"
+        if fields["body"] is not None:
+            separator = "" if fields["body"].startswith("\n") else " "
+            text += f", body:{separator}{fields['body']}"
+        return text
+
+
+def _log_exchange(res, streamed: bool = False):
+    """
+    Logs the request and the response of a finished call
+    :param res: response
+    :param streamed: Log the response line only, its body is still being read
+    """
+    if not logger.isEnabledFor(INFO):
+        return
+    logger.info("%s", _Record(res, is_request=True))
+    logger.info("%s", _Record(res, is_request=False, streamed=streamed))
+
 
 def logging(message):
     """
     Request Logging
+    Works for regular, async (coroutine) and generator API helpers. Nothing is formatted
+    unless the "api" logger is enabled for INFO and a handler emits the record.
     :return: response
     """
 
     def wrapper(function):
+        if inspect.isgeneratorfunction(function):
+
+            @wraps(function)
+            def generator_inner(*args, **kwargs):
+                # The helper yields its streamed response first; it is logged without the
+                # body, which the caller consumes, and not passed on
+                logger.info(message)
+                items = function(*args, **kwargs)
+                try:
+                    for item in items:
+                        if isinstance(item, Response):
+                            _log_exchange(item, streamed=True)
+                            continue
+                        yield item
+                finally:
+                    items.close()
+
+            return generator_inner
+
+        if inspect.iscoroutinefunction(function):
+
+            @wraps(function)
+            async def async_inner(*args, **kwargs):
+                logger.info(message)
+                res = await function(*args, **kwargs)
+                _log_exchange(res)
+                return res
+
+            return async_inner
+
         @wraps(function)
         def inner(*args, **kwargs):
             logger.info(message)
             res = function(*args, **kwargs)
-            method = res.request.method
-            url = res.request.url
-            body = res.request.body
-            status = res.status_code
-            body_sep = " "
-            log_request = f"Request method: {method}, url: {url}"
-            if body is not None:
-                try:
-                    json_body = json.dumps(
-                        json.loads(body.decode("utf-8")), indent=4, ensure_ascii=False
-                    )
-                    if len(body) > 20:
-                        body_sep = "\n"
-                    log_request += (
-                        f", body:{body_sep}{json_body or pprint.pformat(body)}"
-                    )
-                except AttributeError:
-                    log_request += f", body:{body}"
-            logger.info(log_request)
-
-            log_response = f"Response method: {method}, url: {url}, status: {status}"
-            try:
-                body = res.json()
-                if len(res.content) > 20:
-                    body_sep = "\n"
-                    bd = json.dumps(body, indent=4, ensure_ascii=False)
-                    log_response += f", body:{body_sep}{bd}"
-                else:
-                    log_response += f", body:{json.dumps(body)}"
-                logger.info(log_response)
-
-            except JSONDecodeError:
-                if len(res.text) > 120:
-                    log_response += f", body: {res.text[:120]}..."
-                else:
-                    log_response += f", body: {res.text}"
-                logger.info(log_response)
-
+            _log_exchange(res)
             return res
 
         return inner
@@ -1,6 +1,32 @@
+import json
+
+import allure
 import pytest
 
+from common import attachments, codec, deco
+from fixtures import factory
 from fixtures.app import Application
+from fixtures.cache import ResponseCache
+from fixtures.contract import DEFAULT_SPEC, Contract
+from fixtures.cassette import (
+    AsyncCassetteTransport,
+    Cassette,
+    CassetteAdapter,
+    CassetteMiss,
+)
+from fixtures.pool import EntityPool
+from fixtures.ratelimit import RateLimiter, default_state_file
+from fixtures.petstore.server import AsyncLocalTransport, LocalAdapter, PetstoreServer
+from fixtures.requests import AsyncClient, Client
+from fixtures.resilience import CircuitBreaker, RetryBudget, RetryPolicy
+from fixtures.resolver import Resolver
+from fixtures.waiter import Waiter
+
+pytest_plugins = [
+    "fixtures.plugins.benchmark",
+    "fixtures.plugins.client_stats",
+    "fixtures.plugins.durations",
+]
 
 
 def pytest_addoption(parser):
@@ -10,10 +36,533 @@ def pytest_addoption(parser):
         help="enter api url",
         default="https://petstore.swagger.io/v2",
     ),
+    parser.addoption(
+        "--pool-connections",
+        action="store",
+        type=int,
+        help="number of per-host connection pools kept by the client",
+        default=10,
+    ),
+    parser.addoption(
+        "--pool-maxsize",
+        action="store",
+        type=int,
+        help="maximum number of keep-alive connections per host",
+        default=10,
+    ),
+    parser.addoption(
+        "--pool-block",
+        action="store_true",
+        help="block instead of opening extra connections when the per-host pool is exhausted",
+        default=False,
+    ),
+    parser.addoption(
+        "--warm-connections",
+        action="store",
+        type=int,
+        help="connections every worker opens to --api-url before the first test (0 to disable)",
+        default=2,
+    ),
+    parser.addoption(
+        "--dns-cache-ttl",
+        action="store",
+        type=float,
+        help="seconds a resolved --api-url address is reused (0 resolves on every connect)",
+        default=300,
+    ),
+    parser.addoption(
+        "--no-keep-alive",
+        action="store_true",
+        help="close the connection after every request",
+        default=False,
+    ),
+    parser.addoption(
+        "--connect-timeout",
+        action="store",
+        type=float,
+        help="connect timeout in seconds",
+        default=5.0,
+    ),
+    parser.addoption(
+        "--read-timeout",
+        action="store",
+        type=float,
+        help="read timeout in seconds",
+        default=30.0,
+    ),
+    parser.addoption(
+        "--retries",
+        action="store",
+        type=int,
+        help="retries of transport errors and 429/502/503/504 answers to idempotent requests",
+        default=2,
+    ),
+    parser.addoption(
+        "--retry-backoff",
+        action="store",
+        type=float,
+        help="pause in seconds before the first retry, doubled for every further retry",
+        default=0.2,
+    ),
+    parser.addoption(
+        "--retry-budget",
+        action="store",
+        type=float,
+        help="retries allowed per request across the session once the initial reserve is spent",
+        default=0.2,
+    ),
+    parser.addoption(
+        "--breaker-threshold",
+        action="store",
+        type=int,
+        help="consecutive failures after which requests to the host fail fast (0 disables)",
+        default=5,
+    ),
+    parser.addoption(
+        "--breaker-reset",
+        action="store",
+        type=float,
+        help="seconds the circuit stays open before a probe request is let through",
+        default=30.0,
+    ),
+    parser.addoption(
+        "--rate-limit",
+        action="store",
+        type=float,
+        help="requests per second allowed to the api host, shared by all workers on this host (0 disables)",
+        default=0,
+    ),
+    parser.addoption(
+        "--rate-burst",
+        action="store",
+        type=float,
+        help="requests that may be sent at once after an idle period (default: one second worth)",
+        default=None,
+    ),
+    parser.addoption(
+        "--rate-limit-file",
+        action="store",
+        help="token bucket file shared by the rate limited processes (default: one per api host in the temp dir)",
+        default=None,
+    ),
+    parser.addoption(
+        "--async-max-connections",
+        action="store",
+        type=int,
+        help="maximum number of requests in flight on the async client",
+        default=100,
+    ),
+    parser.addoption(
+        "--async-max-keepalive",
+        action="store",
+        type=int,
+        help="maximum number of idle keep-alive connections kept by the async client",
+        default=20,
+    ),
+    parser.addoption(
+        "--wait-timeout",
+        action="store",
+        type=float,
+        help="deadline in seconds for eventual-consistency waits",
+        default=30.0,
+    ),
+    parser.addoption(
+        "--wait-initial-delay",
+        action="store",
+        type=float,
+        help="first pause in seconds between eventual-consistency polls",
+        default=0.2,
+    ),
+    parser.addoption(
+        "--wait-max-delay",
+        action="store",
+        type=float,
+        help="maximum pause in seconds between eventual-consistency polls",
+        default=5.0,
+    ),
+    parser.addoption(
+        "--cache-size",
+        action="store",
+        type=int,
+        help="number of GET responses kept in the read cache (0 disables the cache)",
+        default=0,
+    ),
+    parser.addoption(
+        "--cache-ttl",
+        action="store",
+        type=float,
+        help="seconds a cached GET response is served before it is revalidated",
+        default=5.0,
+    ),
+    parser.addoption(
+        "--local-server",
+        action="store_true",
+        help="serve --api-url from the in-process Petstore stand-in instead of the network",
+        default=False,
+    ),
+    parser.addoption(
+        "--server-latency",
+        action="store",
+        type=float,
+        help="seconds of latency the local server adds to every request",
+        default=0.0,
+    ),
+    parser.addoption(
+        "--server-error-rate",
+        action="store",
+        type=float,
+        help="probability (0..1) that the local server answers with 500",
+        default=0.0,
+    ),
+    parser.addoption(
+        "--server-lag",
+        action="store",
+        type=float,
+        help="seconds before a write to the local server becomes readable",
+        default=0.0,
+    ),
+    parser.addoption(
+        "--record",
+        action="store",
+        help="record every exchange into this cassette (path without extension)",
+        default=None,
+    ),
+    parser.addoption(
+        "--replay",
+        action="store",
+        help="answer every request from this cassette instead of the network",
+        default=None,
+    ),
+    parser.addoption(
+        "--entity-pool-size",
+        action="store",
+        type=int,
+        help="pets, orders and users each worker creates up front and leases to tests",
+        default=3,
+    ),
+    parser.addoption(
+        "--contract",
+        action="store",
+        help="OpenAPI (Swagger 2.0) document every structured response is validated against",
+        default=DEFAULT_SPEC,
+    ),
+    parser.addoption(
+        "--no-contract",
+        action="store_true",
+        help="do not validate responses against the OpenAPI document",
+        default=False,
+    ),
+    parser.addoption(
+        "--data-seed",
+        action="store",
+        type=int,
+        help="seed for Pet/Order/User.random() to make generated test data reproducible",
+        default=None,
+    ),
+    parser.addoption(
+        "--attach-max-size",
+        action="store",
+        type=int,
+        help="maximum number of bytes kept per allure attachment (0 for no limit)",
+        default=65536,
+    ),
+    parser.addoption(
+        "--attach-compress-over",
+        action="store",
+        type=int,
+        help="store allure attachments larger than this many bytes gzip-compressed (0 to disable)",
+        default=0,
+    ),
+    parser.addoption(
+        "--attach-queue-size",
+        action="store",
+        type=int,
+        help="allure attachments waiting for the background writer before tests block",
+        default=64,
+    ),
+    parser.addoption(
+        "--log-body-limit",
+        action="store",
+        type=int,
+        help="maximum number of body characters written per api log record (0 for no limit)",
+        default=2000,
+    ),
+    parser.addoption(
+        "--log-structured",
+        action="store_true",
+        help="write api log records as single-line key=value pairs",
+        default=False,
+    ),
+    parser.addoption(
+        "--json-codec",
+        action="store",
+        choices=["stdlib", "orjson", "auto"],
+        help="JSON codec for request bodies and response decoding (auto picks orjson when installed)",
+        default="stdlib",
+    ),
+
+
+def pytest_configure(config):
+    if config.getoption("--record") and (
+        getattr(config.option, "numprocesses", None) or hasattr(config, "workerinput")
+    ):
+        # Every worker would truncate the same cassette and overwrite its index
+        raise pytest.UsageError("--record cannot be combined with xdist (-n)")
+    seed = config.getoption("--data-seed")
+    if seed is None and (config.getoption("--record") or config.getoption("--replay")):
+        # Replayed requests must carry the recorded bodies
+        seed = 0
+    worker = getattr(config, "workerinput", {}).get("workerid")
+    if seed is not None and worker:
+        # Every xdist worker gets its own reproducible stream of unique IDs
+        seed = f"{seed}-{worker}"
+    factory.configure(seed=seed)
+    deco.configure(
+        max_body_length=config.getoption("--log-body-limit"),
+        structured=config.getoption("--log-structured"),
+    )
+    codec.configure(config.getoption("--json-codec"))
+    attachments.configure(
+        max_size=config.getoption("--attach-max-size"),
+        compress_over=config.getoption("--attach-compress-over"),
+        queue_size=config.getoption("--attach-queue-size"),
+    )
+
+
+def pytest_unconfigure(config):
+    # Attachment files are written in the background; finish them before pytest exits
+    attachments.flush()
+
+
+@pytest.fixture(scope="session")
+def petstore_server(request):
+    return PetstoreServer(
+        latency=request.config.getoption("--server-latency"),
+        error_rate=request.config.getoption("--server-error-rate"),
+        consistency_lag=request.config.getoption("--server-lag"),
+    )
 
 
 @pytest.fixture(scope="session")
-def app(request):
+def app(request, client_stats):
     url = request.config.getoption("--api-url")
+    retry = RetryPolicy(
+        total=request.config.getoption("--retries"),
+        backoff_factor=request.config.getoption("--retry-backoff"),
+        budget=RetryBudget(ratio=request.config.getoption("--retry-budget")),
+        non_retryable=(CassetteMiss,),
+    )
+    breaker = None
+    if request.config.getoption("--breaker-threshold"):
+        breaker = CircuitBreaker(
+            failure_threshold=request.config.getoption("--breaker-threshold"),
+            reset_timeout=request.config.getoption("--breaker-reset"),
+        )
+
+    resolver = None
+    if request.config.getoption("--dns-cache-ttl"):
+        resolver = Resolver(ttl=request.config.getoption("--dns-cache-ttl"))
+
+    limiter = None
+    if request.config.getoption("--rate-limit"):
+        limiter = RateLimiter(
+            rate=request.config.getoption("--rate-limit"),
+            burst=request.config.getoption("--rate-burst"),
+            path=request.config.getoption("--rate-limit-file")
+            or default_state_file(url),
+        )
+
+    client = Client(
+        pool_connections=request.config.getoption("--pool-connections"),
+        pool_maxsize=request.config.getoption("--pool-maxsize"),
+        pool_block=request.config.getoption("--pool-block"),
+        keep_alive=not request.config.getoption("--no-keep-alive"),
+        connect_timeout=request.config.getoption("--connect-timeout"),
+        read_timeout=request.config.getoption("--read-timeout"),
+        stats=client_stats,
+        retry=retry,
+        breaker=breaker,
+        resolver=resolver,
+        limiter=limiter,
+    )
+
+    async_client = AsyncClient(
+        max_connections=request.config.getoption("--async-max-connections"),
+        max_keepalive_connections=request.config.getoption("--async-max-keepalive"),
+        keep_alive=not request.config.getoption("--no-keep-alive"),
+        connect_timeout=request.config.getoption("--connect-timeout"),
+        read_timeout=request.config.getoption("--read-timeout"),
+        stats=client_stats,
+        retry=retry,
+        breaker=breaker,
+        limiter=limiter,
+    )
+
+    if request.config.getoption("--local-server"):
+        server = request.getfixturevalue("petstore_server")
+        client.mount(url, LocalAdapter(server, url))
+        async_client.mount(url, AsyncLocalTransport(server, url))
+
+    cassette = None
+    if request.config.getoption("--record"):
+        cassette = Cassette(request.config.getoption("--record"), mode="record")
+        client.mount(url, CassetteAdapter(cassette, client.session.get_adapter(url)))
+        async_client.mount(
+            url,
+            AsyncCassetteTransport(cassette, async_client.transport(url)),
+        )
+    elif request.config.getoption("--replay"):
+        cassette = Cassette(request.config.getoption("--replay"), mode="replay")
+        client.mount(url, CassetteAdapter(cassette))
+        async_client.mount(url, AsyncCassetteTransport(cassette))
+
+    if request.config.getoption("--warm-connections"):
+        # Recorded as "warm-up: ..." endpoints, apart from the requests of the tests
+        warm_up = client.warm_up(url, request.config.getoption("--warm-connections"))
+        if warm_up:
+            attachments.attach(
+                json.dumps(warm_up, indent=4),
+                "Connection warm-up",
+                allure.attachment_type.JSON,
+            )
+
+    waiter = Waiter(
+        timeout=request.config.getoption("--wait-timeout"),
+        initial_delay=request.config.getoption("--wait-initial-delay"),
+        max_delay=request.config.getoption("--wait-max-delay"),
+    )
+
+    cache = None
+    if request.config.getoption("--cache-size"):
+        cache = ResponseCache(
+            maxsize=request.config.getoption("--cache-size"),
+            ttl=request.config.getoption("--cache-ttl"),
+        )
+
+    contract = None
+    if not request.config.getoption("--no-contract"):
+        contract = Contract.load(request.config.getoption("--contract"))
+
+    application = Application(
+        url,
+        client=client,
+        async_client=async_client,
+        waiter=waiter,
+        cache=cache,
+        contract=contract,
+    )
+    yield application
+    application.close()
+    if cassette is not None:
+        cassette.close()
+
+    if cache is not None:
+        attachments.attach(
+            json.dumps(cache.stats(), indent=4),
+            "Read cache",
+            allure.attachment_type.JSON,
+        )
+
+    if limiter is not None:
+        limiter.close()
+        attachments.attach(
+            json.dumps(limiter.stats(), indent=4),
+            "Rate limiter",
+            allure.attachment_type.JSON,
+        )
+
+    if client_stats.endpoints:
+        attachments.attach(
+            json.dumps(client_stats.summary(), indent=4),
+            "Client latency by endpoint",
+            allure.attachment_type.JSON,
+        )
+
+
+def _entity_pool(request, app, **kwargs) -> EntityPool:
+    pool = EntityPool(waiter=app.waiter, **kwargs)
+    pool.fill(request.config.getoption("--entity-pool-size"))
+    request.addfinalizer(pool.close)
+    return pool
+
+
+@pytest.fixture(scope="session")
+def pet_pool(request, app):
+    """
+    Readable pets leased to tests: with pet_pool.lease() as pet
+    """
+    return _entity_pool(
+        request,
+        app,
+        name="pet",
+        create=factory.default_factory().pets,
+        add=app.pet_api.add_pets,
+        delete=app.pet_api.delete_pets,
+        read=app.pet_api.get_by_id_pet,
+        key=lambda pet: pet.id,
+    )
+
+
+@pytest.fixture(scope="session")
+def order_pool(request, app):
+    """
+    Readable orders leased to tests: with order_pool.lease() as order
+    """
+    return _entity_pool(
+        request,
+        app,
+        name="order",
+        create=factory.default_factory().orders,
+        add=app.store_api.add_orders,
+        delete=app.store_api.delete_orders,
+        read=app.store_api.get_order_by_id,
+        key=lambda order: order.id,
+    )
+
+
+@pytest.fixture(scope="session")
+def user_pool(request, app):
+    """
+    Readable users leased to tests: with user_pool.lease() as user
+    """
+    return _entity_pool(
+        request,
+        app,
+        name="user",
+        create=factory.default_factory().users,
+        add=app.user_api.add_users,
+        delete=app.user_api.delete_users,
+        read=app.user_api.get_user_by_username,
+        key=lambda user: user.username,
+    )
+
+
+def _lease(request, pool: EntityPool):
+    with pool.lease(
+        mutates=request.node.get_closest_marker("mutates") is not None
+    ) as item:
+        yield item
+
+
+@pytest.fixture
+def pooled_pet(request, pet_pool):
+    """
+    A readable pet for this test only. Mark the test with @pytest.mark.mutates if it changes it.
+    """
+    yield from _lease(request, pet_pool)
+
+
+@pytest.fixture
+def pooled_order(request, order_pool):
+    """
+    A readable order for this test only. Mark the test with @pytest.mark.mutates if it changes it.
+    """
+    yield from _lease(request, order_pool)
+
 
-    return Application(url)
+@pytest.fixture
+def pooled_user(request, user_pool):
+    """
+    A readable user for this test only. Mark the test with @pytest.mark.mutates if it changes it.
+    """
+    yield from _lease(request, user_pool)
@@ -1,17 +1,73 @@
-from fixtures.requests import Client
+from functools import cached_property
 
-from fixtures.petstore.store.api import StoreAPI
-from fixtures.petstore.user.api import UserAPI
-from fixtures.petstore.pet.api import PetAPI
+from fixtures.cache import ResponseCache
+from fixtures.contract import Contract
+from fixtures.requests import AsyncClient, Client
+from fixtures.waiter import Waiter
 
 
 class Application:
 
-    def __init__(self, url):
+    def __init__(
+        self,
+        url,
+        client: Client = None,
+        async_client: AsyncClient = None,
+        waiter: Waiter = None,
+        cache: ResponseCache = None,
+        contract: Contract = None,
+    ):
         self.url = url
+        # Opt-in: the API helpers read through and invalidate it when it is set
+        self.cache = cache
+        # Optional: responses passing Validator.structure are checked against it
+        self.contract = contract
 
-        self.client = Client
+        self.client = client or Client()
+        self.async_client = async_client or AsyncClient()
+        self.waiter = waiter or Waiter()
 
-        self.pet_api = PetAPI(self)
-        self.store_api = StoreAPI(self)
-        self.user_api = UserAPI(self)
+    # API helpers (and their models) are imported on first use
+
+    @cached_property
+    def pet_api(self):
+        from fixtures.petstore.pet.api import PetAPI
+
+        return PetAPI(self)
+
+    @cached_property
+    def store_api(self):
+        from fixtures.petstore.store.api import StoreAPI
+
+        return StoreAPI(self)
+
+    @cached_property
+    def user_api(self):
+        from fixtures.petstore.user.api import UserAPI
+
+        return UserAPI(self)
+
+    @cached_property
+    def async_pet_api(self):
+        from fixtures.petstore.pet.api import AsyncPetAPI
+
+        return AsyncPetAPI(self)
+
+    @cached_property
+    def async_store_api(self):
+        from fixtures.petstore.store.api import AsyncStoreAPI
+
+        return AsyncStoreAPI(self)
+
+    @cached_property
+    def async_user_api(self):
+        from fixtures.petstore.user.api import AsyncUserAPI
+
+        return AsyncUserAPI(self)
+
+    def close(self):
+        """
+        Releases the pooled connections held by the clients.
+        """
+        self.client.close()
+        self.async_client.close()
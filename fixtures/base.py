@@ -1,10 +1,11 @@
-import json
-
-
 class BaseClass:
+    __slots__ = ()
+
     def to_dict(self) -> dict:
         """
         Convert nested object to dict
         :return: dict
         """
-        return json.loads(json.dumps(self, default=lambda o: o.__dict__))
+        from fixtures.converter import unstructure
+
+        return unstructure(self)
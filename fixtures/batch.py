@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List
+
+import attr
+
+
+@attr.s
+class BatchResult:
+    """
+    Outcome of one item of a batch: the response, or the exception the call raised.
+    """
+
+    item = attr.ib()
+    response = attr.ib(default=None)
+    error: Exception = attr.ib(default=None)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.response.status_code < 400
+
+
+def run_batch(
+    func: Callable, items: Iterable, concurrency: int = 8
+) -> List[BatchResult]:
+    """
+    Calls func(item) for every item on at most concurrency threads
+    :param func: Callable taking one item, usually an API helper.
+    :param items: Items to process.
+    :param concurrency: Maximum number of calls in flight.
+    :return: One BatchResult per item, in input order.
+    """
+
+    def call(item) -> BatchResult:
+        try:
+            return BatchResult(item=item, response=func(item))
+        except Exception as e:
+            return BatchResult(item=item, error=e)
+
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+async def run_batch_async(
+    func: Callable, items: Iterable, concurrency: int = 100
+) -> List[BatchResult]:
+    """
+    Awaits func(item) for every item with at most concurrency calls in flight
+    :param func: Coroutine function taking one item, usually an async API helper.
+    :param items: Items to process.
+    :param concurrency: Maximum number of calls in flight.
+    :return: One BatchResult per item, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(item) -> BatchResult:
+        async with semaphore:
+            try:
+                return BatchResult(item=item, response=await func(item))
+            except Exception as e:
+                return BatchResult(item=item, error=e)
+
+    return list(await asyncio.gather(*(call(item) for item in items)))
+
+
+def chunked(items: Iterable, size: int) -> List[list]:
+    """
+    Splits items into lists of at most size elements
+    """
+    items = list(items)
+    return [items[i : i + size] for i in range(0, len(items), size)]
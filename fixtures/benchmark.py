@@ -0,0 +1,81 @@
+import json
+import os
+from typing import Dict, List
+
+from fixtures.metrics import Histogram
+
+# Metrics compared against the baseline; True when a higher value is better.
+# p99 is stored but not gated, with a few dozen calls per run it is close to the maximum.
+GATED_METRICS = {"p50": False, "p95": False, "throughput": True}
+
+
+class BaselineGate:
+    def __init__(self, baseline: Dict[str, dict] = None, threshold: float = 0.25):
+        """
+        Compares operation benchmarks with a stored baseline.
+        :param baseline: operation -> {"p50", "p95", "p99", "throughput", ...} from a previous run.
+        :param threshold: Allowed relative regression (0.25 means 25% slower or less throughput).
+        """
+        self.baseline = baseline or {}
+        self.threshold = threshold
+        self.results: Dict[str, dict] = {}
+
+    def check(self, operation: str, histogram: Histogram, elapsed: float) -> List[str]:
+        """
+        Records the result of an operation and compares it with the baseline
+        :param operation: Operation name.
+        :param histogram: Latencies of every call (seconds), measured one call at a time.
+        :param elapsed: Wall time of a concurrent run of as many calls (seconds); the
+            throughput is the number of calls divided by it.
+        :return: Human readable regressions, empty when within the threshold.
+        """
+        summary = histogram.summary()
+        result = {
+            "count": summary["count"],
+            "p50": summary["p50"],
+            "p95": summary["p95"],
+            "p99": summary["p99"],
+            "throughput": summary["count"] / elapsed if elapsed else 0.0,
+        }
+        self.results[operation] = result
+
+        baseline = self.baseline.get(operation)
+        if not baseline:
+            return []
+        regressions = []
+        for metric, higher_is_better in GATED_METRICS.items():
+            expected, actual = baseline.get(metric), result[metric]
+            if not expected:
+                continue
+            change = (actual - expected) / expected
+            if higher_is_better:
+                change = -change
+            if change > self.threshold:
+                regressions.append(
+                    f"{operation} {metric} regressed by {change:.0%}: "
+                    f"{actual:.4f} vs baseline {expected:.4f}"
+                )
+        return regressions
+
+    @staticmethod
+    def load(path: str, target: str) -> Dict[str, dict]:
+        """
+        Reads the baseline of one target (API base URL) from a baseline file
+        """
+        if not path or not os.path.exists(path):
+            return {}
+        with open(path) as file:
+            return json.load(file).get(target, {})
+
+    @staticmethod
+    def save(path: str, target: str, results: Dict[str, dict]):
+        """
+        Stores results as the new baseline of target, keeping other targets untouched
+        """
+        data = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                data = json.load(file)
+        data.setdefault(target, {}).update(results)
+        with open(path, "w") as file:
+            json.dump(data, file, indent=4, sort_keys=True)
@@ -0,0 +1,172 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+import attr
+from requests import Response
+
+from common import codec
+
+
+@attr.s(slots=True)
+class CacheEntry:
+    response: Response = attr.ib()
+    expires: float = attr.ib()
+    etag: str = attr.ib(default=None)
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Bounded LRU cache of successful GET responses, keyed by URL.
+        Expired entries that carried an ETag are revalidated with If-None-Match instead of
+        being fetched again. Writes through the API helpers invalidate the matching key.
+        Invalidation is local: reads of a recently written key may still return what an
+        eventually consistent backend served before the write, for up to ttl seconds.
+        Every invalidation bumps the generation of its key. A response fetched while the key
+        was invalidated (e.g. a GET overlapping a PUT on another thread) is returned but not
+        cached, so it cannot outlive the write.
+        :param maxsize: Maximum number of cached responses.
+        :param ttl: Seconds a response is served without asking the backend.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        # Key -> stamp of its last invalidation; keys dropped from it count as invalidated
+        # at the highest stamp dropped, so a fetch never misses an invalidation
+        self.generations = OrderedDict()
+        self.stamp = 0
+        self.pruned = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(url: str, params: dict = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{sorted(params.items())}"
+
+    def generation(self, key: str) -> int:
+        """
+        Returns the generation of key, to be taken before its response is fetched
+        """
+        with self.lock:
+            return self.generations.get(key, self.pruned)
+
+    def _current(self, key: str, generation: int) -> bool:
+        # Called with the lock held
+        return (
+            generation is None or self.generations.get(key, self.pruned) == generation
+        )
+
+    def lookup(self, key: str):
+        """
+        Returns the cached entry of key and whether it is still fresh
+        :return: (CacheEntry or None, bool)
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self.entries.move_to_end(key)
+            if entry.expires > self.clock():
+                self.hits += 1
+                return entry, True
+            if entry.etag is None:
+                del self.entries[key]
+                self.misses += 1
+                return None, False
+            return entry, False
+
+    def store(self, key: str, response: Response, generation: int = None):
+        """
+        Caches a successful response, evicting the least recently used entries
+        :param generation: Generation of key when the request was sent; the response is not
+            cached when the key was invalidated since.
+        """
+        entry = CacheEntry(
+            response=response,
+            expires=self.clock() + self.ttl,
+            etag=response.headers.get("ETag"),
+        )
+        with self.lock:
+            if self._current(key, generation):
+                self._put(key, entry)
+
+    def _put(self, key: str, entry: CacheEntry):
+        # Called with the lock held
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def revalidated(
+        self, key: str, entry: CacheEntry, generation: int = None
+    ) -> Response:
+        """
+        Marks an entry as confirmed by a 304 Not Modified answer. An entry evicted since the
+        lookup is stored again; one whose key was invalidated since is not.
+        :param entry: The entry returned by lookup, whose ETag the request carried.
+        :param generation: Generation of key taken before the lookup.
+        :return: The cached response
+        """
+        with self.lock:
+            self.revalidations += 1
+            if self._current(key, generation):
+                entry.expires = self.clock() + self.ttl
+                if self.entries.get(key) is not entry:
+                    self._put(key, entry)
+            return entry.response
+
+    def invalidate(self, key: str):
+        with self.lock:
+            self.stamp += 1
+            self.generations[key] = self.stamp
+            self.generations.move_to_end(key)
+            while len(self.generations) > self.maxsize:
+                _, self.pruned = self.generations.popitem(last=False)
+            if self.entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters
+        """
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    @staticmethod
+    def copy(response: Response) -> Response:
+        """
+        Shallow copy handed to callers, so Validator.structure on one caller's response
+        does not replace the data another caller holds. The decoded body is not shared
+        either: structured models may hold its lists.
+        """
+        clone = copy.copy(response)
+        codec.forget(clone)
+        return clone
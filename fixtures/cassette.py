@@ -0,0 +1,248 @@
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Index entry: sha1 of the normalised request, occurrence, offset and length of the record
+ENTRY = struct.Struct(">20sIQI")
+# Record header: status code, length of the JSON encoded headers
+RECORD = struct.Struct(">HI")
+# Hop-by-hop and encoding headers describe the original transfer, not the stored body
+SKIPPED_HEADERS = {
+    "content-length",
+    "content-encoding",
+    "transfer-encoding",
+    "connection",
+}
+
+
+class CassetteMiss(Exception):
+    """
+    Raised in replay mode for a request that was never recorded. Not a transport error:
+    the miss is deterministic, so it is neither retried nor counted by circuit breakers.
+    """
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str = "replay"):
+        """
+        On-disk store of recorded HTTP exchanges.
+        Records are appended to <path>.dat; closing a recording writes <path>.idx, a table of
+        fixed-size entries sorted by request hash that replay maps into memory and binary
+        searches, so opening a cassette costs the same with ten or ten thousand exchanges.
+        A request sent several times (e.g. polled by the Waiter) is stored once per occurrence
+        and replayed in the same order; later repeats get the last recorded answer.
+        :param path: Cassette path without extension.
+        :param mode: "record" or "replay".
+        """
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.occurrences = {}
+        if mode == "record":
+            self.data = open(f"{path}.dat", "wb")
+            self.offset = 0
+            self.entries = []
+        elif mode == "replay":
+            self.data = self._map(f"{path}.dat")
+            self.index = self._map(f"{path}.idx")
+            self.count = len(self.index) // ENTRY.size
+        else:
+            raise ValueError(f"unknown cassette mode: {mode}")
+
+    @staticmethod
+    def _map(path: str):
+        with open(path, "rb") as file:
+            if not os.fstat(file.fileno()).st_size:
+                return b""
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def key(method: str, url: str, body=None) -> bytes:
+        """
+        Hash of the normalised request: method, path, sorted query and canonical JSON body.
+        Scheme and host are ignored, so a cassette replays against any --api-url.
+        """
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if body:
+            try:
+                body = json.dumps(
+                    json.loads(body), sort_keys=True, separators=(",", ":")
+                ).encode("utf-8")
+            except ValueError:
+                pass
+        digest = hashlib.sha1(f"{method} {parts.path}?{query}\n".encode("utf-8"))
+        digest.update(body or b"")
+        return digest.digest()
+
+    def _occurrence(self, key: bytes) -> int:
+        with self.lock:
+            occurrence = self.occurrences.get(key, 0)
+            self.occurrences[key] = occurrence + 1
+            return occurrence
+
+    def record(self, method: str, url: str, body, status: int, headers, content: bytes):
+        key = self.key(method, url, body)
+        headers = json.dumps(
+            {k: v for k, v in headers.items() if k.lower() not in SKIPPED_HEADERS}
+        ).encode("utf-8")
+        record = RECORD.pack(status, len(headers)) + headers + content
+        occurrence = self._occurrence(key)
+        with self.lock:
+            self.entries.append((key, occurrence, self.offset, len(record)))
+            self.data.write(record)
+            self.offset += len(record)
+
+    def play(self, method: str, url: str, body=None):
+        """
+        Returns the recorded answer to a request
+        :return: (status code, headers, body bytes)
+        """
+        key = self.key(method, url, body)
+        occurrence = self._occurrence(key)
+        # First entry sorting after (key, occurrence); the one before it is the match
+        # or, for a repeat beyond the recording, the last occurrence of the key
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ENTRY.unpack_from(self.index, mid * ENTRY.size)[:2] <= (key, occurrence):
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo:
+            found, _, offset, length = ENTRY.unpack_from(
+                self.index, (lo - 1) * ENTRY.size
+            )
+            if found == key:
+                status, size = RECORD.unpack_from(self.data, offset)
+                start = offset + RECORD.size
+                headers = json.loads(self.data[start : start + size])
+                content = self.data[start + size : offset + length]
+                headers["Content-Length"] = str(len(content))
+                return status, headers, content
+        raise CassetteMiss(f"no recorded response for {method} {url}")
+
+    def close(self):
+        if self.mode == "record":
+            self.entries.sort()
+            with open(f"{self.path}.idx", "wb") as file:
+                for entry in self.entries:
+                    file.write(ENTRY.pack(*entry))
+            self.data.close()
+        else:
+            for mapped in (self.index, self.data):
+                if isinstance(mapped, mmap.mmap):
+                    mapped.close()
+
+
+class CassetteAdapter(BaseAdapter):
+    def __init__(self, cassette: Cassette, inner: BaseAdapter = None):
+        """
+        requests transport adapter for a Cassette. In record mode every exchange is sent
+        through inner and stored; in replay mode answers come from the cassette only.
+        :param cassette: The cassette.
+        :param inner: (record mode) Adapter that sends the requests.
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        if self.cassette.mode == "record":
+            response = self.inner.send(
+                request,
+                stream=stream,
+                timeout=timeout,
+                verify=verify,
+                cert=cert,
+                proxies=proxies,
+            )
+            self.cassette.record(
+                request.method,
+                request.url,
+                request.body,
+                response.status_code,
+                response.headers,
+                response.content,
+            )
+            return response
+
+        start = time.perf_counter()
+        status, headers, content = self.cassette.play(
+            request.method, request.url, request.body
+        )
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = content
+        response.elapsed = datetime.timedelta(seconds=time.perf_counter() - start)
+        return response
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, inner: httpx.AsyncBaseTransport = None):
+        """
+        httpx transport for a Cassette, the AsyncClient counterpart of CassetteAdapter.
+        :param cassette: The cassette.
+        :param inner: (record mode) Transport that sends the requests.
+        """
+        self.cassette = cassette
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        if self.cassette.mode == "record":
+            response = await self.inner.handle_async_request(request)
+            content = await response.aread()
+            self.cassette.record(
+                request.method,
+                str(request.url),
+                body,
+                response.status_code,
+                response.headers,
+                content,
+            )
+            return httpx.Response(
+                response.status_code,
+                headers=[
+                    (k, v)
+                    for k, v in response.headers.multi_items()
+                    if k.lower() not in SKIPPED_HEADERS
+                ],
+                stream=httpx.ByteStream(content),
+                request=request,
+            )
+
+        status, headers, content = self.cassette.play(
+            request.method, str(request.url), body
+        )
+        return httpx.Response(
+            status, headers=headers, stream=httpx.ByteStream(content), request=request
+        )
+
+    async def aclose(self):
+        if self.inner is not None:
+            await self.inner.aclose()
@@ -0,0 +1,315 @@
+import json
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from requests import Response
+
+from common.codec import decode
+
+DEFAULT_SPEC = os.path.join(os.path.dirname(__file__), "petstore", "swagger.json")
+
+# Compiled check: (value, JSON path, violations) -> None
+Check = Callable[[object, str, List[str]], None]
+
+_TYPES = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "boolean": (bool,),
+    "integer": (int,),
+    "number": (int, float),
+}
+_INT_RANGES = {"int32": 2**31, "int64": 2**63}
+_DATE_TIME = re.compile(r"\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}")
+
+
+class ContractViolation(AssertionError):
+    def __init__(self, operation: str, status: int, violations: List[str]):
+        """
+        Raised for a response body that does not match the OpenAPI document
+        :param operation: operationId of the request.
+        :param status: Response status code.
+        :param violations: One "<JSON path>: <problem>" message per violation.
+        """
+        self.operation = operation
+        self.status = status
+        self.violations = violations
+        super().__init__(
+            f"{operation} {status} violates the contract: " + "; ".join(violations)
+        )
+
+
+def _type_name(value) -> str:
+    return {dict: "object", list: "array", str: "string", bool: "boolean"}.get(
+        type(value), "null" if value is None else type(value).__name__
+    )
+
+
+def compile_schema(schema: dict, definitions: dict, compiled: dict = None) -> Check:
+    """
+    Turns a Swagger 2.0 schema into a chain of closures, resolving $ref once.
+    Supported keywords: $ref, type, format (int32/int64/date-time), enum, required,
+    properties, items. Unknown properties are allowed, as in the Petstore document.
+    :param schema: Schema object.
+    :param definitions: The document's definitions.
+    :param compiled: Cache of compiled definitions, shared between calls.
+    """
+    compiled = {} if compiled is None else compiled
+    if "$ref" in schema:
+        name = schema["$ref"].rsplit("/", 1)[-1]
+        if name not in compiled:
+            # Placeholder first, so recursive definitions resolve lazily
+            compiled[name] = lambda value, path, errors: compiled[name + "!"](
+                value, path, errors
+            )
+            compiled[name + "!"] = compile_schema(
+                definitions[name], definitions, compiled
+            )
+        return compiled[name]
+
+    checks: List[Check] = []
+    kind = schema.get("type")
+    if kind in _TYPES:
+        types = _TYPES[kind]
+        exclude_bool = kind in ("integer", "number")
+
+        def check_type(value, path, errors):
+            if not isinstance(value, types) or (
+                exclude_bool and isinstance(value, bool)
+            ):
+                errors.append(f"{path}: expected {kind}, got {_type_name(value)}")
+                return False
+            return True
+
+    else:
+
+        def check_type(value, path, errors):
+            return True
+
+    fmt = schema.get("format")
+    if kind == "integer" and fmt in _INT_RANGES:
+        limit = _INT_RANGES[fmt]
+
+        def check_range(value, path, errors):
+            if not -limit <= value < limit:
+                errors.append(f"{path}: {value} is out of {fmt} range")
+
+        checks.append(check_range)
+    elif kind == "string" and fmt == "date-time":
+
+        def check_date_time(value, path, errors):
+            if not _DATE_TIME.match(value):
+                errors.append(f"{path}: {value!r} is not a date-time")
+
+        checks.append(check_date_time)
+
+    if "enum" in schema:
+        allowed = frozenset(schema["enum"])
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: {value!r} is not one of {sorted(allowed)}")
+
+        checks.append(check_enum)
+
+    if kind == "object":
+        required = tuple(schema.get("required", ()))
+        properties = {
+            name: compile_schema(prop, definitions, compiled)
+            for name, prop in schema.get("properties", {}).items()
+        }
+
+        def check_object(value, path, errors):
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path}: missing required property {name!r}")
+            for name, item in value.items():
+                check = properties.get(name)
+                if check is not None and item is not None:
+                    check(item, f"{path}.{name}", errors)
+
+        checks.append(check_object)
+    elif kind == "array" and "items" in schema:
+        check_item = compile_schema(schema["items"], definitions, compiled)
+
+        def check_array(value, path, errors):
+            for i, item in enumerate(value):
+                check_item(item, f"{path}[{i}]", errors)
+
+        checks.append(check_array)
+
+    checks = tuple(checks)
+
+    def check(value, path, errors):
+        if check_type(value, path, errors):
+            for step in checks:
+                step(value, path, errors)
+
+    return check
+
+
+class Contract:
+    def __init__(self, spec: dict):
+        """
+        Response validation against a Swagger 2.0 document.
+        Validators are compiled on first use per operation and status code and cached
+        for the lifetime of the object, so steady-state validation is a walk over the body.
+        :param spec: The parsed document.
+        """
+        self.spec = spec
+        self.definitions = spec.get("definitions", {})
+        self.compiled_definitions = {}
+        self.validators: Dict[tuple, Optional[Check]] = {}
+        self.lock = threading.Lock()
+        self.checked = 0
+        self.violations = 0
+        self.routes = []
+        for template, operations in spec.get("paths", {}).items():
+            pattern = re.compile(re.sub(r"\{[^/]+\}", "[^/]+", template))
+            for method, operation in operations.items():
+                self.routes.append((method.upper(), pattern, template, operation))
+        # Literal segments win over parameters: /pet/findByStatus before /pet/{petId}
+        self.routes.sort(key=lambda route: route[2].count("{"))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_SPEC) -> "Contract":
+        with open(path) as file:
+            return cls(json.load(file))
+
+    def operation(self, method: str, path: str) -> Optional[dict]:
+        for route_method, pattern, _, operation in self.routes:
+            if route_method == method and pattern.fullmatch(path):
+                return operation
+        return None
+
+    def validator(self, operation: dict, status: int) -> Optional[Check]:
+        key = (operation["operationId"], status)
+        if key not in self.validators:
+            with self.lock:
+                responses = operation.get("responses", {})
+                response = responses.get(str(status)) or responses.get("default", {})
+                schema = response.get("schema")
+                self.validators[key] = (
+                    compile_schema(schema, self.definitions, self.compiled_definitions)
+                    if schema
+                    else None
+                )
+        return self.validators[key]
+
+    def item_validator(self, operation: dict, status: int) -> Optional[Check]:
+        """
+        Returns the check of one element of an array response, None when the schema of the
+        status is not an array
+        """
+        key = (operation["operationId"], status, "items")
+        if key not in self.validators:
+            with self.lock:
+                responses = operation.get("responses", {})
+                response = responses.get(str(status)) or responses.get("default", {})
+                items = (response.get("schema") or {}).get("items")
+                self.validators[key] = (
+                    compile_schema(items, self.definitions, self.compiled_definitions)
+                    if items
+                    else None
+                )
+        return self.validators[key]
+
+    def violations_of(self, method: str, path: str, status: int, body) -> List[str]:
+        """
+        Returns the contract violations of a decoded response body
+        :param method: HTTP method of the request.
+        :param path: Request path relative to the API base URL, e.g. /pet/1.
+        :param status: Response status code.
+        :param body: Decoded JSON body.
+        :return: "<JSON path>: <problem>" messages, empty when the body conforms.
+        """
+        operation = self.operation(method, path)
+        if operation is None:
+            return [f"$: {method} {path} is not in the contract"]
+        check = self.validator(operation, status)
+        if check is None:
+            return []
+        errors = []
+        check(body, "$", errors)
+        return errors
+
+    def check(self, response: Response, base_url: str, body=None):
+        """
+        Validates a response, raising ContractViolation when it does not match
+        :param response: Response of a request sent to base_url.
+        :param base_url: API base URL, its path is stripped from the request path.
+        :param body: (optional) Already decoded JSON body.
+        :return: The decoded body, None when the status has no schema and body was not given.
+        """
+        operation = self._operation_of(response, base_url)
+        check = operation and self.validator(operation, response.status_code)
+        if check is None:
+            return body
+        if body is None:
+            body = decode(response)
+        errors = []
+        check(body, "$", errors)
+        with self.lock:
+            self.checked += 1
+            if errors:
+                self.violations += 1
+        if errors:
+            raise ContractViolation(
+                operation["operationId"], response.status_code, errors
+            )
+        return body
+
+    def check_stream(self, response: Response, base_url: str):
+        """
+        Validates the status and content type of a streamed response before its body is read
+        :param response: Response of a request sent to base_url with stream=True.
+        :param base_url: API base URL, its path is stripped from the request path.
+        :return: Function checking one element of the streamed array by its index, raising
+            ContractViolation; None when the status has no array schema.
+        """
+        operation = self._operation_of(response, base_url)
+        if operation is None:
+            return None
+        status = response.status_code
+        responses = operation.get("responses", {})
+        declared = responses.get(str(status)) or responses.get("default")
+        errors = []
+        if declared is None:
+            errors.append(f"$: status {status} is not in the contract")
+        elif declared.get("schema"):
+            produces = operation.get("produces") or self.spec.get("produces") or []
+            media = response.headers.get("Content-Type", "").split(";")[0].strip()
+            if produces and media not in produces:
+                errors.append(
+                    f"$: content type {media or 'missing'} is not one of {', '.join(produces)}"
+                )
+        with self.lock:
+            self.checked += 1
+            if errors:
+                self.violations += 1
+        if errors:
+            raise ContractViolation(operation["operationId"], status, errors)
+        check = self.item_validator(operation, status)
+        if check is None:
+            return None
+
+        def check_item(value, index: int):
+            errors = []
+            check(value, f"$[{index}]", errors)
+            if errors:
+                with self.lock:
+                    self.violations += 1
+                raise ContractViolation(operation["operationId"], status, errors)
+
+        return check_item
+
+    def _operation_of(self, response: Response, base_url: str) -> Optional[dict]:
+        method = response.request.method
+        path = urlsplit(response.request.url).path
+        base_path = urlsplit(base_url).path.rstrip("/")
+        if path.startswith(base_path):
+            path = path[len(base_path) :]
+        return self.operation(method, path)
@@ -0,0 +1,54 @@
+import cattrs
+from cattrs.gen import make_dict_structure_fn, make_dict_unstructure_fn
+
+from fixtures.petstore.pet.model import ApiResponse, Category, Pet
+from fixtures.petstore.store.model import Order
+from fixtures.petstore.user.model import User
+
+# Dedicated converter: detailed validation is disabled so structuring does not
+# collect per-field error context, and the hooks below are generated once at
+# import instead of lazily on the first response.
+converter = cattrs.Converter(detailed_validation=False)
+
+# Untyped list fields (photoUrls, tags) arrive as lists from the JSON decoder,
+# there is no need to copy them element by element.
+converter.register_structure_hook(
+    list, lambda value, _: value if isinstance(value, list) else list(value)
+)
+
+# Category goes first, its hooks are inlined into the Pet hooks
+MODELS = (Category, Pet, ApiResponse, Order, User)
+
+STRUCTURE_HOOKS = {}
+UNSTRUCTURE_HOOKS = {}
+
+for model in MODELS:
+    STRUCTURE_HOOKS[model] = make_dict_structure_fn(model, converter)
+    UNSTRUCTURE_HOOKS[model] = make_dict_unstructure_fn(model, converter)
+    converter.register_structure_hook(model, STRUCTURE_HOOKS[model])
+    converter.register_unstructure_hook(model, UNSTRUCTURE_HOOKS[model])
+
+
+def structure(obj, cl):
+    """
+    Structures obj into cl, calling the precompiled hook directly for known models
+    :param obj: Decoded JSON
+    :param cl: Target type
+    :return: Instance of cl
+    """
+    hook = STRUCTURE_HOOKS.get(cl)
+    if hook is not None:
+        return hook(obj, cl)
+    return converter.structure(obj, cl)
+
+
+def unstructure(obj) -> dict:
+    """
+    Unstructures a model, calling the precompiled hook directly for known models
+    :param obj: Model instance
+    :return: dict
+    """
+    hook = UNSTRUCTURE_HOOKS.get(obj.__class__)
+    if hook is not None:
+        return hook(obj)
+    return converter.unstructure(obj)
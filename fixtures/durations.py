@@ -0,0 +1,93 @@
+import json
+import os
+from typing import Dict, Iterable, List
+
+from xdist.scheduler import LoadScheduling
+
+
+class DurationHistory:
+    def __init__(self, durations: Dict[str, float] = None, smoothing: float = 0.5):
+        """
+        Per-test durations (setup + call + teardown, seconds) from previous runs.
+        :param durations: node id -> expected duration.
+        :param smoothing: Weight of a new measurement against the stored value (1 keeps only the last run).
+        """
+        self.durations = dict(durations or {})
+        self.smoothing = smoothing
+
+    def update(self, measured: Dict[str, float]):
+        """
+        Folds the durations measured in this run into the history
+        """
+        for nodeid, duration in measured.items():
+            previous = self.durations.get(nodeid)
+            if previous is None:
+                self.durations[nodeid] = duration
+            else:
+                self.durations[nodeid] = (
+                    previous + (duration - previous) * self.smoothing
+                )
+
+    def estimate(self, nodeid: str, default: float) -> float:
+        return self.durations.get(nodeid, default)
+
+    def order(self, nodeids: Iterable[str]) -> List[int]:
+        """
+        Longest-processing-time-first order: indices of nodeids sorted by expected duration,
+        longest first. Tests without history are expected to take the mean known duration.
+        Ties keep the collection order, so fixture-friendly neighbours stay together.
+        """
+        nodeids = list(nodeids)
+        known = [self.durations[n] for n in nodeids if n in self.durations]
+        default = sum(known) / len(known) if known else 0.0
+        return sorted(
+            range(len(nodeids)), key=lambda i: -self.estimate(nodeids[i], default)
+        )
+
+    @staticmethod
+    def load(path: str) -> Dict[str, float]:
+        if not os.path.exists(path):
+            return {}
+        with open(path) as file:
+            return json.load(file)
+
+    def save(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.durations, file, indent=4, sort_keys=True)
+
+
+class DurationScheduling(LoadScheduling):
+    def __init__(self, config, log=None, history: DurationHistory = None):
+        """
+        xdist load scheduling that hands out the longest tests first, two at a time, to whichever
+        worker becomes free (greedy LPT), so slow tests do not pile up on one worker and the
+        run ends close to total duration / number of workers.
+        :param history: Durations of previous runs.
+        """
+        super().__init__(config, log)
+        self.history = history or DurationHistory()
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        self.collection = next(iter(self.node2collection.values()))
+        self.pending[:] = self.history.order(self.collection)
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node, duration: float = 0):
+        if node.shutting_down:
+            return
+        if self.pending:
+            # A worker starts an item once it knows the next one, so keep two queued
+            node_pending = self.node2pending[node]
+            if len(node_pending) < 2:
+                self._send_tests(node, 2 - len(node_pending))
+        if not self.pending:
+            node.shutdown()
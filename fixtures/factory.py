@@ -0,0 +1,175 @@
+import datetime
+import random
+import re
+import threading
+from typing import List
+
+from fixtures.petstore.pet.model import Category, Pet
+from fixtures.petstore.store.model import Order
+from fixtures.petstore.user.model import User
+
+PET_STATUSES = ["available", "pending", "sold"]
+ORDER_STATUSES = ["placed", "approved", "delivered"]
+# Fixed range, Faker's default ranges end at "now" and would break reproducibility
+SHIP_DATES_FROM = datetime.datetime(2020, 1, 1)
+SHIP_DATES_SPAN = 10 * 365 * 24 * 3600
+
+
+class ModelFactory:
+    def __init__(self, seed: int = None, pool_size: int = 1000):
+        """
+        Generates Pet, Order and User instances in bulk.
+        Faker is called only to fill value pools once; instances then draw from the pools
+        with a seeded random generator, so N objects cost N cheap list lookups.
+        IDs (and the usernames derived from them) are unique per factory.
+        :param seed: (optional) Seed that makes the generated data reproducible.
+        :param pool_size: Number of precomputed values per field.
+        """
+        self.seed = seed
+        self.pool_size = pool_size
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self._pools = None
+        # Random start keeps IDs of concurrent runs apart, below 2**53 for JSON clients
+        self._next_id = self.rng.randrange(1, 2**43) * 1000
+
+    @property
+    def pools(self) -> dict:
+        if self._pools is None:
+            # Private seeded instance, the shared fixtures.fake one is never reseeded
+            from faker import Faker
+
+            fake = Faker()
+            fake.seed_instance(self.seed)
+            size = range(self.pool_size)
+            self._pools = {
+                "word": [fake.word() for _ in size],
+                "first_name": [fake.first_name() for _ in size],
+                "last_name": [fake.last_name() for _ in size],
+                "domain": [fake.free_email_domain() for _ in size],
+                "password": [fake.password() for _ in size],
+                "phone": [fake.phone_number() for _ in size],
+                "image_url": [fake.image_url() for _ in size],
+                "date": [
+                    (SHIP_DATES_FROM + datetime.timedelta(seconds=seconds)).isoformat()
+                    for seconds in fake.random.choices(
+                        range(SHIP_DATES_SPAN), k=len(size)
+                    )
+                ],
+            }
+            self._pools["handle"] = [
+                re.sub(r"\W", "", f"{first[0]}{last}").lower()
+                for first, last in zip(
+                    self._pools["first_name"], self._pools["last_name"]
+                )
+            ]
+        return self._pools
+
+    def ids(self, count: int) -> range:
+        """
+        Reserves count unique IDs
+        """
+        with self.lock:
+            start = self._next_id
+            self._next_id += count
+        return range(start, start + count)
+
+    def pets(self, count: int) -> List[Pet]:
+        pools = self.pools
+        choices = self.rng.choices
+        return [
+            Pet(
+                id=pet_id,
+                category=Category(id=category_id, name=word),
+                name=name,
+                photoUrls=[url],
+                tags=[],
+                status=status,
+            )
+            for pet_id, category_id, word, name, url, status in zip(
+                self.ids(count),
+                choices(range(1, 1001), k=count),
+                choices(pools["word"], k=count),
+                choices(pools["first_name"], k=count),
+                choices(pools["image_url"], k=count),
+                choices(PET_STATUSES, k=count),
+            )
+        ]
+
+    def orders(self, count: int) -> List[Order]:
+        pools = self.pools
+        choices = self.rng.choices
+        return [
+            Order(
+                id=order_id,
+                petId=pet_id,
+                quantity=quantity,
+                shipDate=date,
+                status=status,
+                complete=complete,
+            )
+            for order_id, pet_id, quantity, date, status, complete in zip(
+                self.ids(count),
+                choices(range(1, 10001), k=count),
+                choices(range(1, 11), k=count),
+                choices(pools["date"], k=count),
+                choices(ORDER_STATUSES, k=count),
+                choices([True, False], k=count),
+            )
+        ]
+
+    def users(self, count: int) -> List[User]:
+        pools = self.pools
+        choices = self.rng.choices
+        users = []
+        for user_id, handle, first, last, domain, password, phone, status in zip(
+            self.ids(count),
+            choices(pools["handle"], k=count),
+            choices(pools["first_name"], k=count),
+            choices(pools["last_name"], k=count),
+            choices(pools["domain"], k=count),
+            choices(pools["password"], k=count),
+            choices(pools["phone"], k=count),
+            choices([0, 1], k=count),
+        ):
+            username = f"{handle}{user_id}"
+            users.append(
+                User(
+                    id=user_id,
+                    username=username,
+                    firstName=first,
+                    lastName=last,
+                    email=f"{username}@{domain}",
+                    password=password,
+                    phone=phone,
+                    userStatus=status,
+                )
+            )
+        return users
+
+    def pet(self) -> Pet:
+        return self.pets(1)[0]
+
+    def order(self) -> Order:
+        return self.orders(1)[0]
+
+    def user(self) -> User:
+        return self.users(1)[0]
+
+
+_default = ModelFactory()
+
+
+def default_factory() -> ModelFactory:
+    """
+    Factory behind Pet.random(), Order.random() and User.random()
+    """
+    return _default
+
+
+def configure(seed: int = None, pool_size: int = 1000):
+    """
+    Replaces the default factory, e.g. with a seeded one for reproducible runs
+    """
+    global _default
+    _default = ModelFactory(seed=seed, pool_size=pool_size)
@@ -0,0 +1,35 @@
+import threading
+
+_lock = threading.Lock()
+_faker = None
+
+
+def get_faker():
+    """
+    Returns the Faker shared by the model defaults, created on first use.
+    Importing faker and loading its providers is the most expensive part of
+    importing the models, and most runs never need it: Pet/Order/User.random()
+    draw from the ModelFactory pools.
+    """
+    global _faker
+    if _faker is None:
+        with _lock:
+            if _faker is None:
+                from faker import Faker
+
+                _faker = Faker()
+    return _faker
+
+
+class LazyFaker:
+    """
+    Stand-in for a Faker instance that creates the shared one on first attribute access
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(get_faker(), name)
+
+
+fake = LazyFaker()
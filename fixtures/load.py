@@ -0,0 +1,323 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import attr
+
+from common import codec
+from fixtures.app import Application
+from fixtures.cache import ResponseCache
+from fixtures.contract import Contract
+from fixtures.factory import ModelFactory
+from fixtures.metrics import Histogram
+from fixtures.ratelimit import RateLimiter, default_state_file
+from fixtures.requests import AsyncClient, Client
+
+
+@attr.s
+class WorkerContext:
+    """
+    Per-worker state: the entities an operation may read or update.
+    """
+
+    rng: random.Random = attr.ib()
+    factory: ModelFactory = attr.ib()
+    pets: list = attr.ib(factory=list)
+    orders: list = attr.ib(factory=list)
+    users: list = attr.ib(factory=list)
+
+
+def _add_pet(app, ctx):
+    return app.pet_api.add_pet(ctx.factory.pet(), type_response=None)
+
+
+def _get_by_id_pet(app, ctx):
+    return app.pet_api.get_by_id_pet(ctx.rng.choice(ctx.pets).id)
+
+
+def _update_pet(app, ctx):
+    pet = ctx.rng.choice(ctx.pets)
+    return app.pet_api.update_pet(attr.evolve(pet, status="sold"))
+
+
+def _add_order(app, ctx):
+    return app.store_api.add_order(ctx.factory.order(), type_response=None)
+
+
+def _get_order_by_id(app, ctx):
+    return app.store_api.get_order_by_id(ctx.rng.choice(ctx.orders).id)
+
+
+def _add_user(app, ctx):
+    return app.user_api.add_user(ctx.factory.user(), type_response=None)
+
+
+def _get_user_by_username(app, ctx):
+    return app.user_api.get_user_by_username(ctx.rng.choice(ctx.users).username)
+
+
+def _update_user(app, ctx):
+    user = ctx.rng.choice(ctx.users)
+    return app.user_api.update_user(attr.evolve(user, userStatus=1))
+
+
+def _login(app, ctx):
+    user = ctx.rng.choice(ctx.users)
+    return app.user_api.login(user.username, user.password)
+
+
+def _logout(app, ctx):
+    return app.user_api.logout()
+
+
+# Operation name (the API helper it calls) -> callable(app, ctx) returning a Response
+OPERATIONS: Dict[str, Callable] = {
+    "add_pet": _add_pet,
+    "get_by_id_pet": _get_by_id_pet,
+    "update_pet": _update_pet,
+    "add_order": _add_order,
+    "get_order_by_id": _get_order_by_id,
+    "add_user": _add_user,
+    "get_user_by_username": _get_user_by_username,
+    "update_user": _update_user,
+    "login": _login,
+    "logout": _logout,
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parses a workload mix such as "get_by_id_pet=60,add_order=20,login=20"
+    :return: operation name -> weight
+    """
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation {name!r}, expected one of: {', '.join(OPERATIONS)}"
+            )
+        weights[name] = float(weight or 1)
+    return weights
+
+
+@attr.s
+class LoadConfig:
+    """
+    Everything a worker needs to build its own Application and run its share of the load.
+    Must stay picklable for process workers.
+    """
+
+    url: str = attr.ib()
+    mix: Dict[str, float] = attr.ib()
+    duration: float = attr.ib(default=None)
+    requests: int = attr.ib(default=None)
+    seed_entities: int = attr.ib(default=10)
+    pool_maxsize: int = attr.ib(default=10)
+    connect_timeout: float = attr.ib(default=5.0)
+    read_timeout: float = attr.ib(default=30.0)
+    local_server: dict = attr.ib(default=None)
+    seed: int = attr.ib(default=None)
+    cache_size: int = attr.ib(default=0)
+    cache_ttl: float = attr.ib(default=5.0)
+    contract: str = attr.ib(default=None)
+    json_codec: str = attr.ib(default="stdlib")
+    rate_limit: float = attr.ib(default=0.0)
+    rate_burst: float = attr.ib(default=None)
+
+
+@attr.s
+class LoadResult:
+    """
+    Merged outcome of all workers.
+    """
+
+    elapsed: float = attr.ib(default=0.0)
+    histograms: Dict[str, Histogram] = attr.ib(factory=dict)
+    errors: Dict[str, int] = attr.ib(factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(h.count for h in self.histograms.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, data: dict) -> "LoadResult":
+        self.elapsed = max(self.elapsed, data["elapsed"])
+        for name, histogram in data["histograms"].items():
+            histogram = Histogram.from_dict(histogram)
+            if name in self.histograms:
+                self.histograms[name].merge(histogram)
+            else:
+                self.histograms[name] = histogram
+        for name, count in data["errors"].items():
+            self.errors[name] = self.errors.get(name, 0) + count
+        return self
+
+    def report(self) -> str:
+        lines = [
+            f"Requests: {self.total} in {self.elapsed:.2f}s ({self.throughput:.1f} req/s)",
+            f"{'operation':<22}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+        ]
+        for name in sorted(self.histograms):
+            summary = self.histograms[name].summary()
+            lines.append(
+                f"{name:<22}{summary['count']:>8}{self.errors.get(name, 0):>8}"
+                + "".join(
+                    f"{summary[key] * 1000:>10.1f}"
+                    for key in ("p50", "p95", "p99", "max")
+                )
+            )
+        return "\n".join(lines)
+
+
+def build_application(config: LoadConfig) -> Application:
+    """
+    Builds an Application with its own connection pool for one worker
+    """
+    codec.configure(config.json_codec)  # Process workers do not inherit the parent's
+    limiter = None
+    if config.rate_limit:
+        # Every worker opens the same bucket file, so the limit holds for all of them
+        limiter = RateLimiter(
+            config.rate_limit, config.rate_burst, default_state_file(config.url)
+        )
+    client = Client(
+        pool_maxsize=config.pool_maxsize,
+        connect_timeout=config.connect_timeout,
+        read_timeout=config.read_timeout,
+        limiter=limiter,
+    )
+    async_client = AsyncClient(
+        connect_timeout=config.connect_timeout,
+        read_timeout=config.read_timeout,
+        limiter=limiter,
+    )
+    if config.local_server is not None:
+        from fixtures.petstore.server import (
+            AsyncLocalTransport,
+            LocalAdapter,
+            PetstoreServer,
+        )
+
+        server = PetstoreServer(**config.local_server)
+        client.mount(config.url, LocalAdapter(server, config.url))
+        async_client.mount(config.url, AsyncLocalTransport(server, config.url))
+    cache = None
+    if config.cache_size:
+        cache = ResponseCache(maxsize=config.cache_size, ttl=config.cache_ttl)
+    contract = Contract.load(config.contract) if config.contract else None
+    return Application(
+        config.url,
+        client=client,
+        async_client=async_client,
+        cache=cache,
+        contract=contract,
+    )
+
+
+def seed_entities(app: Application, ctx: WorkerContext, count: int):
+    """
+    Creates the pets, orders and users that read/update operations work on
+    """
+    pets = ctx.factory.pets(count)
+    orders = ctx.factory.orders(count)
+    users = ctx.factory.users(count)
+    for pet, order in zip(pets, orders):
+        order.petId = pet.id
+    app.pet_api.add_pets(pets, type_response=None)
+    app.store_api.add_orders(orders, type_response=None)
+    app.user_api.add_users(users)
+    ctx.pets.extend(pets)
+    ctx.orders.extend(orders)
+    ctx.users.extend(users)
+    for pet in ctx.pets:
+        app.waiter.until(
+            lambda: app.pet_api.get_by_id_pet(pet.id, type_response=None),
+            lambda res: res.status_code == 200,
+            description=f"pet {pet.id} is readable",
+        )
+
+
+def run_worker(
+    config: LoadConfig, worker: int, quota: int = None, app: Application = None
+) -> dict:
+    """
+    Runs one worker until its request quota is used up or the configured duration,
+    counted from the end of seeding, has passed
+    :param config: Load configuration.
+    :param worker: Worker number, used for seeding and unique names.
+    :param quota: (optional) Number of requests this worker sends.
+    :param app: (optional) Application to use, built from config (and closed) otherwise.
+    :return: Serialisable result (see LoadResult.merge).
+    """
+    seed = None if config.seed is None else config.seed + worker
+    ctx = WorkerContext(rng=random.Random(seed), factory=ModelFactory(seed=seed))
+    owned = app is None
+    app = app or build_application(config)
+    try:
+        seed_entities(app, ctx, config.seed_entities)
+        names = list(config.mix)
+        weights = list(config.mix.values())
+        histograms = {name: Histogram() for name in names}
+        errors = {}
+        limiter = app.client.limiter
+        start = time.perf_counter()
+        stop = None if config.duration is None else start + config.duration
+        sent = 0
+        while (quota is None or sent < quota) and (
+            stop is None or time.perf_counter() < stop
+        ):
+            name = ctx.rng.choices(names, weights)[0]
+            throttled = limiter.waited if limiter is not None else 0.0
+            began = time.perf_counter()
+            try:
+                failed = OPERATIONS[name](app, ctx).status_code >= 400
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - began
+            if limiter is not None:
+                # Waiting for the rate limiter is not latency of the backend
+                elapsed -= limiter.waited - throttled
+            histograms[name].record(max(elapsed, 0.0))
+            if failed:
+                errors[name] = errors.get(name, 0) + 1
+            sent += 1
+        return {
+            "elapsed": time.perf_counter() - start,
+            "histograms": {n: h.to_dict() for n, h in histograms.items() if h.count},
+            "errors": errors,
+        }
+    finally:
+        if owned:
+            app.close()
+
+
+def run_load(config: LoadConfig, workers: int = 1, mode: str = "thread") -> LoadResult:
+    """
+    Runs the workload on N threads or processes and merges their histograms
+    :param config: Load configuration (duration and/or request count).
+    :param workers: Number of concurrent workers.
+    :param mode: "thread" or "process".
+    """
+    if config.duration is None and config.requests is None:
+        raise ValueError("Either duration or requests must be set")
+    quotas: List[int] = [None] * workers
+    if config.requests is not None:
+        quotas = [
+            config.requests // workers + (1 if i < config.requests % workers else 0)
+            for i in range(workers)
+        ]
+    executor = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+    result = LoadResult()
+    with executor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_worker, config, worker, quotas[worker])
+            for worker in range(workers)
+        ]
+        for future in futures:
+            result.merge(future.result())
+    return result
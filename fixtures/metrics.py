@@ -0,0 +1,195 @@
+import math
+import threading
+
+
+class Histogram:
+    def __init__(self, precision: float = 0.01):
+        """
+        Log-linear latency histogram. Values are grouped into buckets whose bounds grow by
+        (1 + precision), so percentiles have a bounded relative error, memory stays small
+        and histograms recorded in different threads or processes can be merged.
+        :param precision: Relative width of a bucket (0.01 means 1%).
+        """
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float):
+        """
+        Records one value (seconds)
+        """
+        bucket = math.floor(math.log(value) / self._log_base) if value > 0 else None
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """
+        Adds the values of another histogram with the same precision
+        :return: self
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge histograms with different precision")
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the value below which percent of the recorded values fall
+        :param percent: 0..100
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.buckets, key=lambda b: -math.inf if b is None else b):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                if bucket is None:
+                    return 0.0
+                # Middle of the bucket, clamped to the observed range
+                value = math.exp((bucket + 0.5) * self._log_base)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        """
+        Returns count, mean, p50, p90, p95, p99 and max
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def to_dict(self) -> dict:
+        """
+        Serialisable form, used to ship histograms between processes
+        """
+        return {
+            "precision": self.precision,
+            "buckets": [[bucket, count] for bucket, count in self.buckets.items()],
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        histogram = cls(precision=data["precision"])
+        histogram.buckets = {bucket: count for bucket, count in data["buckets"]}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = math.inf if data["min"] is None else data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+class EndpointStats:
+    def __init__(self):
+        """
+        Latency, traffic and status codes of one endpoint template.
+        """
+        self.histogram = Histogram()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses = {}
+
+    def to_dict(self) -> dict:
+        return {
+            "histogram": self.histogram.to_dict(),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "statuses": dict(self.statuses),
+        }
+
+    def merge(self, data: dict):
+        self.histogram.merge(Histogram.from_dict(data["histogram"]))
+        self.bytes_sent += data["bytes_sent"]
+        self.bytes_received += data["bytes_received"]
+        for status, count in data["statuses"].items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+
+class ClientStats:
+    def __init__(self):
+        """
+        Per-endpoint request metrics recorded by Client and AsyncClient.
+        Endpoints are keyed by template (e.g. "PetAPI.GET_PET"), not by expanded URL.
+        """
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        endpoint: str,
+        duration: float,
+        status,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ):
+        """
+        Records one finished (or failed) request
+        :param endpoint: Endpoint template name.
+        :param duration: Seconds from sending the request to receiving the response.
+        :param status: HTTP status code, or the exception class name for failed requests.
+        """
+        with self.lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats()
+            stats.histogram.record(duration)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            status = str(status)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def to_dict(self) -> dict:
+        """
+        Serialisable form, used to ship the stats from xdist workers
+        """
+        with self.lock:
+            return {name: stats.to_dict() for name, stats in self.endpoints.items()}
+
+    def merge(self, data: dict) -> "ClientStats":
+        with self.lock:
+            for name, endpoint in data.items():
+                self.endpoints.setdefault(name, EndpointStats()).merge(endpoint)
+        return self
+
+    def summary(self) -> dict:
+        """
+        Returns endpoint -> count, percentiles (seconds), traffic and status codes
+        """
+        with self.lock:
+            return {
+                name: {
+                    **stats.histogram.summary(),
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                    "statuses": dict(stats.statuses),
+                }
+                for name, stats in sorted(self.endpoints.items())
+            }
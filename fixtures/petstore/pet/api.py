@@ -1,6 +1,9 @@
+from typing import Iterable, Iterator, List, Union
+
 from requests import Response
 
 from common.deco import logging as log
+from fixtures.batch import BatchResult, run_batch, run_batch_async
 from fixtures.petstore.pet.model import Pet
 from fixtures.validator import Validator
 
@@ -18,6 +21,7 @@ class PetAPI(Validator):
     GET_PET = "/pet/{}"  # Endpoint used to retrieve a pet
     PUT_PET = "/pet"  # Endpoint used to update a pet
     DELETE_PET = "/pet/{}"  # Endpoint used to delete a pet
+    FIND_BY_STATUS = "/pet/findByStatus"  # Endpoint used to find pets by status
 
     @log("Adding a new pet")
     def add_pet(self, data: Pet, type_response=Pet) -> Response:
@@ -30,6 +34,9 @@ class PetAPI(Validator):
         response = self.app.client.request(
             method="POST",
             url=f"{self.app.url}{self.POST_PET}",
+            endpoint="PetAPI.POST_PET",
+            cache=self.app.cache,
+            invalidate=f"{self.app.url}{self.GET_PET.format(data.id)}",
             json=data.to_dict(),  # Send pet data in JSON format
         )
         return self.structure(
@@ -47,6 +54,8 @@ class PetAPI(Validator):
         response = self.app.client.request(
             method="GET",
             url=f"{self.app.url}{self.GET_PET.format(pet_id)}",  # Pet ID is added to the URL
+            endpoint="PetAPI.GET_PET",
+            cache=self.app.cache,
         )
         return self.structure(
             response, type_response=type_response
@@ -63,6 +72,9 @@ class PetAPI(Validator):
         response = self.app.client.request(
             method="PUT",
             url=f"{self.app.url}{self.PUT_PET}",
+            endpoint="PetAPI.PUT_PET",
+            cache=self.app.cache,
+            invalidate=f"{self.app.url}{self.GET_PET.format(data.id)}",
             json=data.to_dict(),  # Send updated pet data in JSON format
         )
         return self.structure(
@@ -79,5 +91,176 @@ class PetAPI(Validator):
         response = self.app.client.request(
             method="DELETE",
             url=f"{self.app.url}{self.DELETE_PET.format(pet_id)}",  # Pet ID is added to the URL
+            endpoint="PetAPI.DELETE_PET",
+            cache=self.app.cache,
         )
         return response  # Return the response related to the deletion operation
+
+    @log("Finding pets by status")
+    def find_by_status(
+        self,
+        status: Union[str, Iterable[str]],
+        type_response=Pet,
+        chunk_size: int = 65536,
+    ) -> Iterator[Pet]:
+        """
+        Finds pets by status, streaming the response.
+        The JSON array is parsed while it downloads, so memory stays flat for large results
+        and the first pets are available before the body is complete.
+        :param status: Status or statuses to look for (available, pending, sold).
+        :param type_response: (optional) Type every element is converted to (Pet by default, None for dicts).
+        :param chunk_size: (optional) Bytes read from the connection at a time.
+        :return: Generator of structured pets. Raises requests.HTTPError for a non-2xx answer
+            and ContractViolation for a status, content type or pet the contract does not allow.
+        """
+        if not isinstance(status, str):
+            status = ",".join(status)
+        response = self.app.client.request(
+            method="GET",
+            url=f"{self.app.url}{self.FIND_BY_STATUS}",
+            endpoint="PetAPI.FIND_BY_STATUS",
+            params={"status": status},
+            stream=True,  # Read the body while iterating
+        )
+        with response:
+            yield response  # Logged by the decorator, not passed on
+            yield from self.structure_stream(response, type_response, chunk_size)
+
+    def add_pets(
+        self, pets: Iterable[Pet], concurrency: int = 8, type_response=Pet
+    ) -> List[BatchResult]:
+        """
+        Adds several pets with at most concurrency requests in flight.
+        :param pets: Pet objects to add.
+        :param concurrency: Maximum number of concurrent requests.
+        :param type_response: (optional) Determines which type to convert the responses to (Pet by default).
+        :return: One BatchResult per pet, in input order.
+        """
+        return run_batch(
+            lambda pet: self.add_pet(pet, type_response=type_response),
+            pets,
+            concurrency,
+        )
+
+    def delete_pets(
+        self, pet_ids: Iterable[int], concurrency: int = 8
+    ) -> List[BatchResult]:
+        """
+        Deletes several pets with at most concurrency requests in flight.
+        :param pet_ids: IDs of the pets to delete.
+        :param concurrency: Maximum number of concurrent requests.
+        :return: One BatchResult per ID, in input order.
+        """
+        return run_batch(self.delete_pet, pet_ids, concurrency)
+
+
+class AsyncPetAPI(PetAPI):
+    """
+    Async variant of PetAPI. Every helper is a coroutine that sends its request through
+    the application's AsyncClient, so many calls can be in flight on one event loop.
+    """
+
+    @log("Adding a new pet")
+    async def add_pet(self, data: Pet, type_response=Pet) -> Response:
+        """
+        Adds a new pet.
+        :param data: An object from the Pet model. This contains the data of the pet to be added.
+        :param type_response: (optional) Determines which type to convert the response to (Pet by default).
+        :return: Response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="POST",
+            url=f"{self.app.url}{self.POST_PET}",
+            endpoint="PetAPI.POST_PET",
+            cache=self.app.cache,
+            invalidate=f"{self.app.url}{self.GET_PET.format(data.id)}",
+            json=data.to_dict(),
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Retrieving pet by ID")
+    async def get_by_id_pet(self, pet_id: int, type_response=Pet) -> Response:
+        """
+        Retrieves a pet with the given ID.
+        :param pet_id: Unique identifier (ID) of the pet.
+        :param type_response: (optional) Determines which type to convert the response to (Pet by default).
+        :return: Response containing the pet's information.
+        """
+        response = await self.app.async_client.request(
+            method="GET",
+            url=f"{self.app.url}{self.GET_PET.format(pet_id)}",
+            endpoint="PetAPI.GET_PET",
+            cache=self.app.cache,
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Updating an existing pet")
+    async def update_pet(self, data: Pet, type_response=Pet) -> Response:
+        """
+        Updates an existing pet.
+        :param data: An object from the Pet model. This contains the updated pet data.
+        :param type_response: (optional) Determines which type to convert the response to (Pet by default).
+        :return: Response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="PUT",
+            url=f"{self.app.url}{self.PUT_PET}",
+            endpoint="PetAPI.PUT_PET",
+            cache=self.app.cache,
+            invalidate=f"{self.app.url}{self.GET_PET.format(data.id)}",
+            json=data.to_dict(),
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Deleting pet by ID")
+    async def delete_pet(self, pet_id: int) -> Response:
+        """
+        Deletes a specific pet by pet ID.
+        :param pet_id: Unique identifier (ID) of the pet to be deleted.
+        :return: Response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="DELETE",
+            url=f"{self.app.url}{self.DELETE_PET.format(pet_id)}",
+            endpoint="PetAPI.DELETE_PET",
+            cache=self.app.cache,
+        )
+        return response
+
+    def find_by_status(self, *args, **kwargs):
+        """
+        Not available asynchronously: the streamed body is read through the blocking Client.
+        :raises TypeError: Always; use app.pet_api.find_by_status, e.g. in asyncio.to_thread.
+        """
+        raise TypeError(
+            "find_by_status streams through the blocking Client and has no async variant; "
+            "use app.pet_api.find_by_status, e.g. "
+            "await asyncio.to_thread(list, app.pet_api.find_by_status(status))"
+        )
+
+    async def add_pets(
+        self, pets: Iterable[Pet], concurrency: int = 100, type_response=Pet
+    ) -> List[BatchResult]:
+        """
+        Adds several pets with at most concurrency requests in flight.
+        :param pets: Pet objects to add.
+        :param concurrency: Maximum number of concurrent requests.
+        :param type_response: (optional) Determines which type to convert the responses to (Pet by default).
+        :return: One BatchResult per pet, in input order.
+        """
+        return await run_batch_async(
+            lambda pet: self.add_pet(pet, type_response=type_response),
+            pets,
+            concurrency,
+        )
+
+    async def delete_pets(
+        self, pet_ids: Iterable[int], concurrency: int = 100
+    ) -> List[BatchResult]:
+        """
+        Deletes several pets with at most concurrency requests in flight.
+        :param pet_ids: IDs of the pets to delete.
+        :param concurrency: Maximum number of concurrent requests.
+        :return: One BatchResult per ID, in input order.
+        """
+        return await run_batch_async(self.delete_pet, pet_ids, concurrency)
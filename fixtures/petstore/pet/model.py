@@ -1,19 +1,17 @@
 import attr
 
-from faker import Faker
 from fixtures.base import BaseClass
+from fixtures.fake import fake
 
-fake = Faker()
 
-
-@attr.s
+@attr.s(slots=True)
 class Category(BaseClass):
     """
     Represents a category for a pet.
     """
 
-    id: int = attr.ib(default=fake.random_int(min=1, max=1000))
-    name: str = attr.ib(default=fake.word())
+    id: int = attr.ib(factory=lambda: fake.random_int(min=1, max=1000))
+    name: str = attr.ib(factory=lambda: fake.word())
 
     def to_dict(self):
         """
@@ -22,27 +20,29 @@ class Category(BaseClass):
         return {"id": self.id, "name": self.name}
 
 
-@attr.s
+@attr.s(slots=True)
 class Pet(BaseClass):
     """
     Represents a pet with various attributes such as name, category, and status.
     """
 
     id: int = attr.ib(default=None)
-    category: Category = attr.ib(default=Category())
-    name: str = attr.ib(default=fake.first_name())
-    photoUrls: list = attr.ib(default=[fake.image_url()])
-    tags: list = attr.ib(default=[])
+    category: Category = attr.ib(factory=Category)
+    name: str = attr.ib(factory=lambda: fake.first_name())
+    photoUrls: list = attr.ib(factory=lambda: [fake.image_url()])
+    tags: list = attr.ib(factory=list)
     status: str = attr.ib(
-        default=fake.random_element(elements=["available", "pending", "sold"])
+        factory=lambda: fake.random_element(elements=["available", "pending", "sold"])
     )
 
     @staticmethod
     def random():
         """
-        Generates a random Pet instance.
+        Generates a random Pet instance with a unique ID.
         """
-        return Pet()
+        from fixtures.factory import default_factory
+
+        return default_factory().pet()
 
     def to_dict(self):
         """
@@ -62,7 +62,7 @@ class Pet(BaseClass):
         }
 
 
-@attr.s
+@attr.s(slots=True)
 class ApiResponse(BaseClass):
     """
     Represents a standard API response.
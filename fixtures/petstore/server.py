@@ -0,0 +1,357 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+PET_STATUSES = ("available", "pending", "sold")
+
+
+class Table:
+    def __init__(self, index_field: str = None):
+        """
+        In-memory table with delayed visibility of writes (read-after-write lag).
+        Every key keeps the versions that are not visible yet plus the latest visible one.
+        :param index_field: (optional) Field of the stored dicts kept in a secondary index.
+        """
+        self.rows = {}
+        self.index_field = index_field
+        self.index = {}
+
+    def put(self, key, value, visible_at: float):
+        self.rows.setdefault(key, []).append((visible_at, value))
+        if self.index_field:
+            self.index.setdefault(value.get(self.index_field), set()).add(key)
+
+    def delete(self, key, visible_at: float):
+        self.rows.setdefault(key, []).append((visible_at, None))
+
+    def get(self, key, now: float):
+        versions = self.rows.get(key)
+        if not versions:
+            return None
+        visible = [i for i, (visible_at, _) in enumerate(versions) if visible_at <= now]
+        if not visible:
+            return None
+        # Older versions can never be read again
+        del versions[: visible[-1]]
+        return versions[0][1]
+
+    def find(self, value, now: float) -> list:
+        """
+        Returns the visible rows whose index field equals value
+        """
+        found = []
+        for key in list(self.index.get(value, ())):
+            row = self.get(key, now)
+            if row is not None and row.get(self.index_field) == value:
+                found.append(row)
+            elif not any(
+                version is not None and version.get(self.index_field) == value
+                for _, version in self.rows.get(key, ())
+            ):
+                # No remaining version of the row carries the value any more
+                self.index[value].discard(key)
+        return found
+
+
+class PetstoreServer:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        consistency_lag: float = 0.0,
+        seed: int = None,
+    ):
+        """
+        In-process stand-in for the Petstore /pet, /store/order and /user endpoints.
+        :param latency: Seconds added to every request by the transport adapters.
+        :param error_rate: Probability (0..1) that a request fails with 500.
+        :param consistency_lag: Seconds before a write becomes visible to reads.
+        :param seed: (optional) Seed for injected errors and generated IDs.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.consistency_lag = consistency_lag
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.pets = Table(index_field="status")
+        self.orders = Table()
+        self.users = Table()
+        self.routes = [
+            ("POST", re.compile(r"/pet"), self.add_pet),
+            ("PUT", re.compile(r"/pet"), self.update_pet),
+            ("GET", re.compile(r"/pet/findByStatus"), self.find_pets),
+            ("GET", re.compile(r"/pet/(?P<pet_id>[^/]+)"), self.get_pet),
+            ("DELETE", re.compile(r"/pet/(?P<pet_id>[^/]+)"), self.delete_pet),
+            ("POST", re.compile(r"/store/order"), self.add_order),
+            ("GET", re.compile(r"/store/order/(?P<order_id>[^/]+)"), self.get_order),
+            (
+                "DELETE",
+                re.compile(r"/store/order/(?P<order_id>[^/]+)"),
+                self.delete_order,
+            ),
+            ("POST", re.compile(r"/user/createWith(Array|List)"), self.add_users),
+            ("GET", re.compile(r"/user/login"), self.login),
+            ("GET", re.compile(r"/user/logout"), self.logout),
+            ("POST", re.compile(r"/user"), self.add_user),
+            ("GET", re.compile(r"/user/(?P<username>[^/]+)"), self.get_user),
+            ("PUT", re.compile(r"/user/(?P<username>[^/]+)"), self.update_user),
+            ("DELETE", re.compile(r"/user/(?P<username>[^/]+)"), self.delete_user),
+        ]
+
+    @staticmethod
+    def api_response(code: int, message: str, type_: str = "unknown") -> dict:
+        return {"code": code, "type": type_, "message": message}
+
+    def handle(self, method: str, path: str, query: dict = None, body: bytes = None):
+        """
+        Dispatches a request to the matching endpoint
+        :param method: HTTP method
+        :param path: Path relative to the API base URL, e.g. /pet/1
+        :param query: Query parameters (name -> value)
+        :param body: Raw request body
+        :return: (status code, JSON serialisable body or None, extra headers)
+        """
+        if self.error_rate and self.random.random() < self.error_rate:
+            return 500, self.api_response(500, "something bad happened"), {}
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                try:
+                    payload = json.loads(body) if body else None
+                except ValueError:
+                    return 400, self.api_response(400, "bad input"), {}
+                with self.lock:
+                    return handler(
+                        now=time.monotonic(),
+                        query=query or {},
+                        payload=payload,
+                        **match.groupdict(),
+                    )
+        return 404, self.api_response(404, "not found"), {}
+
+    @staticmethod
+    def parse_id(value: str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+    def write_pet(self, now, payload):
+        if (
+            not isinstance(payload, dict)
+            or payload.get("status", "available") not in PET_STATUSES
+        ):
+            return 400, self.api_response(400, "Invalid status value"), {}
+        pet = dict(payload)
+        if not pet.get("id"):
+            pet["id"] = self.random.randint(1, 2**53)
+        self.pets.put(pet["id"], pet, now + self.consistency_lag)
+        return 200, pet, {}
+
+    def add_pet(self, now, payload, **_):
+        return self.write_pet(now, payload)
+
+    def update_pet(self, now, payload, **_):
+        return self.write_pet(now, payload)
+
+    def get_pet(self, now, pet_id, **_):
+        pet = self.pets.get(self.parse_id(pet_id), now)
+        if pet is None:
+            return 404, self.api_response(1, "Pet not found", "error"), {}
+        return 200, pet, {}
+
+    def find_pets(self, now, query, **_):
+        statuses = query.get("status", "").split(",")
+        if not all(status in PET_STATUSES for status in statuses):
+            return 400, self.api_response(400, "Invalid status value"), {}
+        return (
+            200,
+            [pet for status in statuses for pet in self.pets.find(status, now)],
+            {},
+        )
+
+    def delete_pet(self, now, pet_id, **_):
+        key = self.parse_id(pet_id)
+        if self.pets.get(key, now) is None:
+            return 404, None, {}
+        self.pets.delete(key, now + self.consistency_lag)
+        return 200, self.api_response(200, str(key)), {}
+
+    def add_order(self, now, payload, **_):
+        if not isinstance(payload, dict):
+            return 400, self.api_response(400, "Invalid Order"), {}
+        order = dict(payload)
+        if not order.get("id"):
+            order["id"] = self.random.randint(1, 2**53)
+        self.orders.put(order["id"], order, now + self.consistency_lag)
+        return 200, order, {}
+
+    def get_order(self, now, order_id, **_):
+        order = self.orders.get(self.parse_id(order_id), now)
+        if order is None:
+            return 404, self.api_response(1, "Order not found", "error"), {}
+        return 200, order, {}
+
+    def delete_order(self, now, order_id, **_):
+        key = self.parse_id(order_id)
+        if self.orders.get(key, now) is None:
+            return 404, self.api_response(404, "Order Not Found"), {}
+        self.orders.delete(key, now + self.consistency_lag)
+        return 200, self.api_response(200, str(key)), {}
+
+    def add_user(self, now, payload, **_):
+        if not isinstance(payload, dict) or not payload.get("username"):
+            return 400, self.api_response(400, "Invalid user supplied"), {}
+        self.users.put(payload["username"], dict(payload), now + self.consistency_lag)
+        return 200, self.api_response(200, str(payload.get("id"))), {}
+
+    def add_users(self, now, payload, **_):
+        if not isinstance(payload, list) or not all(
+            isinstance(user, dict) and user.get("username") for user in payload
+        ):
+            return 400, self.api_response(400, "Invalid user supplied"), {}
+        for user in payload:
+            self.users.put(user["username"], dict(user), now + self.consistency_lag)
+        return 200, self.api_response(200, "ok"), {}
+
+    def get_user(self, now, username, **_):
+        user = self.users.get(username, now)
+        if user is None:
+            return 404, self.api_response(1, "User not found", "error"), {}
+        return 200, user, {}
+
+    def update_user(self, now, username, payload, **_):
+        if not isinstance(payload, dict):
+            return 400, self.api_response(400, "Invalid user supplied"), {}
+        self.users.put(username, dict(payload), now + self.consistency_lag)
+        return 200, self.api_response(200, str(payload.get("id"))), {}
+
+    def delete_user(self, now, username, **_):
+        if self.users.get(username, now) is None:
+            return 404, None, {}
+        self.users.delete(username, now + self.consistency_lag)
+        return 200, self.api_response(200, username), {}
+
+    def login(self, query, **_):
+        session = self.random.randint(10**12, 10**13)
+        headers = {"X-Rate-Limit": "5000", "X-Expires-After": "3600"}
+        return 200, self.api_response(200, f"logged in user session:{session}"), headers
+
+    def logout(self, **_):
+        return 200, self.api_response(200, "ok"), {}
+
+
+def _dispatch(
+    server: PetstoreServer,
+    base_path: str,
+    method: str,
+    url: str,
+    body,
+    if_none_match: str = None,
+):
+    """
+    Runs a request against the server and encodes the result.
+    Successful GETs carry an ETag; a matching If-None-Match is answered with 304.
+    :return: (status code, headers, body bytes)
+    """
+    parts = urlsplit(url)
+    path = (
+        parts.path[len(base_path) :] if parts.path.startswith(base_path) else parts.path
+    )
+    query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    status, payload, headers = server.handle(
+        method, path.rstrip("/") or "/", query, body
+    )
+    content = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    if method == "GET" and status == 200:
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        headers = {"ETag": etag, **headers}
+        if if_none_match == etag:
+            status, content = 304, b""
+    headers = {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(content)),
+        **headers,
+    }
+    return status, headers, content
+
+
+class LocalAdapter(BaseAdapter):
+    def __init__(self, server: PetstoreServer, base_url: str):
+        """
+        requests transport adapter that serves requests from a PetstoreServer without sockets.
+        Mount it on the API base URL: client.mount(base_url, LocalAdapter(server, base_url)).
+        :param server: The in-process server.
+        :param base_url: API base URL, its path is stripped before routing.
+        """
+        super().__init__()
+        self.server = server
+        self.base_path = urlsplit(base_url).path.rstrip("/")
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        start = time.perf_counter()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        status, headers, content = _dispatch(
+            self.server,
+            self.base_path,
+            request.method,
+            request.url,
+            request.body,
+            request.headers.get("If-None-Match"),
+        )
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = content
+        response.elapsed = datetime.timedelta(seconds=time.perf_counter() - start)
+        return response
+
+    def close(self):
+        pass
+
+
+class AsyncLocalTransport(httpx.AsyncBaseTransport):
+    def __init__(self, server: PetstoreServer, base_url: str):
+        """
+        httpx transport that serves AsyncClient requests from a PetstoreServer without sockets.
+        :param server: The in-process server.
+        :param base_url: API base URL, its path is stripped before routing.
+        """
+        self.server = server
+        self.base_path = urlsplit(base_url).path.rstrip("/")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.server.latency:
+            await asyncio.sleep(self.server.latency)
+        body = await request.aread()
+        status, headers, content = _dispatch(
+            self.server,
+            self.base_path,
+            request.method,
+            str(request.url),
+            body,
+            request.headers.get("If-None-Match"),
+        )
+        return httpx.Response(
+            status, headers=headers, stream=httpx.ByteStream(content), request=request
+        )
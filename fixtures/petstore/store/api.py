@@ -1,6 +1,9 @@
+from typing import Iterable, List
+
 from requests import Response
 
 from common.deco import logging as log
+from fixtures.batch import BatchResult, run_batch, run_batch_async
 from fixtures.petstore.store.model import Order
 from fixtures.validator import Validator
 
@@ -31,6 +34,9 @@ class StoreAPI(Validator):
         response = self.app.client.request(
             method="POST",
             url=f"{self.app.url}{self.POST_ORDER}",
+            endpoint="StoreAPI.POST_ORDER",
+            cache=self.app.cache,
+            invalidate=f"{self.app.url}{self.GET_ORDER.format(data.id)}",
             json=data.to_dict(),
         )
         return self.structure(response, type_response=type_response)
@@ -47,6 +53,8 @@ class StoreAPI(Validator):
         response = self.app.client.request(
             method="GET",
             url=f"{self.app.url}{self.GET_ORDER.format(order_id)}",
+            endpoint="StoreAPI.GET_ORDER",
+            cache=self.app.cache,
         )
         return self.structure(response, type_response=type_response)
 
@@ -61,5 +69,124 @@ class StoreAPI(Validator):
         response = self.app.client.request(
             method="DELETE",
             url=f"{self.app.url}{self.DELETE_ORDER.format(order_id)}",
+            endpoint="StoreAPI.DELETE_ORDER",
+            cache=self.app.cache,
+        )
+        return response
+
+    def add_orders(
+        self, orders: Iterable[Order], concurrency: int = 8, type_response=Order
+    ) -> List[BatchResult]:
+        """
+        Adds several orders with at most concurrency requests in flight.
+
+        :param orders: Order objects to add.
+        :param concurrency: Maximum number of concurrent requests.
+        :param type_response: (optional) Determines which type to convert the responses to (Order by default).
+        :return: One BatchResult per order, in input order.
+        """
+        return run_batch(
+            lambda order: self.add_order(order, type_response=type_response),
+            orders,
+            concurrency,
+        )
+
+    def delete_orders(
+        self, order_ids: Iterable[int], concurrency: int = 8
+    ) -> List[BatchResult]:
+        """
+        Deletes several orders with at most concurrency requests in flight.
+
+        :param order_ids: IDs of the orders to delete.
+        :param concurrency: Maximum number of concurrent requests.
+        :return: One BatchResult per ID, in input order.
+        """
+        return run_batch(self.delete_order, order_ids, concurrency)
+
+
+class AsyncStoreAPI(StoreAPI):
+    """
+    Async variant of StoreAPI. Every helper is a coroutine that sends its request through
+    the application's AsyncClient, so many calls can be in flight on one event loop.
+    """
+
+    @log("Adding a new order")
+    async def add_order(self, data: Order, type_response=Order) -> Response:
+        """
+        Adds a new order.
+
+        :param data: An object from the Order model. This contains the data for the order to be added.
+        :param type_response: (optional) Determines which type to convert the response to (Order by default).
+        :return: The response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="POST",
+            url=f"{self.app.url}{self.POST_ORDER}",
+            endpoint="StoreAPI.POST_ORDER",
+            cache=self.app.cache,
+            invalidate=f"{self.app.url}{self.GET_ORDER.format(data.id)}",
+            json=data.to_dict(),
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Retrieving order by ID")
+    async def get_order_by_id(self, order_id: int, type_response=Order) -> Response:
+        """
+        Retrieves an order with the given ID.
+
+        :param order_id: The unique identifier (ID) of the order.
+        :param type_response: (optional) Determines which type to convert the response to (Order by default).
+        :return: The response containing the order's information.
+        """
+        response = await self.app.async_client.request(
+            method="GET",
+            url=f"{self.app.url}{self.GET_ORDER.format(order_id)}",
+            endpoint="StoreAPI.GET_ORDER",
+            cache=self.app.cache,
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Deleting order by ID")
+    async def delete_order(self, order_id: int) -> Response:
+        """
+        Deletes a specific order by order ID.
+
+        :param order_id: The unique identifier (ID) of the order to be deleted.
+        :return: The response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="DELETE",
+            url=f"{self.app.url}{self.DELETE_ORDER.format(order_id)}",
+            endpoint="StoreAPI.DELETE_ORDER",
+            cache=self.app.cache,
         )
         return response
+
+    async def add_orders(
+        self, orders: Iterable[Order], concurrency: int = 100, type_response=Order
+    ) -> List[BatchResult]:
+        """
+        Adds several orders with at most concurrency requests in flight.
+
+        :param orders: Order objects to add.
+        :param concurrency: Maximum number of concurrent requests.
+        :param type_response: (optional) Determines which type to convert the responses to (Order by default).
+        :return: One BatchResult per order, in input order.
+        """
+        return await run_batch_async(
+            lambda order: self.add_order(order, type_response=type_response),
+            orders,
+            concurrency,
+        )
+
+    async def delete_orders(
+        self, order_ids: Iterable[int], concurrency: int = 100
+    ) -> List[BatchResult]:
+        """
+        Deletes several orders with at most concurrency requests in flight.
+
+        :param order_ids: IDs of the orders to delete.
+        :param concurrency: Maximum number of concurrent requests.
+        :return: One BatchResult per ID, in input order.
+        """
+        return await run_batch_async(self.delete_order, order_ids, concurrency)
@@ -1,28 +1,30 @@
 import attr
-from faker import Faker
 from fixtures.base import BaseClass
+from fixtures.fake import fake
 
-fake = Faker()
 
-
-@attr.s
+@attr.s(slots=True)
 class Order(BaseClass):
     """
     Represents an order for a pet.
     """
 
-    id: int = attr.ib(default=fake.random_int(min=1, max=10000))
-    petId: int = attr.ib(default=fake.random_int(min=1, max=10000))
-    quantity: int = attr.ib(default=fake.random_int(min=1, max=10))
-    shipDate: str = attr.ib(default=fake.iso8601())
+    id: int = attr.ib(factory=lambda: fake.random_int(min=1, max=10000))
+    petId: int = attr.ib(factory=lambda: fake.random_int(min=1, max=10000))
+    quantity: int = attr.ib(factory=lambda: fake.random_int(min=1, max=10))
+    shipDate: str = attr.ib(factory=lambda: fake.iso8601())
     status: str = attr.ib(
-        default=fake.random_element(elements=["placed", "approved", "delivered"])
+        factory=lambda: fake.random_element(
+            elements=["placed", "approved", "delivered"]
+        )
     )
-    complete: bool = attr.ib(default=fake.boolean())
+    complete: bool = attr.ib(factory=lambda: fake.boolean())
 
     @staticmethod
     def random():
-        return Order()
+        from fixtures.factory import default_factory
+
+        return default_factory().order()
 
     def to_dict(self):
         return {
@@ -1,6 +1,10 @@
+from typing import Iterable, List
+
 from requests import Response
 
 from common.deco import logging as log
+from fixtures.batch import BatchResult, chunked, run_batch, run_batch_async
+from fixtures.petstore.pet.model import ApiResponse
 from fixtures.petstore.user.model import User
 from fixtures.validator import Validator
 
@@ -20,6 +24,10 @@ class UserAPI(Validator):
     DELETE_USER = "/user/{}"  # Endpoint used to delete a user
     LOGIN_USER = "/user/login"  # User login endpoint
     LOGOUT_USER = "/user/logout"  # User logout endpoint
+    CREATE_WITH_ARRAY = (
+        "/user/createWithArray"  # Endpoint used to add users from an array
+    )
+    CREATE_WITH_LIST = "/user/createWithList"  # Endpoint used to add users from a list
 
     @log("Adding new user")
     def add_user(self, data: User, type_response=User) -> Response:
@@ -32,6 +40,9 @@ class UserAPI(Validator):
         response = self.app.client.request(
             method="POST",
             url=f"{self.app.url}{self.POST_USER}",
+            endpoint="UserAPI.POST_USER",
+            cache=self.app.cache,
+            invalidate=f"{self.app.url}{self.GET_USER.format(data.username)}",
             json=data.to_dict(),
         )
         return self.structure(response, type_response=type_response)
@@ -47,6 +58,8 @@ class UserAPI(Validator):
         response = self.app.client.request(
             method="GET",
             url=f"{self.app.url}{self.GET_USER.format(username)}",
+            endpoint="UserAPI.GET_USER",
+            cache=self.app.cache,
         )
         return self.structure(response, type_response=type_response)
 
@@ -61,6 +74,8 @@ class UserAPI(Validator):
         response = self.app.client.request(
             method="PUT",
             url=f"{self.app.url}{self.PUT_USER.format(data.username)}",
+            endpoint="UserAPI.PUT_USER",
+            cache=self.app.cache,
             json=data.to_dict(),
         )
         return self.structure(response, type_response=type_response)
@@ -75,6 +90,8 @@ class UserAPI(Validator):
         response = self.app.client.request(
             method="DELETE",
             url=f"{self.app.url}{self.DELETE_USER.format(username)}",
+            endpoint="UserAPI.DELETE_USER",
+            cache=self.app.cache,
         )
         return response
 
@@ -89,6 +106,7 @@ class UserAPI(Validator):
         response = self.app.client.request(
             method="GET",
             url=f"{self.app.url}{self.LOGIN_USER}",
+            endpoint="UserAPI.LOGIN_USER",
             params={
                 "username": username,
                 "password": password,
@@ -105,5 +123,243 @@ class UserAPI(Validator):
         response = self.app.client.request(
             method="GET",
             url=f"{self.app.url}{self.LOGOUT_USER}",
+            endpoint="UserAPI.LOGOUT_USER",
+        )
+        return response
+
+    @log("Adding users with array")
+    def create_with_array(
+        self, users: List[User], type_response=ApiResponse
+    ) -> Response:
+        """
+        Adds several users in one request.
+        :param users: User objects to add.
+        :param type_response: (optional) Specifies the type to convert the response to (default is ApiResponse).
+        :return: The response returned by the API (Response object).
+        """
+        response = self.app.client.request(
+            method="POST",
+            url=f"{self.app.url}{self.CREATE_WITH_ARRAY}",
+            endpoint="UserAPI.CREATE_WITH_ARRAY",
+            json=[user.to_dict() for user in users],
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Adding users with list")
+    def create_with_list(
+        self, users: List[User], type_response=ApiResponse
+    ) -> Response:
+        """
+        Adds several users in one request.
+        :param users: User objects to add.
+        :param type_response: (optional) Specifies the type to convert the response to (default is ApiResponse).
+        :return: The response returned by the API (Response object).
+        """
+        response = self.app.client.request(
+            method="POST",
+            url=f"{self.app.url}{self.CREATE_WITH_LIST}",
+            endpoint="UserAPI.CREATE_WITH_LIST",
+            json=[user.to_dict() for user in users],
+        )
+        return self.structure(response, type_response=type_response)
+
+    def add_users(
+        self, users: Iterable[User], chunk_size: int = 100, concurrency: int = 8
+    ) -> List[BatchResult]:
+        """
+        Adds many users through createWithList, chunk_size users per request.
+        :param users: User objects to add.
+        :param chunk_size: Number of users sent per request.
+        :param concurrency: Maximum number of concurrent requests.
+        :return: One BatchResult per user, carrying the response of its chunk, in input order.
+        """
+        results = run_batch(
+            self.create_with_list, chunked(users, chunk_size), concurrency
+        )
+        return [
+            BatchResult(item=user, response=result.response, error=result.error)
+            for result in results
+            for user in result.item
+        ]
+
+    def delete_users(
+        self, usernames: Iterable[str], concurrency: int = 8
+    ) -> List[BatchResult]:
+        """
+        Deletes several users with at most concurrency requests in flight.
+        :param usernames: Usernames of the users to delete.
+        :param concurrency: Maximum number of concurrent requests.
+        :return: One BatchResult per username, in input order.
+        """
+        return run_batch(self.delete_user, usernames, concurrency)
+
+
+class AsyncUserAPI(UserAPI):
+    """
+    Async variant of UserAPI. Every helper is a coroutine that sends its request through
+    the application's AsyncClient, so many calls can be in flight on one event loop.
+    """
+
+    @log("Adding new user")
+    async def add_user(self, data: User, type_response=User) -> Response:
+        """
+        Adds a new user.
+        :param data: An object from the User model. This contains the data of the user to be added.
+        :param type_response: (optional) Specifies the type to convert the response to (default is User).
+        :return: The response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="POST",
+            url=f"{self.app.url}{self.POST_USER}",
+            endpoint="UserAPI.POST_USER",
+            cache=self.app.cache,
+            invalidate=f"{self.app.url}{self.GET_USER.format(data.username)}",
+            json=data.to_dict(),
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Getting user by username")
+    async def get_user_by_username(self, username: str, type_response=User) -> Response:
+        """
+        Retrieves a user with the given username.
+        :param username: The unique username of the user.
+        :param type_response: (optional) Specifies the type to convert the response to (default is User).
+        :return: The response containing the user's information.
+        """
+        response = await self.app.async_client.request(
+            method="GET",
+            url=f"{self.app.url}{self.GET_USER.format(username)}",
+            endpoint="UserAPI.GET_USER",
+            cache=self.app.cache,
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Updating user")
+    async def update_user(self, data: User, type_response=User) -> Response:
+        """
+        Updates the information of a specific user.
+        :param data: A User object containing the updated user information.
+        :param type_response: (optional) Specifies the type to convert the response to.
+        :return: The response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="PUT",
+            url=f"{self.app.url}{self.PUT_USER.format(data.username)}",
+            endpoint="UserAPI.PUT_USER",
+            cache=self.app.cache,
+            json=data.to_dict(),
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Deleting user")
+    async def delete_user(self, username: str) -> Response:
+        """
+        Deletes a specific user by their username.
+        :param username: The username of the user to be deleted.
+        :return: The response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="DELETE",
+            url=f"{self.app.url}{self.DELETE_USER.format(username)}",
+            endpoint="UserAPI.DELETE_USER",
+            cache=self.app.cache,
+        )
+        return response
+
+    @log("User login")
+    async def login(self, username: str, password: str) -> Response:
+        """
+        Logs the user in with the given username and password.
+        :param username: The user's username.
+        :param password: The user's password.
+        :return: The API response (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="GET",
+            url=f"{self.app.url}{self.LOGIN_USER}",
+            endpoint="UserAPI.LOGIN_USER",
+            params={
+                "username": username,
+                "password": password,
+            },
+        )
+        return response
+
+    @log("User logout")
+    async def logout(self) -> Response:
+        """
+        Logs out the current user.
+        :return: The API response (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="GET",
+            url=f"{self.app.url}{self.LOGOUT_USER}",
+            endpoint="UserAPI.LOGOUT_USER",
         )
         return response
+
+    @log("Adding users with array")
+    async def create_with_array(
+        self, users: List[User], type_response=ApiResponse
+    ) -> Response:
+        """
+        Adds several users in one request.
+        :param users: User objects to add.
+        :param type_response: (optional) Specifies the type to convert the response to (default is ApiResponse).
+        :return: The response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="POST",
+            url=f"{self.app.url}{self.CREATE_WITH_ARRAY}",
+            endpoint="UserAPI.CREATE_WITH_ARRAY",
+            json=[user.to_dict() for user in users],
+        )
+        return self.structure(response, type_response=type_response)
+
+    @log("Adding users with list")
+    async def create_with_list(
+        self, users: List[User], type_response=ApiResponse
+    ) -> Response:
+        """
+        Adds several users in one request.
+        :param users: User objects to add.
+        :param type_response: (optional) Specifies the type to convert the response to (default is ApiResponse).
+        :return: The response returned by the API (Response object).
+        """
+        response = await self.app.async_client.request(
+            method="POST",
+            url=f"{self.app.url}{self.CREATE_WITH_LIST}",
+            endpoint="UserAPI.CREATE_WITH_LIST",
+            json=[user.to_dict() for user in users],
+        )
+        return self.structure(response, type_response=type_response)
+
+    async def add_users(
+        self, users: Iterable[User], chunk_size: int = 100, concurrency: int = 100
+    ) -> List[BatchResult]:
+        """
+        Adds many users through createWithList, chunk_size users per request.
+        :param users: User objects to add.
+        :param chunk_size: Number of users sent per request.
+        :param concurrency: Maximum number of concurrent requests.
+        :return: One BatchResult per user, carrying the response of its chunk, in input order.
+        """
+        results = await run_batch_async(
+            self.create_with_list, chunked(users, chunk_size), concurrency
+        )
+        return [
+            BatchResult(item=user, response=result.response, error=result.error)
+            for result in results
+            for user in result.item
+        ]
+
+    async def delete_users(
+        self, usernames: Iterable[str], concurrency: int = 100
+    ) -> List[BatchResult]:
+        """
+        Deletes several users with at most concurrency requests in flight.
+        :param usernames: Usernames of the users to delete.
+        :param concurrency: Maximum number of concurrent requests.
+        :return: One BatchResult per username, in input order.
+        """
+        return await run_batch_async(self.delete_user, usernames, concurrency)
@@ -1,24 +1,22 @@
 import attr
-from faker import Faker
 from fixtures.base import BaseClass
+from fixtures.fake import fake
 
-fake = Faker()
 
-
-@attr.s
+@attr.s(slots=True)
 class User(BaseClass):
     """
     Represents a user in the system.
     """
 
-    id: int = attr.ib(default=fake.random_int(min=1, max=1000))
-    username: str = attr.ib(default=fake.user_name())
-    firstName: str = attr.ib(default=fake.first_name())
-    lastName: str = attr.ib(default=fake.last_name())
-    email: str = attr.ib(default=fake.email())
-    password: str = attr.ib(default=fake.password())
-    phone: str = attr.ib(default=fake.phone_number())
-    userStatus: int = attr.ib(default=fake.random_int(min=0, max=1))
+    id: int = attr.ib(factory=lambda: fake.random_int(min=1, max=1000))
+    username: str = attr.ib(factory=lambda: fake.user_name())
+    firstName: str = attr.ib(factory=lambda: fake.first_name())
+    lastName: str = attr.ib(factory=lambda: fake.last_name())
+    email: str = attr.ib(factory=lambda: fake.email())
+    password: str = attr.ib(factory=lambda: fake.password())
+    phone: str = attr.ib(factory=lambda: fake.phone_number())
+    userStatus: int = attr.ib(factory=lambda: fake.random_int(min=0, max=1))
 
     def to_dict(self):
         return {
@@ -34,4 +32,6 @@ class User(BaseClass):
 
     @staticmethod
     def random():
-        return User()
+        from fixtures.factory import default_factory
+
+        return default_factory().user()
@@ -0,0 +1,133 @@
+import pytest
+
+from fixtures.benchmark import BaselineGate
+
+GATE_KEY = pytest.StashKey[BaselineGate]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        help="run the tests marked as benchmark (skipped otherwise)",
+        default=False,
+    )
+    parser.addoption(
+        "--benchmark-iterations",
+        action="store",
+        type=int,
+        help="calls per benchmarked operation",
+        default=50,
+    )
+    parser.addoption(
+        "--benchmark-concurrency",
+        action="store",
+        type=int,
+        help="calls in flight while the throughput of an operation is measured",
+        default=8,
+    )
+    parser.addoption(
+        "--benchmark-baseline",
+        action="store",
+        help="baseline file with latency percentiles and throughput per target and operation",
+        default="tests/test_benchmark/baseline.json",
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        action="store",
+        type=float,
+        help="allowed relative regression versus the baseline (0.25 = 25%%)",
+        default=0.25,
+    )
+    parser.addoption(
+        "--import-budget",
+        action="store",
+        type=float,
+        help="seconds a fresh interpreter may spend importing fixtures.app and the API helpers",
+        default=0.4,
+    )
+    parser.addoption(
+        "--benchmark-save",
+        action="store_true",
+        help="store the results of this run as the new baseline",
+        default=False,
+    )
+
+
+def baseline_target(config) -> str:
+    """
+    Baseline section of this run: the API URL, prefixed for runs against the in-process
+    server or a cassette, whose latencies must not gate (or replace) real backend numbers
+    """
+    url = config.getoption("--api-url")
+    if config.getoption("--local-server"):
+        return f"local:{url}"
+    if config.getoption("--replay"):
+        return f"replay:{url}"
+    return url
+
+
+def pytest_configure(config):
+    config.stash[GATE_KEY] = BaselineGate(
+        baseline=BaselineGate.load(
+            config.getoption("--benchmark-baseline"), baseline_target(config)
+        ),
+        threshold=config.getoption("--benchmark-threshold"),
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def baseline_gate(request) -> BaselineGate:
+    """
+    Baseline comparison shared by the benchmark tests of this process
+    """
+    return request.config.stash[GATE_KEY]
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    gate = config.stash[GATE_KEY]
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["benchmark_results"] = gate.results
+    elif config.getoption("--benchmark-save") and gate.results:
+        BaselineGate.save(
+            config.getoption("--benchmark-baseline"),
+            baseline_target(config),
+            gate.results,
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    results = getattr(node, "workeroutput", {}).get("benchmark_results")
+    if results:
+        node.config.stash[GATE_KEY].results.update(results)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if hasattr(config, "workerinput"):
+        return
+    gate = config.stash[GATE_KEY]
+    if not gate.results:
+        return
+    terminalreporter.write_sep("=", "benchmark results")
+    terminalreporter.write_line(
+        f"{'operation':<24}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'vs p95':>9}"
+    )
+    for operation, result in sorted(gate.results.items()):
+        baseline = gate.baseline.get(operation, {}).get("p95")
+        change = f"{result['p95'] / baseline - 1:+.0%}" if baseline else "new"
+        terminalreporter.write_line(
+            f"{operation:<24}{result['count']:>7}{result['p50'] * 1000:>9.1f}"
+            f"{result['p95'] * 1000:>9.1f}{result['p99'] * 1000:>9.1f}"
+            f"{result['throughput']:>10.1f}{change:>9}"
+        )
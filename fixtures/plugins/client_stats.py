@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from fixtures.metrics import ClientStats
+
+STATS_KEY = pytest.StashKey[ClientStats]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--client-stats-json",
+        action="store",
+        help="write per-endpoint client latency statistics to this JSON file",
+        default=None,
+    )
+
+
+def pytest_configure(config):
+    config.stash[STATS_KEY] = ClientStats()
+
+
+@pytest.fixture(scope="session")
+def client_stats(request) -> ClientStats:
+    """
+    Per-endpoint metrics shared by every client of this process
+    """
+    return request.config.stash[STATS_KEY]
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    # xdist worker: ship the stats to the controller
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["client_stats"] = config.stash[STATS_KEY].to_dict()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    stats = getattr(node, "workeroutput", {}).get("client_stats")
+    if stats:
+        node.config.stash[STATS_KEY].merge(stats)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if hasattr(config, "workerinput"):
+        return
+    summary = config.stash[STATS_KEY].summary()
+    if not summary:
+        return
+
+    terminalreporter.write_sep("=", "client latency by endpoint")
+    terminalreporter.write_line(
+        f"{'endpoint':<26}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'sent KB':>9}{'recv KB':>9}  statuses"
+    )
+    for endpoint, stats in summary.items():
+        statuses = " ".join(
+            f"{status}:{count}" for status, count in sorted(stats["statuses"].items())
+        )
+        terminalreporter.write_line(
+            f"{endpoint:<26}{stats['count']:>7}"
+            f"{stats['p50'] * 1000:>9.1f}{stats['p95'] * 1000:>9.1f}{stats['p99'] * 1000:>9.1f}"
+            f"{stats['bytes_sent'] / 1024:>9.1f}{stats['bytes_received'] / 1024:>9.1f}  {statuses}"
+        )
+
+    path = config.getoption("--client-stats-json")
+    if path:
+        with open(path, "w") as file:
+            json.dump(summary, file, indent=4)
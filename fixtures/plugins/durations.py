@@ -0,0 +1,71 @@
+import pytest
+
+from fixtures.durations import DurationHistory, DurationScheduling
+
+CACHE_KEY = "petstore/durations"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--durations-path",
+        action="store",
+        help="JSON file with per-test durations of previous runs (default: the pytest cache)",
+        default=None,
+    )
+    parser.addoption(
+        "--no-duration-schedule",
+        action="store_true",
+        help="keep the default xdist distribution even when duration history exists",
+        default=False,
+    )
+
+
+def pytest_configure(config):
+    # Durations are measured and the tests scheduled by the xdist controller only
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(DurationScheduler(config), "duration-scheduler")
+
+
+class DurationScheduler:
+    def __init__(self, config):
+        """
+        Records how long every test takes and, with -n, hands the tests to the xdist workers
+        longest first based on the durations of previous runs.
+        """
+        self.config = config
+        self.path = config.getoption("--durations-path")
+        self.history = DurationHistory(self.load())
+        self.measured = {}
+
+    def load(self) -> dict:
+        if self.path:
+            return DurationHistory.load(self.path)
+        if getattr(self.config, "cache", None) is not None:
+            return self.config.cache.get(CACHE_KEY, {})
+        return {}
+
+    def pytest_runtest_logreport(self, report):
+        # On the xdist controller this also receives the reports of every worker
+        self.measured[report.nodeid] = (
+            self.measured.get(report.nodeid, 0.0) + report.duration
+        )
+
+    def pytest_sessionfinish(self, session):
+        if not self.measured:
+            return
+        self.history.update(self.measured)
+        if self.path:
+            self.history.save(self.path)
+        elif getattr(self.config, "cache", None) is not None:
+            self.config.cache.set(CACHE_KEY, self.history.durations)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if (
+            config.getoption("--no-duration-schedule")
+            or config.getvalue("dist") != "load"
+            or not self.history.durations
+        ):
+            # No history yet: let xdist pick its default scheduler
+            return None
+        return DurationScheduling(config, log, history=self.history)
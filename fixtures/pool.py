@@ -0,0 +1,180 @@
+import copy
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+from requests import Response
+
+from fixtures.batch import BatchResult, run_batch
+from fixtures.waiter import Waiter
+
+
+class EntityPool:
+    def __init__(
+        self,
+        name: str,
+        create: Callable[[int], list],
+        add: Callable[[list], List[BatchResult]],
+        delete: Callable[[list], List[BatchResult]],
+        read: Callable[..., Response],
+        key: Callable[[object], object],
+        waiter: Waiter,
+    ):
+        """
+        Pre-created entities leased exclusively to tests.
+        Read-only leases hand the entity back for the next test. A mutating lease retires the
+        entity (it is deleted at close) and adds a replacement, which is only waited for when
+        it is leased, so tests never pay for the create/wait cycle themselves.
+        :param name: Entity name used in wait descriptions, e.g. "pet".
+        :param create: Returns count new model objects, e.g. ModelFactory.pets.
+        :param add: Batch helper that adds model objects, e.g. PetAPI.add_pets.
+        :param delete: Batch helper that deletes entities by key, e.g. PetAPI.delete_pets.
+        :param read: Helper that reads one entity by key, e.g. PetAPI.get_by_id_pet.
+        :param key: Returns the key of a model object (pet.id, user.username, ...).
+        :param waiter: Waiter used to poll until new entities are readable.
+        """
+        self.name = name
+        self.create = create
+        self.add = add
+        self.delete = delete
+        self.read = read
+        self.key = key
+        self.waiter = waiter
+        self.lock = threading.Lock()
+        self.entities = {}
+        self.idle = deque()
+        self.unverified = set()
+        self.retired = []
+        self.leases = 0
+        self.created = 0
+
+    def fill(self, count: int):
+        """
+        Adds count new entities concurrently and waits, concurrently too, until all of them
+        are readable
+        """
+        self._verify(self._add(count))
+
+    def _add(self, count: int) -> list:
+        items = self.create(count)
+        failed = [result for result in self.add(items) if not result.ok]
+        if failed:
+            raise AssertionError(
+                f"could not create {len(failed)} of {count} pooled {self.name}s: "
+                f"{failed[0].error or failed[0].response.status_code}"
+            )
+        keys = [self.key(item) for item in items]
+        with self.lock:
+            for key, item in zip(keys, items):
+                self.entities[key] = item
+                self.unverified.add(key)
+                self.idle.append(key)
+            self.created += count
+        return keys
+
+    def _readable(self, key) -> Response:
+        return self.waiter.until(
+            lambda: self.read(key),
+            lambda res: res.status_code == 200,
+            description=f"pooled {self.name} {key} is readable",
+        )
+
+    def _verify(self, keys: list):
+        """
+        Waits concurrently until the entities of keys are readable. Entities that are not
+        readable by the waiter deadline are retired (deleted at close) instead of leased.
+        :raises AssertionError: Some entity did not become readable.
+        """
+        with self.lock:
+            pending = [key for key in keys if key in self.unverified]
+        unreadable = []
+        for result in run_batch(self._readable, pending):
+            if result.error is None and result.response.status_code == 200:
+                with self.lock:
+                    self.unverified.discard(result.item)
+            else:
+                unreadable.append(result)
+        if not unreadable:
+            return
+        with self.lock:
+            for result in unreadable:
+                key = result.item
+                self.unverified.discard(key)
+                if self.entities.pop(key, None) is not None:
+                    self.retired.append(key)
+                if key in self.idle:
+                    self.idle.remove(key)
+        first = unreadable[0]
+        raise AssertionError(
+            f"{len(unreadable)} pooled {self.name}s not readable, e.g. {first.item}: "
+            f"{first.error or first.response.status_code}"
+        )
+
+    @contextmanager
+    def lease(self, mutates: bool = False) -> Iterator:
+        """
+        Leases an entity for the duration of the with block. An idle entity that does not
+        become readable is retired and the next one is taken; the lease only fails when an
+        entity created for it is not readable either.
+        :param mutates: The test updates or deletes the entity, it is replaced afterwards.
+        :return: A copy of the model object, safe to modify.
+        """
+        key = self._take()
+        with self.lock:
+            self.leases += 1
+        try:
+            yield copy.deepcopy(self.entities[key])
+        finally:
+            with self.lock:
+                if mutates:
+                    del self.entities[key]
+                    self.retired.append(key)
+                else:
+                    self.idle.append(key)
+        if mutates:
+            # Only after the block succeeded, so a failing replacement cannot hide the
+            # test's own exception
+            self._add(1)
+
+    def _take(self):
+        """
+        Removes a readable entity from the idle queue, growing the pool when it is empty
+        :raises AssertionError: The entity created for the lease did not become readable.
+        """
+        while True:
+            with self.lock:
+                key = self.idle.popleft() if self.idle else None
+            grown = key is None
+            if grown:
+                # Pool exhausted: grow it by one
+                key = self._add(1)[0]
+                with self.lock:
+                    self.idle.remove(key)
+            try:
+                self._verify([key])
+            except AssertionError:
+                if grown:
+                    raise
+                continue  # Retired by _verify, try the next one
+            return key
+
+    def close(self):
+        """
+        Deletes every entity the pool created, concurrently
+        """
+        with self.lock:
+            keys = list(self.entities) + self.retired
+            self.entities.clear()
+            self.idle.clear()
+            self.retired = []
+        if keys:
+            self.delete(keys)
+
+    def stats(self) -> dict:
+        return {
+            "created": self.created,
+            "leases": self.leases,
+            "idle": len(self.idle),
+            "retired": len(self.retired),
+        }
@@ -0,0 +1,130 @@
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: no shared bucket files
+    fcntl = None
+
+# Bucket state in the shared file: tokens left and the time they were counted at
+_STATE = struct.Struct("dd")
+
+
+def default_state_file(url: str) -> str:
+    """
+    Bucket file shared by every process on this host that sends requests to the host of url
+    """
+    host = urlsplit(url).netloc.replace(":", "_") or "default"
+    return os.path.join(tempfile.gettempdir(), f"petstore-rate-{host}.bucket")
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        burst: float = None,
+        path: str = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Token bucket holding the request rate of a client to rate per second, with bursts of
+        up to burst requests after idle periods.
+        With a path the bucket lives in that file, locked with flock for every request, so all
+        processes using the same file (xdist workers, load workers) share one budget; the
+        clock has to be comparable across them. Without a path it is shared by the threads
+        of this process only.
+        A request takes a token even when none is left and waits until its token has been
+        refilled, so waiting requests are served in order and the lock is only held to
+        update the counter.
+        :param rate: Requests per second.
+        :param burst: Maximum tokens accumulated while idle, by default one second worth.
+        :param path: (optional) Bucket file shared with other processes (POSIX only).
+        :param clock: Wall clock, replaceable in tests.
+        :param sleep: Pause function, replaceable in tests.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if path is not None and fcntl is None:
+            raise ValueError("a shared bucket file needs fcntl, which is POSIX only")
+        self.rate = rate
+        self.burst = max(burst or rate, 1.0)
+        self.path = path
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.fd = None
+        self.state = (self.burst, None)
+        self.requests = 0
+        self.waits = 0
+        self.waited = 0.0
+
+    def _load(self):
+        if self.fd is None:
+            return self.state
+        data = os.pread(self.fd, _STATE.size, 0)
+        if len(data) < _STATE.size:
+            return self.burst, None  # First process to use the file
+        return _STATE.unpack(data)
+
+    def _store(self, tokens: float, now: float):
+        if self.fd is None:
+            self.state = (tokens, now)
+        else:
+            os.pwrite(self.fd, _STATE.pack(tokens, now), 0)
+
+    def reserve(self) -> float:
+        """
+        Takes a token
+        :return: Seconds to wait before the request may be sent.
+        """
+        with self.lock:
+            if self.path is not None and self.fd is None:
+                self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            if self.fd is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                now = self.clock()
+                tokens, counted = self._load()
+                if counted is not None:
+                    # A clock behind the stored time adds nothing instead of taking tokens
+                    tokens += max(now - counted, 0.0) * self.rate
+                tokens = min(tokens, self.burst) - 1
+                self._store(tokens, now)
+            finally:
+                if self.fd is not None:
+                    fcntl.flock(self.fd, fcntl.LOCK_UN)
+            delay = -tokens / self.rate if tokens < 0 else 0.0
+            self.requests += 1
+            if delay:
+                self.waits += 1
+                self.waited += delay
+            return delay
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent
+        """
+        delay = self.reserve()
+        if delay:
+            self.sleep(delay)
+
+    def close(self):
+        with self.lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "requests": self.requests,
+            "waits": self.waits,
+            "waited": round(self.waited, 3),
+        }
@@ -1,17 +1,517 @@
+import asyncio
+import logging
+import socket
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import httpx
 import requests
-from requests import Response
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from common import codec
+from fixtures.cache import ResponseCache
+from fixtures.metrics import ClientStats
+from fixtures.ratelimit import RateLimiter
+from fixtures.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from fixtures.resolver import Resolver, ResolvingAdapter
+
+logger = logging.getLogger("api")
+
+# Seconds AsyncClient.close waits for a pool to close on a loop running in another thread
+CLOSE_TIMEOUT = 5.0
+
+
+def _default_endpoint(method: str, url: str) -> str:
+    """
+    Endpoint name for requests sent without a template: method and URL path
+    """
+    return f"{method} {urlsplit(url).path}"
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _record(stats: ClientStats, endpoint: str, duration: float, response: Response):
+    """
+    Records a finished request. Streamed bodies are counted by their Content-Length.
+    """
+    body = response.request.body if response.request is not None else None
+    if response._content is False:
+        received = int(response.headers.get("Content-Length") or 0)
+    else:
+        received = len(response.content or b"")
+    stats.record(
+        endpoint,
+        duration,
+        response.status_code,
+        bytes_sent=len(body or b""),
+        bytes_received=received,
+    )
 
 
 class Client:
-    @staticmethod
-    def request(method: str, url: str, **kwargs) -> Response:
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        stats: ClientStats = None,
+        retry: RetryPolicy = None,
+        breaker: CircuitBreaker = None,
+        resolver: Resolver = None,
+        limiter: RateLimiter = None,
+    ):
+        """
+        HTTP client backed by a persistent requests.Session with a keep-alive connection pool.
+        :param pool_connections: Number of per-host connection pools to keep.
+        :param pool_maxsize: Maximum number of connections kept open per host.
+        :param pool_block: Block when the per-host pool is exhausted instead of opening extra connections.
+        :param keep_alive: Reuse connections between requests (sends "Connection: close" when disabled).
+        :param connect_timeout: Seconds to wait for a connection to be established.
+        :param read_timeout: Seconds to wait for the server to send a response.
+        :param stats: (optional) Collector of per-endpoint request metrics.
+        :param retry: (optional) Policy for retrying transport errors and transient statuses.
+        :param breaker: (optional) Circuit breaker that fails fast while the host is down.
+        :param resolver: (optional) Host name cache used when opening connections.
+        :param limiter: (optional) Rate limiter every attempt takes a token from.
+        """
+        self.stats = stats or ClientStats()
+        self.retry = retry
+        self.breaker = breaker
+        self.resolver = resolver
+        self.limiter = limiter
+        self.timeout = (connect_timeout, read_timeout)
+        pool = dict(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.adapter = (
+            ResolvingAdapter(resolver, **pool) if resolver else HTTPAdapter(**pool)
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str = None,
+        cache: ResponseCache = None,
+        invalidate: str = None,
+        **kwargs,
+    ) -> Response:
         """
         Request method
         method: method for the new Request object: GET, OPTIONS, HEAD, POST, PUT, PATCH, or DELETE.
         url – URL for the new Request object.
+        endpoint – (optional) Endpoint template the metrics are recorded under, e.g. "PetAPI.GET_PET". # noqa
+        cache – (optional) ResponseCache: GET requests read through it, other methods invalidate it. # noqa
+        invalidate – (optional) Cache key a write invalidates when it differs from url.
         **kwargs:
             params – (optional) Dictionary, list of tuples or bytes to send in the query string for the Request. # noqa
             json – (optional) A JSON serializable Python object to send in the body of the Request. # noqa
             headers – (optional) Dictionary of HTTP Headers to send with the Request.
+            timeout – (optional) Overrides the client (connect, read) timeout for this request.
+        """
+        if cache is None:
+            return self._send(method, url, endpoint, **kwargs)
+        if method != "GET":
+            try:
+                return self._send(method, url, endpoint, **kwargs)
+            finally:
+                cache.invalidate(invalidate or url)
+
+        key = cache.key(url, kwargs.get("params"))
+        generation = cache.generation(key)
+        entry, fresh = cache.lookup(key)
+        if fresh:
+            return cache.copy(entry.response)
+        if entry is not None:
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                "If-None-Match": entry.etag,
+            }
+        response = self._send(method, url, endpoint, **kwargs)
+        if entry is not None and response.status_code == 304:
+            return cache.copy(cache.revalidated(key, entry, generation))
+        if response.status_code == 200:
+            cache.store(key, response, generation)
+            return cache.copy(response)
+        cache.invalidate(key)
+        return response
+
+    def _send(self, method: str, url: str, endpoint: str = None, **kwargs) -> Response:
+        kwargs.setdefault("timeout", self.timeout)
+        endpoint = endpoint or _default_endpoint(method, url)
+        payload = codec.encode_json_argument(kwargs)
+        if self.retry is not None and self.retry.budget is not None:
+            self.retry.budget.deposit()
+        attempt = 0
+        while True:
+            response, error = self._attempt(method, url, endpoint, **kwargs)
+            delay = self.retry and self.retry.delay(method, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                if payload is not None:
+                    codec.remember(response.request, payload)
+                return response
+            if response is not None and response.raw is not None:
+                # A streamed body is never read: hand its connection back to the pool
+                response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def _attempt(self, method: str, url: str, endpoint: str, **kwargs):
+        """
+        Sends one attempt through the circuit breaker and records it
+        :return: (response, None) or (None, exception)
+        """
+        start = time.perf_counter()
+        try:
+            if self.breaker is not None:
+                self.breaker.before(url)
+            if self.limiter is not None:
+                self.limiter.acquire()
+                start = time.perf_counter()  # Waiting for a token is not latency
+            response = self.session.request(method, url, **kwargs)
+        except CircuitOpenError as e:
+            self.stats.record(endpoint, 0.0, type(e).__name__)
+            return None, e
+        except Exception as e:
+            self.stats.record(endpoint, time.perf_counter() - start, type(e).__name__)
+            if self.breaker is not None:
+                self.breaker.record(url, not self.breaker.failed(error=e))
+            return None, e
+        _record(self.stats, endpoint, time.perf_counter() - start, response)
+        if self.breaker is not None:
+            self.breaker.record(url, not self.breaker.failed(response=response))
+        return response, None
+
+    def warm_up(self, url: str, connections: int = 1) -> dict:
+        """
+        Resolves the host of url and opens pooled connections to it (TCP and TLS handshakes
+        included) before the first request, so no test pays for a cold start.
+        The time spent is recorded under the "warm-up: resolve" and "warm-up: connect" endpoints.
+        Does nothing when url is routed through another adapter (local server, cassette).
+        :param url: URL of the target, e.g. the API base URL.
+        :param connections: Connections to open, at most the pool size.
+        :return: Host, address, seconds spent and connections opened; empty when skipped.
+        """
+        if self.session.get_adapter(url) is not self.adapter:
+            return {}
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        result = {"host": parts.hostname, "address": None, "connections": 0}
+
+        start = time.perf_counter()
+        try:
+            if self.resolver is not None:
+                result["address"] = self.resolver.resolve(parts.hostname, port)
+            else:
+                result["address"] = socket.getaddrinfo(
+                    parts.hostname, port, type=socket.SOCK_STREAM
+                )[0][4][0]
+        except OSError as e:
+            # The first test reports the failure with its own request
+            logger.warning("warm-up: could not resolve %s: %s", parts.hostname, e)
+            self.stats.record("warm-up: resolve", 0.0, type(e).__name__)
+            return result
+        result["resolve"] = time.perf_counter() - start
+        self.stats.record("warm-up: resolve", result["resolve"], "ok")
+
+        # Same TLS and proxy settings as a request, so the connections land in its pool
+        prepared = self.session.prepare_request(requests.Request("GET", url))
+        settings = self.session.merge_environment_settings(url, {}, None, None, None)
+        pool = self.adapter.get_connection_with_tls_context(
+            prepared,
+            verify=settings["verify"],
+            proxies=settings["proxies"],
+            cert=settings["cert"],
+        )
+        opened = [pool._get_conn() for _ in range(min(connections, pool.pool.maxsize))]
+
+        def connect(conn):
+            began = time.perf_counter()
+            try:
+                conn.timeout = self.timeout[0]
+                conn.connect()
+            except Exception as e:
+                logger.warning("warm-up: could not connect to %s: %s", url, e)
+                self.stats.record("warm-up: connect", 0.0, type(e).__name__)
+                conn.close()
+                return False
+            self.stats.record("warm-up: connect", time.perf_counter() - began, "ok")
+            return True
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(len(opened), 1)) as executor:
+            result["connections"] = sum(executor.map(connect, opened))
+        result["connect"] = time.perf_counter() - start
+        for conn in opened:
+            pool._put_conn(conn)
+        return result
+
+    def mount(self, prefix: str, adapter: BaseAdapter):
+        """
+        Routes every request whose URL starts with prefix through adapter.
+        :param prefix: URL prefix, e.g. the API base URL.
+        :param adapter: requests transport adapter.
+        """
+        self.session.mount(prefix, adapter)
+
+    def close(self):
+        """
+        Closes the session and every pooled connection.
+        """
+        self.session.close()
+
+
+class AsyncClient:
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keep_alive: bool = True,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        stats: ClientStats = None,
+        retry: RetryPolicy = None,
+        breaker: CircuitBreaker = None,
+        limiter: RateLimiter = None,
+    ):
+        """
+        Asyncio HTTP client backed by an httpx.AsyncClient connection pool.
+        Responses are converted to requests.Response, so the API helpers, Validator and
+        the logging decorator handle them exactly like responses from Client.
+        :param max_connections: Maximum number of concurrent connections (requests in flight).
+        :param max_keepalive_connections: Maximum number of idle keep-alive connections.
+        :param keep_alive: Reuse connections between requests.
+        :param connect_timeout: Seconds to wait for a connection to be established.
+        :param read_timeout: Seconds to wait for the server to send a response.
+        :param stats: (optional) Collector of per-endpoint request metrics.
+        :param retry: (optional) Policy for retrying transport errors and transient statuses.
+        :param breaker: (optional) Circuit breaker that fails fast while the host is down.
+        :param limiter: (optional) Rate limiter every attempt takes a token from; the wait
+            for a token does not block the event loop.
+        """
+        self.stats = stats or ClientStats()
+        self.retry = retry
+        self.breaker = breaker
+        self.limiter = limiter
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections if keep_alive else 0,
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.mounts = {}
+        # httpx pools are bound to the event loop they were first used in:
+        # loop -> (pool, async generator that closes the pool when it is finalized)
+        self._clients = weakref.WeakKeyDictionary()
+
+    async def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            client = httpx.AsyncClient(
+                limits=self.limits, timeout=self.timeout, mounts=self.mounts
+            )
+            lifetime = self._lifetime(loop, client)
+            # Starting the generator registers it with the loop, whose shutdown_asyncgens()
+            # (run by asyncio.run before the loop closes) then closes the pool
+            await lifetime.asend(None)
+            entry = self._clients[loop] = (client, lifetime)
+        return entry[0]
+
+    async def _lifetime(self, loop, client: httpx.AsyncClient):
+        try:
+            yield
+        finally:
+            if self._clients.get(loop, (None,))[0] is client:
+                del self._clients[loop]
+            await client.aclose()
+
+    def mount(self, prefix: str, transport: httpx.AsyncBaseTransport):
+        """
+        Routes every request to the scheme and host of prefix through transport.
+        Applies to pools created after the call.
+        :param prefix: URL whose scheme and host are routed, e.g. the API base URL.
+        :param transport: httpx async transport.
+        """
+        parts = urlsplit(prefix)
+        self.mounts[f"{parts.scheme}://{parts.netloc}"] = transport
+
+    def transport(self, url: str) -> httpx.AsyncBaseTransport:
+        """
+        Returns the transport requests to url are sent through
+        """
+        parts = urlsplit(url)
+        transport = self.mounts.get(f"{parts.scheme}://{parts.netloc}")
+        return transport or httpx.AsyncHTTPTransport(limits=self.limits)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str = None,
+        cache: ResponseCache = None,
+        invalidate: str = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Request method
+        Accepts the same arguments as Client.request (endpoint, cache, invalidate, params, json, headers, timeout). # noqa
+        """
+        if cache is None:
+            return await self._send(method, url, endpoint, **kwargs)
+        if method != "GET":
+            try:
+                return await self._send(method, url, endpoint, **kwargs)
+            finally:
+                cache.invalidate(invalidate or url)
+
+        key = cache.key(url, kwargs.get("params"))
+        generation = cache.generation(key)
+        entry, fresh = cache.lookup(key)
+        if fresh:
+            return cache.copy(entry.response)
+        if entry is not None:
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                "If-None-Match": entry.etag,
+            }
+        response = await self._send(method, url, endpoint, **kwargs)
+        if entry is not None and response.status_code == 304:
+            return cache.copy(cache.revalidated(key, entry, generation))
+        if response.status_code == 200:
+            cache.store(key, response, generation)
+            return cache.copy(response)
+        cache.invalidate(key)
+        return response
+
+    async def _send(
+        self, method: str, url: str, endpoint: str = None, **kwargs
+    ) -> Response:
+        timeout = kwargs.pop("timeout", None)
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        kwargs["timeout"] = timeout or self.timeout
+        endpoint = endpoint or _default_endpoint(method, url)
+        payload = codec.encode_json_argument(kwargs, body_argument="content")
+        if self.retry is not None and self.retry.budget is not None:
+            self.retry.budget.deposit()
+        attempt = 0
+        while True:
+            response, error = await self._attempt(method, url, endpoint, **kwargs)
+            delay = self.retry and self.retry.delay(method, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                if payload is not None:
+                    codec.remember(response.request, payload)
+                return response
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _attempt(self, method: str, url: str, endpoint: str, **kwargs):
+        """
+        Sends one attempt through the circuit breaker and records it
+        :return: (response, None) or (None, exception)
+        """
+        start = time.perf_counter()
+        try:
+            if self.breaker is not None:
+                self.breaker.before(url)
+            if self.limiter is not None:
+                delay = self.limiter.reserve()
+                if delay:
+                    await asyncio.sleep(delay)
+                start = time.perf_counter()  # Waiting for a token is not latency
+            res = await (await self._client()).request(method, url, **kwargs)
+        except CircuitOpenError as e:
+            self.stats.record(endpoint, 0.0, type(e).__name__)
+            return None, e
+        except Exception as e:
+            self.stats.record(endpoint, time.perf_counter() - start, type(e).__name__)
+            if self.breaker is not None:
+                self.breaker.record(url, not self.breaker.failed(error=e))
+            return None, e
+        response = self._to_response(res)
+        _record(self.stats, endpoint, time.perf_counter() - start, response)
+        if self.breaker is not None:
+            self.breaker.record(url, not self.breaker.failed(response=response))
+        return response, None
+
+    @staticmethod
+    def _to_response(res: httpx.Response) -> Response:
+        """
+        Converts an httpx response into a requests.Response
+        """
+        prepared = PreparedRequest()
+        prepared.method = res.request.method
+        prepared.url = str(res.request.url)
+        prepared.headers = CaseInsensitiveDict(res.request.headers)
+        prepared.body = res.request.content or None
+
+        response = Response()
+        response.status_code = res.status_code
+        response.reason = res.reason_phrase
+        response.headers = CaseInsensitiveDict(res.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = str(res.url)
+        response.elapsed = res.elapsed
+        response.request = prepared
+        response._content = res.content
+        return response
+
+    async def aclose(self):
+        """
+        Closes the connection pools of every event loop: the pool of the running loop is
+        awaited, those of loops running in other threads are closed on their loop.
+        """
+        current = asyncio.get_running_loop()
+        for loop, (_, lifetime) in list(self._clients.items()):
+            if loop is current:
+                await lifetime.aclose()
+            elif loop.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(lifetime.aclose(), loop)
+                )
+        self.close()
+
+    def close(self):
+        """
+        Closes the connection pools of the event loops that are still alive. Pools of loops
+        finished by asyncio.run were closed when their loop shut down.
         """
-        return requests.request(method, url, **kwargs)
+        current = _running_loop()
+        for loop, (_, lifetime) in list(self._clients.items()):
+            if loop.is_closed():
+                continue
+            if loop is current:
+                # Called from a coroutine: the pool closes once it yields to the loop
+                loop.create_task(lifetime.aclose())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(lifetime.aclose(), loop).result(
+                    CLOSE_TIMEOUT
+                )
+            elif current is None:
+                loop.run_until_complete(lifetime.aclose())
+        # Generators left over are finalized on their loop when it runs again
+        self._clients.clear()
@@ -0,0 +1,211 @@
+import random
+import threading
+import time
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests import Response
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    httpx.TransportError,
+)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request while the circuit of its host is open
+    """
+
+
+class RetryBudget:
+    def __init__(self, ratio: float = 0.2, initial: float = 10.0, cap: float = 100.0):
+        """
+        Global cap on retries shared by every client that uses it.
+        Each request deposits ratio tokens and each retry withdraws one, so a failing backend
+        gets at most ratio retries per request once the initial reserve is spent.
+        :param ratio: Tokens deposited per request.
+        :param initial: Tokens available before any request was sent.
+        :param cap: Maximum number of tokens kept.
+        """
+        self.ratio = ratio
+        self.cap = cap
+        self.tokens = initial
+        self.retries = 0
+        self.exhausted = 0
+        self.lock = threading.Lock()
+
+    def deposit(self):
+        with self.lock:
+            self.tokens = min(self.cap, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Takes one token for a retry
+        :return: False when the budget is spent and the retry must not be sent.
+        """
+        with self.lock:
+            if self.tokens < 1:
+                self.exhausted += 1
+                return False
+            self.tokens -= 1
+            self.retries += 1
+            return True
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        total: int = 2,
+        statuses: Iterable[int] = RETRY_STATUSES,
+        methods: Iterable[str] = IDEMPOTENT_METHODS,
+        backoff_factor: float = 0.2,
+        max_backoff: float = 5.0,
+        jitter: float = 0.5,
+        budget: RetryBudget = None,
+        rng: random.Random = None,
+        non_retryable: Iterable[type] = (),
+    ):
+        """
+        Decides whether and when a failed attempt is sent again.
+        Retries transport errors (connection failures, timeouts) and the given statuses of
+        idempotent methods, waiting backoff_factor * 2 ** attempt seconds or the Retry-After header.
+        :param total: Maximum number of retries per request.
+        :param statuses: Response statuses that are retried.
+        :param methods: HTTP methods that are retried.
+        :param backoff_factor: Pause before the first retry in seconds.
+        :param max_backoff: Upper bound of a single pause in seconds.
+        :param jitter: Fraction of every pause that is randomised.
+        :param budget: (optional) RetryBudget shared with other clients.
+        :param non_retryable: Exception types that are never retried, even when they are
+            transport errors; CircuitOpenError never is.
+        """
+        self.total = total
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.rng = rng or random.Random()
+        self.non_retryable = (CircuitOpenError, *non_retryable)
+
+    def delay(
+        self,
+        method: str,
+        attempt: int,
+        response: Response = None,
+        error: Exception = None,
+    ) -> Optional[float]:
+        """
+        Returns the pause before the next attempt
+        :param method: HTTP method of the request.
+        :param attempt: Number of retries already sent.
+        :param response: Response of the failed attempt.
+        :param error: Exception raised by the failed attempt.
+        :return: Seconds to wait, or None when the outcome is final.
+        """
+        if attempt >= self.total or method not in self.methods:
+            return None
+        if error is not None:
+            if not isinstance(error, TRANSIENT_ERRORS) or isinstance(
+                error, self.non_retryable
+            ):
+                return None
+        elif response is None or response.status_code not in self.statuses:
+            return None
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        pause = min(self.backoff_factor * 2**attempt, self.max_backoff)
+        return pause * (1 - self.jitter * self.rng.random())
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Per-host circuit breaker. After failure_threshold consecutive failures (transport errors
+        or 5xx) requests to the host fail fast with CircuitOpenError for reset_timeout seconds;
+        then a single probe is let through and its outcome closes or reopens the circuit.
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :param reset_timeout: Seconds the circuit stays open before a probe.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.circuits = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def state(self, url: str) -> str:
+        with self.lock:
+            return self.circuits.get(self.key(url), {}).get("state", self.CLOSED)
+
+    def before(self, url: str):
+        """
+        Raises CircuitOpenError unless a request to the host of url may be sent
+        """
+        key = self.key(url)
+        with self.lock:
+            circuit = self.circuits.get(key)
+            if circuit is None or circuit["state"] == self.CLOSED:
+                return
+            remaining = circuit["opened_at"] + self.reset_timeout - self.clock()
+            if circuit["state"] == self.OPEN and remaining <= 0:
+                circuit["state"] = self.HALF_OPEN
+                return
+            raise CircuitOpenError(
+                f"circuit for {key} is {circuit['state']}, "
+                f"next probe in {max(remaining, 0):.1f}s"
+            )
+
+    def record(self, url: str, ok: bool):
+        """
+        Records the outcome of a request to the host of url
+        """
+        key = self.key(url)
+        with self.lock:
+            circuit = self.circuits.setdefault(
+                key, {"state": self.CLOSED, "failures": 0, "opened_at": 0.0}
+            )
+            if ok:
+                circuit.update(state=self.CLOSED, failures=0)
+                return
+            circuit["failures"] += 1
+            if (
+                circuit["state"] == self.HALF_OPEN
+                or circuit["failures"] >= self.failure_threshold
+            ):
+                circuit.update(state=self.OPEN, opened_at=self.clock())
+
+    @staticmethod
+    def failed(response: Response = None, error: Exception = None) -> bool:
+        """
+        Whether an attempt counts against the circuit: transport errors and 5xx do,
+        anything else the client raised (e.g. a cassette miss) does not
+        """
+        if error is not None:
+            return isinstance(error, TRANSIENT_ERRORS)
+        return response.status_code >= 500
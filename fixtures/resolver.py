@@ -0,0 +1,106 @@
+import logging
+import socket
+import threading
+import time
+from typing import Callable
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger("api")
+
+
+class Resolver:
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Host name cache in front of getaddrinfo, shared by every connection of a client.
+        A failed lookup keeps serving the last known address until the next successful one.
+        :param ttl: Seconds an address is reused before it is resolved again.
+        :param clock: Monotonic clock, replaceable in tests.
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.addresses = {}
+        self.lookups = 0
+        self.hits = 0
+
+    def resolve(self, host: str, port: int) -> str:
+        """
+        Returns the first address getaddrinfo gives for host, from the cache when fresh
+        :raises socket.gaierror: The host cannot be resolved and was never resolved before.
+        """
+        key = (host, port)
+        with self.lock:
+            cached = self.addresses.get(key)
+            if cached is not None and self.clock() < cached[1]:
+                self.hits += 1
+                return cached[0]
+        try:
+            info = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            if cached is None:
+                raise
+            logger.warning("could not resolve %s again, using %s", host, cached[0])
+            return cached[0]
+        address = info[0][4][0]
+        with self.lock:
+            self.lookups += 1
+            self.addresses[key] = (address, self.clock() + self.ttl)
+        return address
+
+    def stats(self) -> dict:
+        return {"lookups": self.lookups, "hits": self.hits}
+
+
+class _ResolvingConnection:
+    resolver: Resolver = None
+
+    def _new_conn(self):
+        # _dns_host also backs the host property used for SNI and certificate checks,
+        # so the address replaces it only while the socket is opened
+        name = self._dns_host
+        try:
+            self._dns_host = self.resolver.resolve(name, self.port)
+        except socket.gaierror:
+            pass  # urllib3 reports the failed lookup itself
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = name
+
+
+def resolving_pool_classes(resolver: Resolver) -> dict:
+    """
+    Connection pool classes by scheme whose connections resolve hosts through resolver
+    """
+    classes = {}
+    for scheme, pool, connection in (
+        ("http", HTTPConnectionPool, HTTPConnection),
+        ("https", HTTPSConnectionPool, HTTPSConnection),
+    ):
+        connection_cls = type(
+            f"Resolving{connection.__name__}",
+            (_ResolvingConnection, connection),
+            {"resolver": resolver},
+        )
+        classes[scheme] = type(
+            f"Resolving{pool.__name__}", (pool,), {"ConnectionCls": connection_cls}
+        )
+    return classes
+
+
+class ResolvingAdapter(HTTPAdapter):
+    def __init__(self, resolver: Resolver, **kwargs):
+        """
+        HTTPAdapter whose connections take their addresses from a Resolver
+        :param resolver: The resolver.
+        :param kwargs: HTTPAdapter arguments (pool_connections, pool_maxsize, ...).
+        """
+        self.resolver = resolver
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = resolving_pool_classes(self.resolver)
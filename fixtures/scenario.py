@@ -0,0 +1,174 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List
+
+import allure
+import attr
+
+from common.attachments import attach
+
+logger = logging.getLogger("api")
+
+
+@attr.s
+class StepRecord:
+    """
+    One step of a scenario: what it depends on, when it ran and how it ended.
+    """
+
+    name: str = attr.ib()
+    func: Callable = attr.ib(repr=False)
+    after: tuple = attr.ib(default=())
+    result = attr.ib(default=None, repr=False)
+    error: Exception = attr.ib(default=None)
+    started: float = attr.ib(default=None)
+    finished: float = attr.ib(default=None)
+
+    @property
+    def status(self) -> str:
+        if self.started is None:
+            return "skipped"
+        return "failed" if self.error is not None else "passed"
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started if self.finished is not None else 0.0
+
+
+class Scenario:
+    def __init__(self, name: str, concurrency: int = 8):
+        """
+        Runs API calls as a dependency graph: a step starts as soon as the steps it depends on
+        have finished, so independent branches run concurrently and the scenario takes the
+        time of its critical path. Each step receives the results of its dependencies as
+        keyword arguments named after them.
+        When a step fails no further steps are started and, once the running ones finish,
+        its exception is raised; the steps that never ran are reported as skipped.
+        :param name: Name of the Allure step wrapping the run.
+        :param concurrency: Maximum number of steps in flight.
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self.steps: Dict[str, StepRecord] = {}
+        self.started = None
+        self.finished = None
+
+    def step(self, name: str, func: Callable, after: Iterable[str] = ()) -> "Scenario":
+        """
+        Declares a step. Dependencies have to be declared first, which rules out cycles.
+        :param name: Step name, also the keyword its result is passed to dependents under.
+        :param func: Callable taking the results of the after steps as keyword arguments.
+        :param after: Names of the steps that have to finish first.
+        :return: The scenario, for chaining.
+        """
+        if name in self.steps:
+            raise ValueError(f"step {name!r} is already declared")
+        after = tuple(after)
+        unknown = [dependency for dependency in after if dependency not in self.steps]
+        if unknown:
+            raise ValueError(f"step {name!r} depends on undeclared steps {unknown}")
+        self.steps[name] = StepRecord(name=name, func=func, after=after)
+        return self
+
+    def _call(self, record: StepRecord):
+        kwargs = {
+            dependency: self.steps[dependency].result for dependency in record.after
+        }
+        with allure.step(record.name):
+            record.started = time.perf_counter()
+            try:
+                record.result = record.func(**kwargs)
+            except Exception as e:
+                record.error = e
+            finally:
+                record.finished = time.perf_counter()
+        logger.info(
+            "scenario %s: %s %s in %.3fs",
+            self.name,
+            record.name,
+            record.status,
+            record.duration,
+        )
+
+    def run(self) -> Dict[str, object]:
+        """
+        Runs every step and attaches the per-step timings to the Allure report
+        :return: Result of every step by name.
+        """
+        waiting = {name: set(record.after) for name, record in self.steps.items()}
+        dependents = {name: [] for name in self.steps}
+        for name, record in self.steps.items():
+            for dependency in record.after:
+                dependents[dependency].append(name)
+
+        failed = None
+        with allure.step(self.name):
+            self.started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                running = {}
+
+                def submit_ready():
+                    for name in [n for n, deps in waiting.items() if not deps]:
+                        del waiting[name]
+                        record = self.steps[name]
+                        running[executor.submit(self._call, record)] = record
+
+                submit_ready()
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record = running.pop(future)
+                        if record.error is not None:
+                            failed = failed or record
+                            continue
+                        for dependent in dependents[record.name]:
+                            if dependent in waiting:
+                                waiting[dependent].discard(record.name)
+                    if failed is None:
+                        submit_ready()
+            self.finished = time.perf_counter()
+            attach(self.report(), "Scenario timings", allure.attachment_type.TEXT)
+
+        if failed is not None:
+            raise failed.error
+        return {name: record.result for name, record in self.steps.items()}
+
+    def critical_path(self) -> List[str]:
+        """
+        Chain of steps that determined the run time: the last step to finish, the dependency
+        it waited for longest, and so on
+        """
+        finished = [r for r in self.steps.values() if r.finished is not None]
+        if not finished:
+            return []
+        record = max(finished, key=lambda r: r.finished)
+        path = [record.name]
+        while record.after:
+            record = max(
+                (self.steps[name] for name in record.after),
+                key=lambda r: r.finished or 0.0,
+            )
+            path.append(record.name)
+        return path[::-1]
+
+    def report(self) -> str:
+        """
+        Per-step start offset, duration and status as a text table
+        """
+        start = self.started or 0.0
+        lines = [f"{'step':<24}{'after':<32}{'start ms':>10}{'ms':>10}  status"]
+        for record in self.steps.values():
+            offset = (record.started - start) * 1000 if record.started else 0.0
+            lines.append(
+                f"{record.name:<24}{','.join(record.after) or '-':<32}"
+                f"{offset:>10.1f}{record.duration * 1000:>10.1f}  {record.status}"
+            )
+        if self.finished is not None:
+            total = sum(record.duration for record in self.steps.values())
+            lines.append(
+                f"critical path: {' -> '.join(self.critical_path())}, "
+                f"wall {(self.finished - start) * 1000:.1f} ms, "
+                f"sum of steps {total * 1000:.1f} ms"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,262 @@
+import gc
+import os
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+import attr
+
+from fixtures.app import Application
+from fixtures.load import LoadConfig, LoadResult, build_application, run_worker
+
+# Read and update operations only: every add_* grows the backend, which with
+# --local-server lives in the measured process and would look like a leak
+SOAK_MIX = (
+    "get_by_id_pet=30,get_order_by_id=20,get_user_by_username=20,"
+    "update_pet=10,login=10,logout=10"
+)
+# Growth of a resource below which a rising series is treated as noise
+TOLERANCES = {
+    "traced_kb": 1024,
+    "fds": 2,
+    "sockets": 2,
+    "pools": 1,
+    "pooled_connections": 2,
+}
+_FD_DIR = "/proc/self/fd"
+
+
+def open_descriptors() -> Tuple[Optional[int], Optional[int]]:
+    """
+    Counts the open file descriptors of this process and how many of them are sockets
+    :return: (descriptors, sockets), (None, None) where /proc is not available.
+    """
+    try:
+        fds = os.listdir(_FD_DIR)
+    except OSError:
+        return None, None
+    sockets = 0
+    for fd in fds:
+        try:
+            sockets += os.readlink(os.path.join(_FD_DIR, fd)).startswith("socket:")
+        except OSError:
+            pass  # Closed since listdir, e.g. the directory handle itself
+    return len(fds), sockets
+
+
+def pool_sizes(apps: List[Application]) -> Tuple[int, int]:
+    """
+    Counts the urllib3 connection pools of the clients and the idle connections they hold
+    :return: (pools, pooled connections)
+    """
+    pools = connections = 0
+    for app in apps:
+        manager = app.client.adapter.poolmanager
+        for key in manager.pools.keys():
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            pools += 1
+            connections += sum(conn is not None for conn in list(pool.pool.queue))
+    return pools, connections
+
+
+class SoakMonitor:
+    def __init__(
+        self,
+        apps: List[Application],
+        warmup: int = 2,
+        segments: int = 4,
+        tolerances: Dict[str, float] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Periodic snapshots of the resources held by the load process: traced Python memory
+        (allocated since requests started), file descriptors, sockets and connection pools.
+        A resource leaks when it keeps growing: the snapshots after warm-up are split into
+        segments and the minimum of every segment is higher than that of the one before,
+        by more than the tolerance overall. Minima ignore short spikes such as a burst of
+        in-flight requests.
+        :param apps: Applications whose pools are measured.
+        :param warmup: Snapshots, once requests are sent, taken while caches, pools and
+            lazily imported modules settle; they are not judged.
+        :param segments: Number of segments the judged snapshots are split into.
+        :param tolerances: Growth per resource treated as noise (see TOLERANCES).
+        :param clock: Clock, replaceable in tests.
+        """
+        self.apps = apps
+        self.warmup = warmup
+        self.segments = segments
+        self.tolerances = {**TOLERANCES, **(tolerances or {})}
+        self.clock = clock
+        self.snapshots: List[dict] = []
+        self.baseline = None
+        self.latest = None
+        self.started = None
+        self.tracing = False
+
+    def start(self):
+        self.started = self.clock()
+
+    def _trace(self):
+        # Tracing slows allocations down several times; seeding runs before it starts
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+
+    def stop(self):
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def snapshot(self) -> dict:
+        """
+        Records the current resource usage
+        """
+        gc.collect()  # Only memory that is still referenced counts
+        requests = sum(
+            stats.histogram.count
+            for app in self.apps
+            for stats in list(app.client.stats.endpoints.values())
+        )
+        traced = None
+        if requests:
+            self._trace()
+            traced = tracemalloc.get_traced_memory()[0] // 1024
+        fds, sockets = open_descriptors()
+        pools, connections = pool_sizes(self.apps)
+        snapshot = {
+            "elapsed": self.clock() - self.started,
+            "requests": requests,
+            "traced_kb": traced,
+            "fds": fds,
+            "sockets": sockets,
+            "pools": pools,
+            "pooled_connections": connections,
+        }
+        self.snapshots.append(snapshot)
+        if requests:
+            self.latest = tracemalloc.take_snapshot()
+            if self.baseline is None and len(self.active()) == self.warmup + 1:
+                self.baseline = self.latest
+        return snapshot
+
+    def active(self) -> List[dict]:
+        """
+        Snapshots taken once requests were being sent, i.e. after seeding
+        """
+        return [snapshot for snapshot in self.snapshots if snapshot["requests"]]
+
+    def leaks(self) -> List[str]:
+        """
+        Describes every resource that grew monotonically after warm-up
+        """
+        judged = self.active()[self.warmup :]
+        if len(judged) < self.segments * 2:
+            return []
+        size = len(judged) // self.segments
+        parts = [judged[i * size : (i + 1) * size] for i in range(self.segments)]
+        leaks = []
+        for resource, tolerance in self.tolerances.items():
+            if judged[0].get(resource) is None:
+                continue
+            minima = [min(s[resource] for s in part) for part in parts]
+            rising = all(a < b for a, b in zip(minima, minima[1:]))
+            if rising and minima[-1] - minima[0] > tolerance:
+                leaks.append(
+                    f"{resource} grew from {minima[0]} to {minima[-1]} "
+                    f"over {judged[-1]['requests'] - judged[0]['requests']} requests"
+                )
+        return leaks
+
+    def top_growth(self, limit: int = 5) -> List[str]:
+        """
+        Source lines whose traced memory grew the most since the end of warm-up
+        """
+        if self.baseline is None or self.latest is None:
+            return []
+        return [
+            str(stat)
+            for stat in self.latest.compare_to(self.baseline, "lineno")[:limit]
+            if stat.size_diff > 0
+        ]
+
+    def report(self) -> str:
+        columns = ["elapsed", "requests", *TOLERANCES]
+        widths = [max(14, len(column) + 1) for column in columns]
+        lines = ["".join(f"{c:>{w}}" for c, w in zip(columns, widths))]
+        for snapshot in self.snapshots:
+            lines.append(
+                "".join(
+                    f"{'-' if snapshot[c] is None else round(snapshot[c], 1):>{w}}"
+                    for c, w in zip(columns, widths)
+                )
+            )
+        leaks = self.leaks()
+        if leaks:
+            lines.append("Monotonic growth:")
+            lines.extend(f"  {leak}" for leak in leaks)
+            lines.append("Largest allocation growth since warm-up:")
+            lines.extend(f"  {line}" for line in self.top_growth())
+        else:
+            lines.append("No monotonic growth after warm-up")
+        return "\n".join(lines)
+
+
+@attr.s
+class SoakResult:
+    """
+    Load result of a soak run and the resource snapshots taken during it.
+    """
+
+    load: LoadResult = attr.ib()
+    monitor: SoakMonitor = attr.ib()
+
+    @property
+    def leaks(self) -> List[str]:
+        return self.monitor.leaks()
+
+    def report(self) -> str:
+        return f"{self.load.report()}\n\n{self.monitor.report()}"
+
+
+def run_soak(
+    config: LoadConfig, workers: int = 1, interval: float = 60.0, warmup: int = 2
+) -> SoakResult:
+    """
+    Runs the workload on threads of this process, snapshotting its resources every interval
+    :param config: Load configuration, usually with a duration of hours.
+    :param workers: Number of worker threads.
+    :param interval: Seconds between snapshots.
+    :param warmup: Snapshots not judged for leaks.
+    """
+    if config.duration is None and config.requests is None:
+        raise ValueError("Either duration or requests must be set")
+    quotas = [None] * workers
+    if config.requests is not None:
+        quotas = [
+            config.requests // workers + (1 if i < config.requests % workers else 0)
+            for i in range(workers)
+        ]
+    apps = [build_application(config) for _ in range(workers)]
+    monitor = SoakMonitor(apps, warmup=warmup)
+    result = LoadResult()
+    monitor.start()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(run_worker, config, worker, quotas[worker], apps[worker])
+                for worker in range(workers)
+            ]
+            monitor.snapshot()
+            while wait(futures, timeout=interval).not_done:
+                monitor.snapshot()
+            monitor.snapshot()
+            for future in futures:
+                result.merge(future.result())
+    finally:
+        for app in apps:
+            app.close()
+        monitor.stop()
+    return SoakResult(load=result, monitor=monitor)
@@ -0,0 +1,64 @@
+import codecs
+import json
+from typing import Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """
+    Yields the elements of a top-level JSON array while its bytes arrive.
+    Only the current unparsed tail of the body is kept in memory.
+    :param chunks: UTF-8 encoded body in pieces of any size, e.g. response.iter_content().
+    :return: Generator of the decoded elements.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = finished = False
+    for chunk in _with_end(chunks):
+        final = chunk is None
+        buffer += text.decode(b"" if final else chunk, final=final)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer) or finished:
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"expected a JSON array, got {buffer[pos]!r}")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                finished = True
+                pos += 1
+                continue
+            if buffer[pos] == ",":
+                pos += 1
+                continue
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # The element is not complete yet
+            if buffer[pos] not in '{["' and not final:
+                # A number may continue past what has arrived ("1" of "1.5" or "1e5"):
+                # wait for the separator that ends it
+                after = end
+                while after < len(buffer) and buffer[after] in _WHITESPACE:
+                    after += 1
+                if after == len(buffer) or buffer[after] not in ",]":
+                    break
+            yield value
+            pos = end
+        buffer = buffer[pos:]
+    if not finished or buffer.strip():
+        raise ValueError("incomplete or trailing data after the JSON array")
+
+
+def _with_end(chunks: Iterable[bytes]) -> Iterator:
+    yield from chunks
+    yield None
@@ -1,21 +1,62 @@
-import cattr
+from typing import Iterator
+
 from requests import Response
 
+from common.codec import decode
+from fixtures.stream import iter_json_array
+
 # logger = logging.getLogger("ncps")
 
 
 class Validator:
-    @staticmethod
-    def structure(response: Response, type_response) -> Response:
+    app = None  # Application, set by the API helper classes
+
+    def structure(self, response: Response, type_response) -> Response:
         """
         Try to structure response
+        Validates the body against the application's OpenAPI contract first, when one is loaded.
         :param response: response
         :param type_response: type response
         :return: modify response with "data" field
         """
+        body = None
+        contract = getattr(self.app, "contract", None)
+        if contract is not None:
+            body = contract.check(response, self.app.url)
         if type_response:
+            # cattrs is imported with the first structured response, not at startup
+            from fixtures.converter import structure
+
             try:
-                response.data = cattr.structure(response.json(), type_response)
+                if body is None:
+                    body = decode(response)
+                response.data = structure(body, type_response)
             except Exception as e:
                 raise e
         return response
+
+    def structure_stream(
+        self, response: Response, type_response, chunk_size: int
+    ) -> Iterator:
+        """
+        Try to structure a streamed JSON array element by element
+        The status and content type are validated against the contract before the body is
+        read, and every element as it arrives.
+        :param response: response opened with stream=True
+        :param type_response: type of every element, None for dicts
+        :param chunk_size: bytes read from the connection at a time
+        :return: Generator of the elements. Raises requests.HTTPError for a non-2xx answer.
+        """
+        check = None
+        contract = getattr(self.app, "contract", None)
+        if contract is not None:
+            check = contract.check_stream(response, self.app.url)
+        response.raise_for_status()
+        if type_response:
+            from fixtures.converter import structure
+        for index, item in enumerate(
+            iter_json_array(response.iter_content(chunk_size))
+        ):
+            if check is not None:
+                check(item, index)
+            yield structure(item, type_response) if type_response else item
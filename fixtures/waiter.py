@@ -0,0 +1,100 @@
+import logging
+import random
+import time
+from typing import Callable, List
+
+import attr
+
+logger = logging.getLogger("api")
+
+
+@attr.s
+class WaitRecord:
+    """
+    Outcome of a single wait: how long it took and how many polls it needed.
+    """
+
+    description: str = attr.ib()
+    elapsed: float = attr.ib()
+    attempts: int = attr.ib()
+    satisfied: bool = attr.ib()
+
+
+class Waiter:
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        initial_delay: float = 0.2,
+        max_delay: float = 5.0,
+        factor: float = 2.0,
+        jitter: float = 0.5,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Polls an API helper until the backend becomes consistent.
+        :param timeout: Default overall deadline of a wait in seconds.
+        :param initial_delay: Pause before the second poll in seconds.
+        :param max_delay: Upper bound of a single pause in seconds.
+        :param factor: Multiplier applied to the pause after every unsuccessful poll.
+        :param jitter: Fraction (0..1) of every pause that is randomised to de-synchronise workers.
+        """
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.sleep = sleep
+        self.clock = clock
+        self.records: List[WaitRecord] = []
+
+    def until(
+        self,
+        func: Callable,
+        predicate: Callable,
+        description: str = "condition",
+        timeout: float = None,
+    ):
+        """
+        Calls func until predicate(result) is true or the deadline is reached.
+        :param func: Callable without arguments, usually a lambda around an API helper.
+        :param predicate: Callable that receives the result of func and returns True when done.
+        :param description: Human readable description used in logs, Allure and the wait record.
+        :param timeout: (optional) Overall deadline in seconds (Waiter.timeout by default).
+        :return: The last result of func, whether the predicate was satisfied or not.
+        """
+        import allure  # Not needed to import the Waiter, e.g. in the load driver
+
+        timeout = self.timeout if timeout is None else timeout
+        with allure.step(f"Wait until {description}"):
+            start = self.clock()
+            deadline = start + timeout
+            delay = self.initial_delay
+            attempts = 0
+            while True:
+                attempts += 1
+                result = func()
+                satisfied = bool(predicate(result))
+                remaining = deadline - self.clock()
+                if satisfied or remaining <= 0:
+                    break
+                pause = min(delay, self.max_delay)
+                pause *= 1 - self.jitter * random.random()
+                self.sleep(min(pause, remaining))
+                delay *= self.factor
+
+            record = WaitRecord(
+                description=description,
+                elapsed=self.clock() - start,
+                attempts=attempts,
+                satisfied=satisfied,
+            )
+            self.records.append(record)
+            logger.info(
+                "Waited %.3fs (%d attempts) until %s: %s",
+                record.elapsed,
+                record.attempts,
+                description,
+                "satisfied" if satisfied else "timed out",
+            )
+        return result
@@ -0,0 +1,161 @@
+"""
+Load driver for Petstore-compatible backends.
+
+Reuses Application and the PetAPI/StoreAPI/UserAPI helpers to run a weighted workload
+mix on N threads or processes and reports throughput and per-operation latency.
+
+    python main.py --mix get_by_id_pet=60,add_order=20,login=20 --workers 8 --duration 60
+    python main.py --local-server --requests 10000 --workers 4 --mode process
+    python main.py --soak --duration 14400 --soak-interval 300
+"""
+
+import argparse
+import json
+import sys
+
+from fixtures.contract import DEFAULT_SPEC
+from fixtures.load import OPERATIONS, LoadConfig, parse_mix, run_load
+from fixtures.soak import SOAK_MIX, run_soak
+
+DEFAULT_MIX = "get_by_id_pet=60,add_order=20,login=20"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Petstore load driver")
+    parser.add_argument("--api-url", default="https://petstore.swagger.io/v2")
+    parser.add_argument(
+        "--mix",
+        help=f"weighted operations, any of: {', '.join(OPERATIONS)} "
+        f"(default: {DEFAULT_MIX}, with --soak: {SOAK_MIX})",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+    parser.add_argument("--duration", type=float, help="seconds to run")
+    parser.add_argument("--requests", type=int, help="total number of requests")
+    parser.add_argument(
+        "--seed-entities",
+        type=int,
+        default=10,
+        help="pets, orders and users each worker creates before the run",
+    )
+    parser.add_argument("--pool-maxsize", type=int, default=10)
+    parser.add_argument("--connect-timeout", type=float, default=5.0)
+    parser.add_argument("--read-timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        help="GET responses each worker caches (0 disables the read cache)",
+    )
+    parser.add_argument("--cache-ttl", type=float, default=5.0)
+    parser.add_argument(
+        "--contract",
+        nargs="?",
+        const=DEFAULT_SPEC,
+        help="validate responses against this OpenAPI document (default: the bundled one)",
+    )
+    parser.add_argument(
+        "--json-codec",
+        choices=["stdlib", "orjson", "auto"],
+        default="stdlib",
+        help="JSON codec for request bodies and response decoding",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="requests per second across all workers on this host (0 disables)",
+    )
+    parser.add_argument(
+        "--rate-burst",
+        type=float,
+        help="requests sent at once after an idle period (default: one second worth)",
+    )
+    parser.add_argument("--seed", type=int, help="random seed for reproducible mixes")
+    parser.add_argument("--local-server", action="store_true")
+    parser.add_argument("--server-latency", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--soak",
+        action="store_true",
+        help="run on threads of this process and report monotonic growth of its memory, "
+        "descriptors, sockets and connection pools",
+    )
+    parser.add_argument(
+        "--soak-interval", type=float, default=60.0, help="seconds between snapshots"
+    )
+    parser.add_argument(
+        "--soak-warmup",
+        type=int,
+        default=2,
+        help="snapshots taken while the process settles, not judged for leaks",
+    )
+    parser.add_argument("--json", help="write the merged result to this file")
+    args = parser.parse_args(argv)
+    if args.duration is None and args.requests is None:
+        parser.error("one of --duration or --requests is required")
+    if args.soak and args.mode == "process":
+        parser.error("--soak measures this process and runs on threads only")
+    if args.mix is None:
+        args.mix = SOAK_MIX if args.soak else DEFAULT_MIX
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = LoadConfig(
+        url=args.api_url,
+        mix=parse_mix(args.mix),
+        duration=args.duration,
+        requests=args.requests,
+        seed_entities=args.seed_entities,
+        pool_maxsize=args.pool_maxsize,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        seed=args.seed,
+        cache_size=args.cache_size,
+        cache_ttl=args.cache_ttl,
+        contract=args.contract,
+        json_codec=args.json_codec,
+        rate_limit=args.rate_limit,
+        rate_burst=args.rate_burst,
+        local_server=(
+            {"latency": args.server_latency, "error_rate": args.server_error_rate}
+            if args.local_server
+            else None
+        ),
+    )
+    if args.soak:
+        soak = run_soak(
+            config,
+            workers=args.workers,
+            interval=args.soak_interval,
+            warmup=args.soak_warmup,
+        )
+        result = soak.load
+        print(soak.report())
+    else:
+        soak = None
+        result = run_load(config, workers=args.workers, mode=args.mode)
+        print(result.report())
+    if args.json:
+        data = {
+            "elapsed": result.elapsed,
+            "throughput": result.throughput,
+            "errors": result.errors,
+            "operations": {
+                name: histogram.summary()
+                for name, histogram in result.histograms.items()
+            },
+        }
+        if soak is not None:
+            data["snapshots"] = soak.monitor.snapshots
+            data["leaks"] = soak.leaks
+        with open(args.json, "w") as file:
+            json.dump(data, file, indent=4)
+    return soak or result
+
+
+if __name__ == "__main__":
+    # A soak run that found a leak fails, so it can gate a scheduled job
+    sys.exit(1 if getattr(main(), "leaks", None) else 0)
@@ -0,0 +1,137 @@
+import random
+import time
+
+import allure
+import pytest
+
+from fixtures.batch import run_batch
+from fixtures.factory import ModelFactory
+from fixtures.load import OPERATIONS, WorkerContext, seed_entities
+from fixtures.metrics import Histogram
+
+
+def _readable(app, read, description):
+    app.waiter.until(read, lambda res: res.status_code == 200, description=description)
+
+
+def _new_pet(app, ctx):
+    pet = ctx.factory.pet()
+    app.pet_api.add_pet(pet, type_response=None)
+    _readable(app, lambda: app.pet_api.get_by_id_pet(pet.id), f"pet {pet.id} exists")
+    return pet.id
+
+
+def _new_order(app, ctx):
+    order = ctx.factory.order()
+    app.store_api.add_order(order, type_response=None)
+    _readable(
+        app,
+        lambda: app.store_api.get_order_by_id(order.id),
+        f"order {order.id} exists",
+    )
+    return order.id
+
+
+def _new_user(app, ctx):
+    user = ctx.factory.user()
+    app.user_api.add_user(user, type_response=None)
+    _readable(
+        app,
+        lambda: app.user_api.get_user_by_username(user.username),
+        f"user {user.username} exists",
+    )
+    return user.username
+
+
+def _plain(operation):
+    return None, lambda app, ctx, _: operation(app, ctx)
+
+
+# Operations of the load driver, plus the ones that do not fit a load mix:
+# operation -> (setup(app, ctx) run outside the timed call or None, call(app, ctx, prepared))
+BENCHMARKS = {
+    **{name: _plain(op) for name, op in OPERATIONS.items()},
+    "create_with_array": (
+        None,
+        lambda app, ctx, _: app.user_api.create_with_array(ctx.factory.users(3)),
+    ),
+    "create_with_list": (
+        None,
+        lambda app, ctx, _: app.user_api.create_with_list(ctx.factory.users(3)),
+    ),
+    "delete_pet": (_new_pet, lambda app, ctx, pet_id: app.pet_api.delete_pet(pet_id)),
+    "delete_order": (
+        _new_order,
+        lambda app, ctx, order_id: app.store_api.delete_order(order_id),
+    ),
+    "delete_user": (
+        _new_user,
+        lambda app, ctx, username: app.user_api.delete_user(username),
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def benchmark_context(app):
+    ctx = WorkerContext(rng=random.Random(), factory=ModelFactory())
+    seed_entities(app, ctx, count=5)
+    return ctx
+
+
+@allure.epic("Pet Store API")
+@allure.feature("Performance")
+class TestOperationBenchmarks:
+
+    @pytest.mark.benchmark
+    @allure.story("Latency Baseline")
+    @pytest.mark.parametrize("operation", list(BENCHMARKS))
+    def test_operation_does_not_regress(
+        self, request, app, benchmark_context, baseline_gate, operation
+    ):
+        """
+        Benchmark of a single API operation.
+        Steps:
+            1. Call the operation --benchmark-iterations times, one call at a time, for the
+               latency percentiles; entities a delete removes are created before each call,
+               outside the timed section.
+            2. Call it as many times again with --benchmark-concurrency calls in flight; the
+               throughput is the number of calls over the wall time of this run.
+            3. Assert that every call succeeded.
+            4. Compare latency percentiles and throughput with the stored baseline.
+        """
+        iterations = request.config.getoption("--benchmark-iterations")
+        concurrency = request.config.getoption("--benchmark-concurrency")
+        histogram = Histogram()
+        failures = 0
+        setup, call = BENCHMARKS[operation]
+
+        def prepare():
+            return setup(app, benchmark_context) if setup else None
+
+        with allure.step(f"Call {operation} {iterations} times"):
+            for _ in range(iterations):
+                prepared = prepare()
+                began = time.perf_counter()
+                response = call(app, benchmark_context, prepared)
+                histogram.record(time.perf_counter() - began)
+                failures += response.status_code >= 400
+
+        with allure.step(f"Call {operation} {iterations} times, {concurrency} at once"):
+            prepared = [prepare() for _ in range(iterations)]
+            began = time.perf_counter()
+            results = run_batch(
+                lambda item: call(app, benchmark_context, item), prepared, concurrency
+            )
+            elapsed = time.perf_counter() - began
+            failures += sum(not result.ok for result in results)
+
+        with allure.step("Compare with the baseline"):
+            regressions = baseline_gate.check(operation, histogram, elapsed)
+            allure.attach(
+                str(baseline_gate.results[operation]),
+                "Benchmark Result",
+                allure.attachment_type.TEXT,
+            )
+
+        assert not failures, f"{failures} of {iterations} {operation} calls failed"
+        assert not regressions, "\n".join(regressions)
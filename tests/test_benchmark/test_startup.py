@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+
+import allure
+import pytest
+
+from common.attachments import attach
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STARTUP_MODULES = [
+    "fixtures.app",
+    "fixtures.petstore.pet.api",
+    "fixtures.petstore.store.api",
+    "fixtures.petstore.user.api",
+]
+# Imported on first use only: Faker by the model defaults, cattrs by the first structured response
+LAZY_MODULES = ["faker", "cattrs", "allure"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def probe_startup() -> dict:
+    """
+    Imports the startup modules in a fresh interpreter
+    :return: {"elapsed": seconds, "loaded": lazy modules that were imported anyway}
+    """
+    code = PROBE.format(modules=STARTUP_MODULES, lazy=LAZY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output)
+
+
+@allure.epic("Pet Store API")
+@allure.feature("Performance")
+class TestStartup:
+
+    @pytest.mark.positive
+    @allure.story("Startup")
+    @allure.title("Heavy dependencies are not imported at startup")
+    def test_heavy_dependencies_are_imported_lazily(self):
+        assert probe_startup()["loaded"] == []
+
+    @pytest.mark.benchmark
+    @allure.story("Startup")
+    @allure.title("Importing the fixtures stays within the startup budget")
+    def test_import_time_within_budget(self, request):
+        """
+        Steps:
+            1. Import fixtures.app and the API helpers in 5 fresh interpreters.
+            2. Assert that the fastest import is within --import-budget seconds.
+        """
+        budget = request.config.getoption("--import-budget")
+        with allure.step("Import the fixtures in fresh interpreters"):
+            # The fastest run is the least disturbed by other processes
+            elapsed = min(probe_startup()["elapsed"] for _ in range(5))
+            attach(f"{elapsed:.3f}s (budget {budget}s)", "Import time")
+
+        assert elapsed <= budget, f"import took {elapsed:.3f}s, budget {budget}s"
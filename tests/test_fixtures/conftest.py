@@ -0,0 +1,62 @@
+import pytest
+
+from fixtures.app import Application
+from fixtures.petstore.server import LocalAdapter, PetstoreServer
+from fixtures.requests import Client
+
+# Base URL the in-process server is mounted on, no request leaves the process
+URL = "http://petstore.local/v2"
+
+
+class FakeClock:
+    def __init__(self):
+        """
+        Clock that only moves when a test advances it (clock.now += seconds) or something
+        sleeps on it; pass the object as clock and its sleep method as sleep.
+        """
+        self.now = 0.0
+        self.pauses = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.pauses.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def url():
+    return URL
+
+
+@pytest.fixture
+def local_client():
+    """
+    Factory of clients whose requests to the base URL are served in-process, closed after
+    the test: local_client(adapter=None, **client_kwargs). Without an adapter every client
+    gets a fresh PetstoreServer.
+    """
+    clients = []
+
+    def make(adapter=None, **kwargs) -> Client:
+        client = Client(**kwargs)
+        client.mount(URL, adapter or LocalAdapter(PetstoreServer(seed=1), URL))
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def local_app(local_client):
+    app = Application(URL, client=local_client())
+    yield app
+    app.close()
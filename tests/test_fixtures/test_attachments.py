@@ -0,0 +1,124 @@
+import gzip
+import threading
+
+import allure
+import pytest
+
+from common.attachments import AttachmentWriter
+
+
+class FakeReporter:
+    def __init__(self):
+        self.entries = []
+
+    def _attach(self, uuid, name=None, attachment_type=None, extension=None):
+        file_name = f"{uuid}-attachment.{extension}"
+        self.entries.append((name, attachment_type, file_name))
+        return file_name
+
+
+@pytest.fixture
+def reporter():
+    return FakeReporter()
+
+
+@pytest.fixture
+def files():
+    return {}
+
+
+def make_writer(reporter, files, **kwargs) -> AttachmentWriter:
+    return AttachmentWriter(
+        reporter=lambda: reporter,
+        write=lambda body, file_name: files.__setitem__(file_name, body),
+        **kwargs,
+    )
+
+
+class TestAttachmentWriter:
+
+    @pytest.mark.positive
+    def test_attachment_is_written_in_the_background(self, reporter, files):
+        writer = make_writer(reporter, files)
+
+        writer.attach('{"id": 1}', "Response", allure.attachment_type.JSON)
+        writer.flush()
+
+        [(name, mime_type, file_name)] = reporter.entries
+        assert (name, mime_type) == ("Response", "application/json")
+        assert file_name.endswith(".json")
+        assert files == {file_name: b'{"id": 1}'}
+        assert writer.thread.name == "allure-attachments"
+
+    @pytest.mark.positive
+    def test_duplicate_content_reuses_the_written_file(self, reporter, files):
+        writer = make_writer(reporter, files)
+
+        for name in ("First", "Second", "Third"):
+            writer.attach("same body", name, allure.attachment_type.TEXT)
+        writer.attach("other body", "Other", allure.attachment_type.TEXT)
+        writer.flush()
+
+        sources = [file_name for _, _, file_name in reporter.entries]
+        assert len(set(sources[:3])) == 1
+        assert len(files) == 2
+        assert writer.stats()["deduplicated"] == 2
+
+    @pytest.mark.positive
+    def test_large_bodies_are_truncated(self, reporter, files):
+        writer = make_writer(reporter, files, max_size=11)
+
+        writer.attach("ж" * 20, "Body", allure.attachment_type.TEXT)
+        writer.flush()
+
+        [body] = files.values()
+        # The sixth character would be cut in half and is dropped
+        assert body.decode("utf-8") == "жжжжж\n... [truncated 30 bytes]"
+        assert writer.stats()["truncated"] == 1
+
+    @pytest.mark.positive
+    def test_large_bodies_are_compressed(self, reporter, files):
+        writer = make_writer(reporter, files, compress_over=100)
+
+        writer.attach("x" * 1000, "Body", allure.attachment_type.TEXT)
+        writer.attach("small", "Small", allure.attachment_type.TEXT)
+        writer.flush()
+
+        (name, mime_type, file_name), small = reporter.entries
+        assert (name, mime_type) == ("Body (gzip)", "application/gzip")
+        assert file_name.endswith(".txt.gz")
+        assert gzip.decompress(files[file_name]) == b"x" * 1000
+        assert files[small[2]] == b"small"
+
+    @pytest.mark.positive
+    def test_full_queue_blocks_until_the_writer_catches_up(self, reporter):
+        release = threading.Event()
+        written = []
+
+        def slow_write(body, file_name):
+            release.wait(5)
+            written.append(body)
+
+        writer = AttachmentWriter(
+            queue_size=1, reporter=lambda: reporter, write=slow_write
+        )
+        producer = threading.Thread(
+            target=lambda: [writer.attach(f"body {i}", "Body") for i in range(3)]
+        )
+        producer.start()
+        producer.join(0.2)
+
+        assert producer.is_alive()
+        release.set()
+        producer.join(5)
+        writer.flush()
+        assert written == [b"body 0", b"body 1", b"body 2"]
+
+    @pytest.mark.negative
+    def test_nothing_is_attached_without_allure(self, files):
+        writer = make_writer(None, files)
+
+        writer.attach("body", "Body", allure.attachment_type.TEXT)
+        writer.flush()
+
+        assert files == {} and writer.thread is None
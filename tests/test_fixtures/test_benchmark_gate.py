@@ -0,0 +1,45 @@
+import pytest
+
+from fixtures.benchmark import BaselineGate
+from fixtures.metrics import Histogram
+
+
+def histogram_of(*values):
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+class TestBaselineGate:
+
+    @pytest.mark.positive
+    def test_within_threshold_passes(self):
+        gate = BaselineGate(
+            {"login": {"p50": 0.010, "p95": 0.010, "throughput": 100}}, threshold=0.25
+        )
+
+        assert gate.check("login", histogram_of(0.011, 0.011), elapsed=0.022) == []
+
+    @pytest.mark.negative
+    def test_slower_operation_is_reported(self):
+        gate = BaselineGate(
+            {"login": {"p50": 0.010, "p95": 0.010, "throughput": 100}}, threshold=0.25
+        )
+
+        regressions = gate.check("login", histogram_of(0.020, 0.020), elapsed=0.04)
+
+        assert [r.split(" regressed")[0] for r in regressions] == [
+            "login p50",
+            "login p95",
+            "login throughput",
+        ]
+
+    @pytest.mark.positive
+    def test_baselines_are_stored_per_target(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        BaselineGate.save(path, "http://a/v2", {"login": {"p95": 1.0}})
+        BaselineGate.save(path, "http://b/v2", {"login": {"p95": 2.0}})
+
+        assert BaselineGate.load(path, "http://a/v2") == {"login": {"p95": 1.0}}
+        assert BaselineGate.load(path, "http://c/v2") == {}
@@ -0,0 +1,116 @@
+import pytest
+
+from fixtures.app import Application
+from fixtures.cache import ResponseCache
+from fixtures.petstore.pet.model import Pet
+from fixtures.petstore.server import LocalAdapter
+
+
+@pytest.fixture
+def cached_app(clock, local_client, url):
+    app = Application(
+        url, client=local_client(), cache=ResponseCache(ttl=5, clock=clock)
+    )
+    yield app
+    app.close()
+
+
+class TestResponseCache:
+
+    @pytest.mark.positive
+    def test_repeated_reads_are_served_from_the_cache(self, cached_app):
+        pet = Pet(id=11, name="rex")
+        cached_app.pet_api.add_pet(pet)
+
+        first = cached_app.pet_api.get_by_id_pet(pet.id)
+        second = cached_app.pet_api.get_by_id_pet(pet.id)
+
+        assert first.data == second.data == pet
+        assert cached_app.cache.stats()["hits"] == 1
+        assert cached_app.client.stats.endpoints["PetAPI.GET_PET"].histogram.count == 1
+
+    @pytest.mark.positive
+    def test_expired_entries_are_revalidated_with_the_etag(self, cached_app, clock):
+        pet = Pet(id=12, name="rex")
+        cached_app.pet_api.add_pet(pet)
+        cached_app.pet_api.get_by_id_pet(pet.id)
+
+        clock.now += 10
+        response = cached_app.pet_api.get_by_id_pet(pet.id)
+
+        assert response.status_code == 200
+        assert response.data == pet
+        assert cached_app.cache.stats()["revalidations"] == 1
+
+    @pytest.mark.positive
+    def test_writes_invalidate_the_read_key(self, cached_app):
+        pet = Pet(id=13, name="rex")
+        cached_app.pet_api.add_pet(pet)
+        cached_app.pet_api.get_by_id_pet(pet.id)
+
+        pet.name = "max"
+        cached_app.pet_api.update_pet(pet)
+        assert cached_app.pet_api.get_by_id_pet(pet.id).data.name == "max"
+
+        cached_app.pet_api.delete_pet(pet.id)
+        assert cached_app.pet_api.get_by_id_pet(pet.id).status_code == 404
+        assert cached_app.cache.stats()["invalidations"] == 2
+
+    @pytest.mark.positive
+    def test_key_invalidated_during_revalidation(self, cached_app, clock, url):
+        pet = Pet(id=14, name="rex")
+        cached_app.pet_api.add_pet(pet)
+        cached_app.pet_api.get_by_id_pet(pet.id)
+        cache = cached_app.cache
+        adapter = cached_app.client.session.get_adapter(url)
+
+        def send(request, **kwargs):
+            # Another thread writes between the lookup and the 304 answer
+            if "If-None-Match" in request.headers:
+                cache.invalidate(request.url)
+            return LocalAdapter.send(adapter, request, **kwargs)
+
+        adapter.send = send
+        clock.now += 10
+        response = cached_app.pet_api.get_by_id_pet(pet.id)
+
+        assert response.status_code == 200
+        assert response.data == pet
+        assert cache.stats()["revalidations"] == 1
+        # The 304 predates the write, so the old entry must not come back
+        assert f"{url}/pet/{pet.id}" not in cache.entries
+
+    @pytest.mark.positive
+    def test_least_recently_used_entries_are_evicted(self, clock):
+        cache = ResponseCache(maxsize=2, clock=clock)
+        for key in ("a", "b"):
+            cache.store(key, object.__new__(_Response))
+        cache.lookup("a")
+        cache.store("c", object.__new__(_Response))
+
+        assert list(cache.entries) == ["a", "c"]
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.positive
+    def test_response_fetched_across_an_invalidation_is_not_stored(self, clock):
+        cache = ResponseCache(maxsize=2, clock=clock)
+        generation = cache.generation("a")
+        cache.invalidate("a")
+        cache.store("a", object.__new__(_Response), generation)
+
+        assert "a" not in cache.entries
+
+    @pytest.mark.positive
+    def test_dropped_generations_still_count_as_invalidated(self, clock):
+        cache = ResponseCache(maxsize=2, clock=clock)
+        generation = cache.generation("a")
+        for key in ("a", "b", "c"):
+            cache.invalidate(key)
+        cache.store("a", object.__new__(_Response), generation)
+
+        assert "a" not in cache.generations
+        assert "a" not in cache.entries
+
+
+class _Response:
+    headers = {}
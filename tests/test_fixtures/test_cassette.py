@@ -0,0 +1,67 @@
+import pytest
+
+from fixtures.cassette import Cassette, CassetteAdapter, CassetteMiss
+from fixtures.petstore.server import LocalAdapter, PetstoreServer
+from fixtures.resilience import CircuitBreaker, RetryPolicy
+
+
+class TestCassette:
+
+    @pytest.mark.positive
+    def test_replay_serves_the_recorded_exchanges_in_order(
+        self, tmp_path, local_client, url
+    ):
+        path = str(tmp_path / "cassette")
+        cassette = Cassette(path, mode="record")
+        client = local_client(
+            CassetteAdapter(cassette, LocalAdapter(PetstoreServer(), url))
+        )
+        client.request("GET", f"{url}/pet/5")
+        client.request("POST", f"{url}/pet", json={"name": "rex", "id": 5})
+        client.request("GET", f"{url}/pet/5")
+        cassette.close()
+
+        cassette = Cassette(path, mode="replay")
+        client = local_client(CassetteAdapter(cassette))
+        assert client.request("GET", f"{url}/pet/5").status_code == 404
+        # Key order of the JSON body does not matter
+        client.request("POST", f"{url}/pet", json={"id": 5, "name": "rex"})
+        assert client.request("GET", f"{url}/pet/5").json()["name"] == "rex"
+        # Repeats beyond the recording get the last recorded answer
+        assert client.request("GET", f"{url}/pet/5").status_code == 200
+        cassette.close()
+
+    @pytest.mark.negative
+    def test_unrecorded_requests_fail(self, tmp_path, local_client, url):
+        path = str(tmp_path / "cassette")
+        Cassette(path, mode="record").close()
+        cassette = Cassette(path, mode="replay")
+
+        with pytest.raises(CassetteMiss):
+            local_client(CassetteAdapter(cassette)).request("GET", f"{url}/pet/1")
+
+    @pytest.mark.negative
+    def test_misses_are_not_retried_and_do_not_open_the_circuit(
+        self, tmp_path, local_client, url
+    ):
+        path = str(tmp_path / "cassette")
+        cassette = Cassette(path, mode="record")
+        client = local_client(
+            CassetteAdapter(cassette, LocalAdapter(PetstoreServer(), url))
+        )
+        client.request("GET", f"{url}/user/logout")
+        cassette.close()
+
+        cassette = Cassette(path, mode="replay")
+        breaker = CircuitBreaker(failure_threshold=2)
+        client = local_client(
+            CassetteAdapter(cassette), retry=RetryPolicy(total=2), breaker=breaker
+        )
+        for _ in range(3):
+            with pytest.raises(CassetteMiss):
+                client.request("GET", f"{url}/pet/1")
+
+        assert breaker.state(url) == CircuitBreaker.CLOSED
+        assert client.stats.summary()["GET /v2/pet/1"]["count"] == 3
+        assert client.request("GET", f"{url}/user/logout").status_code == 200
+        cassette.close()
@@ -0,0 +1,61 @@
+import json
+import sys
+
+import pytest
+
+from common import codec
+
+
+@pytest.fixture
+def client(local_client):
+    return local_client()
+
+
+@pytest.fixture
+def restore_codec():
+    previous = codec.codec
+    yield
+    codec.codec = previous
+
+
+class CountingCodec(codec.StdlibCodec):
+    def __init__(self):
+        self.decoded = 0
+
+    def loads(self, data):
+        self.decoded += 1
+        return super().loads(data)
+
+
+class TestCodec:
+
+    @pytest.mark.positive
+    def test_response_body_is_decoded_once(self, client, restore_codec, url):
+        codec.codec = counting = CountingCodec()
+        response = client.request("GET", f"{url}/store/inventory")
+
+        assert codec.decode(response) is codec.decode(response)
+        assert counting.decoded == 1
+
+    @pytest.mark.positive
+    def test_request_body_is_encoded_by_the_codec(self, client, url):
+        pet = {"id": 31, "name": "Мурзик", "photoUrls": []}
+        response = client.request("POST", f"{url}/pet", json=pet)
+
+        assert response.status_code == 200
+        assert response.request.headers["Content-Type"] == "application/json"
+        assert json.loads(response.request.body) == pet
+        # The request log reuses the encoded object instead of parsing the body
+        assert codec.decode(response.request) is pet
+
+    @pytest.mark.positive
+    def test_auto_falls_back_to_the_standard_library(self, monkeypatch, restore_codec):
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        codec.configure("auto")
+
+        assert codec.codec.name == "stdlib"
+
+    @pytest.mark.negative
+    def test_unknown_codec_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown JSON codec"):
+            codec.configure("simplejson")
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+import requests
+
+from fixtures.app import Application
+from fixtures.batch import run_batch
+from fixtures.contract import Contract, ContractViolation
+from fixtures.petstore.pet.model import Pet
+from fixtures.petstore.server import LocalAdapter, PetstoreServer
+
+
+def response(method: str, url: str, status: int, body) -> requests.Response:
+    res = requests.Response()
+    res.status_code = status
+    res._content = json.dumps(body).encode()
+    res.request = requests.Request(method, url).prepare()
+    return res
+
+
+@pytest.fixture(scope="module")
+def contract():
+    return Contract.load()
+
+
+class TestContract:
+
+    @pytest.mark.negative
+    def test_violations_are_reported_with_json_paths(self, contract, url):
+        body = {
+            "id": "7",
+            "category": {"id": 1, "name": 2},
+            "photoUrls": ["a", None],
+            "tags": [{"id": True}],
+            "status": "lost",
+        }
+
+        with pytest.raises(ContractViolation) as error:
+            contract.check(response("GET", f"{url}/pet/7", 200, body), url)
+
+        assert error.value.operation == "getPetById"
+        assert sorted(error.value.violations) == [
+            "$.category.name: expected string, got int",
+            "$.id: expected integer, got string",
+            "$.photoUrls[1]: expected string, got null",
+            "$.status: 'lost' is not one of ['available', 'pending', 'sold']",
+            "$.tags[0].id: expected integer, got boolean",
+            "$: missing required property 'name'",
+        ]
+
+    @pytest.mark.positive
+    def test_validators_are_compiled_once_per_operation_and_status(self, contract, url):
+        pets = [{"id": i, "name": "rex", "photoUrls": []} for i in range(3)]
+
+        for _ in range(2):
+            contract.check(
+                response("GET", f"{url}/pet/findByStatus?status=sold", 200, pets), url
+            )
+        contract.check(response("GET", f"{url}/pet/1", 404, {"code": 1}), url)
+
+        assert ("findPetsByStatus", 200) in contract.validators
+        assert ("getPetById", 404) in contract.validators
+
+    @pytest.mark.positive
+    def test_concurrent_checks_are_all_counted(self, url):
+        contract = Contract.load()
+        ok = response(
+            "GET", f"{url}/pet/1", 200, {"id": 1, "name": "rex", "photoUrls": []}
+        )
+        bad = response("GET", f"{url}/pet/1", 200, {"id": 1})
+
+        def check(res):
+            try:
+                contract.check(res, url)
+            except ContractViolation:
+                pass
+
+        run_batch(check, [ok, bad] * 500, concurrency=8)
+
+        assert (contract.checked, contract.violations) == (1000, 500)
+
+    @pytest.mark.positive
+    def test_api_helpers_validate_structured_responses(self, local_client, url):
+        server = PetstoreServer()
+        client = local_client(LocalAdapter(server, url))
+        app = Application(url, client=client, contract=Contract.load())
+
+        assert app.pet_api.add_pet(Pet(id=5, name="rex")).status_code == 200
+        server.pets.put(6, {"id": 6, "photoUrls": [], "status": "lost"}, 0)
+        with pytest.raises(ContractViolation):
+            app.pet_api.get_by_id_pet(6)
+        assert app.contract.checked == 2
+        app.close()
+
+    @pytest.mark.negative
+    def test_streamed_responses_are_checked_before_and_while_reading(
+        self, contract, url
+    ):
+        pets = [{"id": 1, "name": "rex", "photoUrls": []}, {"id": 2, "photoUrls": []}]
+        res = response("GET", f"{url}/pet/findByStatus?status=sold", 200, pets)
+
+        with pytest.raises(ContractViolation, match="content type missing"):
+            contract.check_stream(res, url)
+
+        res.headers["Content-Type"] = "application/json; charset=utf-8"
+        check = contract.check_stream(res, url)
+        check(pets[0], 0)
+        with pytest.raises(ContractViolation, match=r"\$\[1\]: missing required"):
+            check(pets[1], 1)
+        with pytest.raises(
+            ContractViolation, match="status 500 is not in the contract"
+        ):
+            contract.check_stream(
+                response("GET", f"{url}/pet/findByStatus?status=sold", 500, None), url
+            )
@@ -0,0 +1,65 @@
+import json
+import logging
+
+import pytest
+from requests import PreparedRequest, Response
+
+from common import deco
+
+
+def make_response(body: dict) -> Response:
+    request = PreparedRequest()
+    request.prepare(method="POST", url="https://petstore.test/v2/pet", json=body)
+    response = Response()
+    response.status_code = 200
+    response.request = request
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+
+@deco.logging("Echo")
+def echo(response):
+    return response
+
+
+class TestDeco:
+
+    @pytest.fixture(autouse=True)
+    def restore_settings(self, monkeypatch):
+        # Whatever --log-body-limit and --log-structured set stays in effect afterwards
+        monkeypatch.setattr(deco, "MAX_BODY_LENGTH", deco.MAX_BODY_LENGTH)
+        monkeypatch.setattr(deco, "STRUCTURED", deco.STRUCTURED)
+
+    @pytest.mark.positive
+    def test_nothing_is_formatted_when_logger_is_disabled(self, monkeypatch, caplog):
+        caplog.set_level(logging.WARNING, logger="api")
+
+        def fail(_):
+            raise AssertionError("record was formatted")
+
+        monkeypatch.setattr(deco._Record, "__str__", fail)
+
+        assert echo(make_response({"id": 1})).status_code == 200
+
+    @pytest.mark.positive
+    def test_bodies_are_truncated(self, caplog):
+        caplog.set_level(logging.INFO, logger="api")
+        deco.configure(max_body_length=50, structured=False)
+
+        echo(make_response({"photoUrls": ["x" * 500]}))
+
+        request, response = caplog.messages[1:]
+        assert request.endswith("...") and len(request) < 200
+        assert response.endswith("...") and len(response) < 200
+
+    @pytest.mark.positive
+    def test_structured_records(self, caplog):
+        caplog.set_level(logging.INFO, logger="api")
+        deco.configure(structured=True)
+
+        echo(make_response({"id": 1}))
+
+        assert caplog.messages[2] == (
+            'event="response" method="POST" url="https://petstore.test/v2/pet" '
+            'status=200 elapsed_ms=0.0 body="{\\"id\\": 1}"'
+        )
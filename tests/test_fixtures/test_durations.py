@@ -0,0 +1,97 @@
+import types
+
+import pytest
+
+from fixtures.durations import DurationHistory, DurationScheduling
+
+
+class FakeConfig:
+    def __init__(self, workers: int):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f"{self.workers}*popen"] if name == "tx" else None
+
+    def getoption(self, name):
+        return None
+
+
+class FakeNode:
+    """
+    Worker controller that records what the scheduler sends it
+    """
+
+    def __init__(self, name: str):
+        self.gateway = types.SimpleNamespace(id=name)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+class TestDurationHistory:
+
+    @pytest.mark.positive
+    def test_longest_tests_are_scheduled_first(self):
+        history = DurationHistory({"a": 0.1, "b": 15.0, "c": 3.0})
+
+        assert history.order(["a", "b", "c"]) == [1, 2, 0]
+
+    @pytest.mark.positive
+    def test_unknown_tests_are_expected_to_take_the_mean(self):
+        history = DurationHistory({"a": 1.0, "b": 5.0})
+
+        assert history.order(["a", "new", "b"]) == [2, 1, 0]
+
+    @pytest.mark.positive
+    def test_new_measurements_are_smoothed(self, tmp_path):
+        history = DurationHistory({"a": 10.0}, smoothing=0.5)
+        history.update({"a": 2.0, "b": 1.0})
+        history.save(tmp_path / "durations.json")
+
+        assert DurationHistory.load(tmp_path / "durations.json") == {
+            "a": 6.0,
+            "b": 1.0,
+        }
+
+
+class TestDurationScheduling:
+
+    @pytest.mark.positive
+    def test_longest_tests_are_sent_first_two_per_node(self):
+        collection = ["a", "b", "c", "d", "e", "f"]
+        history = DurationHistory(
+            {"a": 1.0, "b": 6.0, "c": 2.0, "d": 5.0, "e": 4.0, "f": 3.0}
+        )
+        scheduling = DurationScheduling(FakeConfig(workers=2), history=history)
+        first, second = FakeNode("gw0"), FakeNode("gw1")
+        for node in (first, second):
+            scheduling.add_node(node)
+            scheduling.add_node_collection(node, collection)
+
+        scheduling.schedule()
+
+        # b, d, e, f, c, a by duration; at most two queued per worker
+        assert first.sent == [1, 3]
+        assert second.sent == [4, 5]
+        assert scheduling.pending == [2, 0]
+        assert not first.shutting_down and not second.shutting_down
+
+        scheduling.mark_test_complete(second, 4)
+        assert second.sent == [4, 5, 2]
+        assert scheduling.node2pending[second] == [5, 2]
+
+        scheduling.mark_test_complete(first, 1)
+        # The last test was handed out: workers shut down once nothing is pending
+        assert first.sent == [1, 3, 0]
+        assert scheduling.pending == []
+        assert first.shutting_down
+        assert not second.shutting_down
+
+        scheduling.mark_test_complete(second, 5)
+        assert second.shutting_down
+        assert scheduling.node2pending[first] == [3, 0]
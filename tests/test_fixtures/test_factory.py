@@ -0,0 +1,35 @@
+import pytest
+
+from fixtures.factory import ModelFactory
+from fixtures.petstore.pet.model import Pet
+
+
+class TestModelFactory:
+
+    @pytest.mark.positive
+    def test_bulk_objects_are_distinct(self):
+        factory = ModelFactory(seed=1)
+
+        pets = factory.pets(1000)
+        users = factory.users(1000)
+
+        assert len({pet.id for pet in pets}) == 1000
+        assert len({user.username for user in users}) == 1000
+        assert len({id(pet.photoUrls) for pet in pets}) == 1000
+        assert {pet.id for pet in pets}.isdisjoint(user.id for user in users)
+
+    @pytest.mark.positive
+    def test_same_seed_gives_same_data(self):
+        def factory(seed):
+            return ModelFactory(seed=seed, pool_size=50)
+
+        assert factory(7).orders(50) == factory(7).orders(50)
+        assert factory(7).users(5) != factory(8).users(5)
+
+    @pytest.mark.positive
+    def test_random_models_do_not_share_values(self):
+        first, second = Pet.random(), Pet.random()
+
+        assert first.id != second.id
+        assert first.photoUrls is not second.photoUrls
+        assert Pet().photoUrls is not Pet().photoUrls
@@ -0,0 +1,36 @@
+import pytest
+
+from fixtures.load import LoadConfig, parse_mix, run_load
+
+
+class TestLoad:
+
+    @pytest.mark.positive
+    def test_mix_is_parsed_into_weights(self):
+        assert parse_mix("get_by_id_pet=60, add_order=20,login") == {
+            "get_by_id_pet": 60.0,
+            "add_order": 20.0,
+            "login": 1.0,
+        }
+
+    @pytest.mark.negative
+    def test_unknown_operation_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown operation 'get_pet'"):
+            parse_mix("get_pet=1")
+
+    @pytest.mark.positive
+    def test_request_count_is_split_across_workers(self, url):
+        config = LoadConfig(
+            url=url,
+            mix=parse_mix("get_by_id_pet=3,login=1"),
+            requests=101,
+            seed_entities=2,
+            local_server={},
+            seed=1,
+        )
+
+        result = run_load(config, workers=3)
+
+        assert result.total == 101
+        assert set(result.histograms) == {"get_by_id_pet", "login"}
+        assert not result.errors
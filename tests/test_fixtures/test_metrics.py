@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from fixtures.metrics import Histogram
+
+
+class TestHistogram:
+
+    @pytest.mark.positive
+    def test_percentiles_have_bounded_relative_error(self):
+        values = [i / 1000 for i in range(1, 1001)]
+        random.Random(1).shuffle(values)
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.01)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.01)
+        assert histogram.percentile(100) == pytest.approx(1.0, rel=0.01)
+        assert histogram.count == 1000
+
+    @pytest.mark.positive
+    def test_merged_histograms_match_a_single_one(self):
+        single, left, right = Histogram(), Histogram(), Histogram()
+        for value in range(1, 201):
+            single.record(value / 100)
+            (left if value % 2 else right).record(value / 100)
+
+        merged = Histogram.from_dict(left.to_dict()).merge(right)
+
+        assert merged.summary() == pytest.approx(single.summary())
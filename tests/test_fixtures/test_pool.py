@@ -0,0 +1,101 @@
+import pytest
+
+from fixtures.factory import ModelFactory
+from fixtures.pool import EntityPool
+from fixtures.waiter import Waiter
+
+
+@pytest.fixture
+def pool(local_app):
+    app = local_app
+    return EntityPool(
+        name="pet",
+        create=ModelFactory(seed=1).pets,
+        add=app.pet_api.add_pets,
+        delete=app.pet_api.delete_pets,
+        read=app.pet_api.get_by_id_pet,
+        key=lambda pet: pet.id,
+        waiter=app.waiter,
+    )
+
+
+class TestEntityPool:
+
+    @pytest.mark.positive
+    def test_read_only_leases_reuse_entities(self, pool):
+        pool.fill(2)
+
+        with pool.lease() as first:
+            first.name = "changed locally"
+        with pool.lease() as second, pool.lease() as third:
+            assert {second.id, third.id} == set(pool.entities)
+        assert pool.stats() == {"created": 2, "leases": 3, "idle": 2, "retired": 0}
+        assert all(pet.name != "changed locally" for pet in pool.entities.values())
+
+    @pytest.mark.positive
+    def test_mutated_entities_are_replaced_and_deleted_at_close(self, pool, local_app):
+        pool.fill(1)
+
+        with pool.lease(mutates=True) as pet:
+            local_app.pet_api.delete_pet(pet.id)
+        with pool.lease() as replacement:
+            assert replacement.id != pet.id
+            assert local_app.pet_api.get_by_id_pet(replacement.id).status_code == 200
+
+        pool.close()
+        assert local_app.pet_api.get_by_id_pet(replacement.id).status_code == 404
+        assert pool.stats()["retired"] == 0
+
+    @pytest.mark.positive
+    def test_exhausted_pool_grows(self, pool, local_app):
+        with pool.lease() as pet:
+            assert local_app.pet_api.get_by_id_pet(pet.id).status_code == 200
+        assert pool.stats()["created"] == 1
+
+    @pytest.mark.negative
+    def test_unreadable_entities_are_retired_instead_of_leased(self, local_app):
+        pool = EntityPool(
+            name="pet",
+            create=ModelFactory(seed=1).pets,
+            add=local_app.pet_api.add_pets,
+            delete=local_app.pet_api.delete_pets,
+            # Never becomes readable, e.g. a backend that lost the write
+            read=lambda pet_id: local_app.pet_api.get_by_id_pet(-1),
+            key=lambda pet: pet.id,
+            waiter=Waiter(timeout=0.05, initial_delay=0.01),
+        )
+
+        with pytest.raises(AssertionError, match="not readable"):
+            pool.fill(2)
+        assert pool.stats() == {"created": 2, "leases": 0, "idle": 0, "retired": 2}
+        pool.close()
+
+    @pytest.mark.negative
+    def test_unreadable_idle_entity_is_retired_and_the_next_one_leased(self, local_app):
+        pool = EntityPool(
+            name="pet",
+            create=ModelFactory(seed=1).pets,
+            add=local_app.pet_api.add_pets,
+            delete=local_app.pet_api.delete_pets,
+            read=local_app.pet_api.get_by_id_pet,
+            key=lambda pet: pet.id,
+            waiter=Waiter(timeout=0.05, initial_delay=0.01),
+        )
+        pool._add(2)
+        lost = pool.idle[0]
+        local_app.pet_api.delete_pet(lost)
+
+        with pool.lease() as pet:
+            assert pet.id != lost
+        assert pool.stats() == {"created": 2, "leases": 1, "idle": 1, "retired": 1}
+        pool.close()
+
+    @pytest.mark.negative
+    def test_failed_replacement_does_not_hide_the_test_error(self, pool):
+        pool.fill(1)
+        pool.create = lambda count: 1 / 0
+
+        with pytest.raises(ValueError, match="from the test"):
+            with pool.lease(mutates=True):
+                raise ValueError("from the test")
+        assert pool.stats()["retired"] == 1
@@ -0,0 +1,48 @@
+import pytest
+
+from fixtures.ratelimit import RateLimiter
+
+
+class TestRateLimiter:
+
+    @pytest.mark.positive
+    def test_burst_is_sent_at_once_and_the_rest_at_the_rate(self, clock):
+        limiter = RateLimiter(rate=10, burst=3, clock=clock)
+
+        delays = [limiter.reserve() for _ in range(5)]
+
+        assert delays == pytest.approx([0, 0, 0, 0.1, 0.2])
+        clock.now += 1.0
+        assert limiter.reserve() == 0
+        assert limiter.stats()["waits"] == 2
+
+    @pytest.mark.positive
+    def test_processes_sharing_the_file_share_one_budget(self, tmp_path, clock):
+        path = str(tmp_path / "api.bucket")
+        # Separate descriptors lock the file like separate xdist workers do
+        first = RateLimiter(rate=5, burst=2, path=path, clock=clock)
+        second = RateLimiter(rate=5, burst=2, path=path, clock=clock)
+
+        delays = [limiter.reserve() for limiter in (first, second, first, second)]
+        first.close()
+        second.close()
+
+        assert delays == pytest.approx([0, 0, 0.2, 0.4])
+
+    @pytest.mark.positive
+    def test_client_waits_for_a_token_before_every_attempt(
+        self, clock, local_client, url
+    ):
+        pauses = []
+        limiter = RateLimiter(rate=2, burst=1, clock=clock, sleep=pauses.append)
+        client = local_client(limiter=limiter)
+
+        for _ in range(3):
+            assert client.request("GET", f"{url}/user/logout").status_code == 200
+
+        assert pauses == pytest.approx([0.5, 1.0])
+
+    @pytest.mark.negative
+    def test_rate_has_to_be_positive(self):
+        with pytest.raises(ValueError, match="positive"):
+            RateLimiter(rate=0)
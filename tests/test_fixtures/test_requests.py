@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import pytest
+
+from fixtures.petstore.server import AsyncLocalTransport, PetstoreServer
+from fixtures.requests import AsyncClient
+
+
+@pytest.fixture
+def client(url):
+    client = AsyncClient()
+    client.mount(url, AsyncLocalTransport(PetstoreServer(), url))
+    yield client
+    client.close()
+
+
+async def logout(client: AsyncClient, url: str):
+    response = await client.request("GET", f"{url}/user/logout")
+    assert response.status_code == 200
+    return next(pool for pool, _ in client._clients.values())
+
+
+class TestAsyncClientPools:
+
+    @pytest.mark.positive
+    def test_pool_is_closed_when_asyncio_run_finishes(self, client, url):
+        pools = [asyncio.run(logout(client, url)) for _ in range(3)]
+
+        assert all(pool.is_closed for pool in pools)
+        assert len(client._clients) == 0
+
+    @pytest.mark.positive
+    def test_close_closes_pools_of_loops_running_in_other_threads(self, client, url):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            pool = asyncio.run_coroutine_threadsafe(logout(client, url), loop).result(5)
+            client.close()
+
+            assert pool.is_closed
+            assert len(client._clients) == 0
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    @pytest.mark.positive
+    def test_aclose_closes_the_pool_of_the_running_loop(self, client, url):
+        async def run():
+            pool = await logout(client, url)
+            await client.aclose()
+            return pool
+
+        loop = asyncio.new_event_loop()
+        try:
+            # No shutdown_asyncgens: the pool is closed by aclose alone
+            assert loop.run_until_complete(run()).is_closed
+        finally:
+            loop.close()
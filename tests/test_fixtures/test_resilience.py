@@ -0,0 +1,151 @@
+import io
+
+import pytest
+import requests
+
+from fixtures.petstore.server import LocalAdapter, PetstoreServer
+from fixtures.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    RetryPolicy,
+)
+
+
+class FlakyAdapter(LocalAdapter):
+    def __init__(self, server, base_url, failures):
+        super().__init__(server, base_url)
+        self.failures = list(failures)
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            response = super().send(request, **kwargs)
+            response.status_code = failure
+            return response
+        return super().send(request, **kwargs)
+
+
+class TestRetryPolicy:
+
+    @pytest.mark.positive
+    def test_transient_failures_are_retried(self, monkeypatch, local_client, url):
+        monkeypatch.setattr("fixtures.requests.time.sleep", lambda _: None)
+        adapter = FlakyAdapter(
+            PetstoreServer(), url, [503, requests.exceptions.ConnectionError()]
+        )
+        client = local_client(adapter, retry=RetryPolicy(total=2))
+
+        response = client.request("GET", f"{url}/user/logout")
+
+        assert response.status_code == 200
+        assert adapter.sent == 3
+        assert client.stats.endpoints["GET /v2/user/logout"].statuses == {
+            "503": 1,
+            "ConnectionError": 1,
+            "200": 1,
+        }
+
+    @pytest.mark.positive
+    def test_discarded_streamed_responses_are_closed(
+        self, monkeypatch, local_client, url
+    ):
+        monkeypatch.setattr("fixtures.requests.time.sleep", lambda _: None)
+        responses = []
+
+        class StreamingAdapter(FlakyAdapter):
+            def send(self, request, **kwargs):
+                response = super().send(request, **kwargs)
+                # Body left unread on the connection, as with stream=True
+                response.raw = io.BytesIO(response._content)
+                response._content = False
+                responses.append(response)
+                return response
+
+        client = local_client(
+            StreamingAdapter(PetstoreServer(), url, [503]), retry=RetryPolicy(total=1)
+        )
+        response = client.request("GET", f"{url}/user/logout", stream=True)
+
+        assert response.status_code == 200
+        assert [r.raw.closed for r in responses] == [True, False]
+        assert response.json() is not None
+
+    @pytest.mark.negative
+    def test_non_idempotent_requests_are_not_retried(self, local_client, url):
+        adapter = FlakyAdapter(PetstoreServer(), url, [503])
+        client = local_client(adapter, retry=RetryPolicy(total=2))
+
+        response = client.request("POST", f"{url}/pet", json={"id": 1})
+
+        assert response.status_code == 503
+        assert adapter.sent == 1
+
+    @pytest.mark.negative
+    def test_budget_caps_retries(self, monkeypatch, local_client, url):
+        monkeypatch.setattr("fixtures.requests.time.sleep", lambda _: None)
+        budget = RetryBudget(ratio=0.0, initial=1)
+        adapter = FlakyAdapter(PetstoreServer(), url, [503] * 10)
+        client = local_client(adapter, retry=RetryPolicy(total=5, budget=budget))
+
+        assert client.request("GET", f"{url}/user/logout").status_code == 503
+        assert adapter.sent == 2
+        assert budget.retries == 1
+        assert budget.exhausted == 1
+
+    @pytest.mark.negative
+    def test_non_retryable_errors_are_not_retried(self):
+        class ReplayOnly(requests.exceptions.ConnectionError):
+            pass
+
+        policy = RetryPolicy(total=2, non_retryable=(ReplayOnly,))
+
+        assert policy.delay("GET", 0, error=ReplayOnly()) is None
+        assert policy.delay("GET", 0, error=CircuitOpenError()) is None
+        assert policy.delay("GET", 0, error=requests.exceptions.ConnectionError())
+
+    @pytest.mark.positive
+    def test_retry_after_header_is_honoured(self):
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "3"
+
+        assert RetryPolicy().delay("GET", 0, response=response) == 3.0
+
+
+class TestCircuitBreaker:
+
+    @pytest.mark.negative
+    def test_open_circuit_fails_fast_until_the_probe_succeeds(
+        self, clock, local_client, url
+    ):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        adapter = FlakyAdapter(PetstoreServer(), url, [500, 500])
+        client = local_client(adapter, breaker=breaker)
+
+        client.request("GET", f"{url}/user/logout")
+        client.request("GET", f"{url}/user/logout")
+        with pytest.raises(CircuitOpenError):
+            client.request("GET", f"{url}/user/logout")
+        assert adapter.sent == 2
+
+        clock.now += 10
+        assert client.request("GET", f"{url}/user/logout").status_code == 200
+        assert breaker.state(url) == CircuitBreaker.CLOSED
+
+    @pytest.mark.negative
+    def test_failed_probe_reopens_the_circuit(self, clock, url):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+
+        breaker.record(url, ok=False)
+        clock.now += 10
+        breaker.before(url)
+        breaker.record(url, ok=False)
+
+        assert breaker.state(url) == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before(url)
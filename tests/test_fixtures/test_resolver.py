@@ -0,0 +1,118 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fixtures.metrics import ClientStats
+from fixtures.requests import Client
+from fixtures.resolver import Resolver
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    accepted = 0
+
+    def get_request(self):
+        self.accepted += 1
+        return super().get_request()
+
+
+@pytest.fixture
+def http_server():
+    server = CountingServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestResolver:
+
+    @pytest.mark.positive
+    def test_addresses_are_cached_until_the_ttl_expires(self, monkeypatch, clock):
+        calls = []
+
+        def getaddrinfo(host, port, **kwargs):
+            calls.append(host)
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port))]
+
+        monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+        resolver = Resolver(ttl=10, clock=clock)
+
+        assert resolver.resolve("api.test", 443) == "10.0.0.1"
+        assert resolver.resolve("api.test", 443) == "10.0.0.1"
+        clock.now = 11
+        resolver.resolve("api.test", 443)
+
+        assert calls == ["api.test", "api.test"]
+        assert resolver.stats() == {"lookups": 2, "hits": 1}
+
+    @pytest.mark.negative
+    def test_failed_lookup_serves_the_last_address(self, monkeypatch, clock):
+        answers = [[(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 80))]]
+
+        def getaddrinfo(host, port, **kwargs):
+            if not answers:
+                raise socket.gaierror("temporary failure")
+            return answers.pop()
+
+        monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+        resolver = Resolver(ttl=10, clock=clock)
+        resolver.resolve("api.test", 80)
+        clock.now = 11
+
+        assert resolver.resolve("api.test", 80) == "10.0.0.1"
+        with pytest.raises(socket.gaierror):
+            resolver.resolve("other.test", 80)
+
+
+class TestWarmUp:
+
+    @pytest.mark.positive
+    def test_warm_connections_are_reused_by_requests(self, http_server):
+        url = f"http://localhost:{http_server.server_address[1]}/v2"
+        stats = ClientStats()
+        client = Client(pool_maxsize=4, stats=stats, resolver=Resolver())
+
+        result = client.warm_up(url, connections=3)
+        for _ in range(3):
+            assert client.request("GET", f"{url}/pet/1").status_code == 200
+        client.close()
+
+        assert result["host"] == "localhost"
+        assert result["connections"] == 3
+        assert http_server.accepted == 3
+        summary = stats.summary()
+        assert summary["warm-up: connect"]["count"] == 3
+        assert summary["warm-up: resolve"]["count"] == 1
+        assert summary["GET /v2/pet/1"]["count"] == 3
+
+    @pytest.mark.positive
+    def test_warm_up_is_capped_by_the_pool_size(self, http_server):
+        url = f"http://127.0.0.1:{http_server.server_address[1]}"
+        client = Client(pool_maxsize=2)
+
+        assert client.warm_up(url, connections=5)["connections"] == 2
+        client.close()
+
+    @pytest.mark.negative
+    def test_warm_up_skips_urls_of_other_adapters(self, local_client, url):
+        client = local_client(resolver=Resolver())
+
+        assert client.warm_up(url, connections=2) == {}
+        assert client.resolver.stats() == {"lookups": 0, "hits": 0}
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from fixtures.scenario import Scenario
+
+
+class TestScenario:
+
+    @pytest.mark.positive
+    def test_results_are_passed_to_dependent_steps(self):
+        scenario = (
+            Scenario("data passing")
+            .step("pet", lambda: {"id": 1})
+            .step("order", lambda pet: {"petId": pet["id"]}, after=["pet"])
+        )
+
+        assert scenario.run() == {"pet": {"id": 1}, "order": {"petId": 1}}
+
+    @pytest.mark.positive
+    def test_independent_branches_run_concurrently(self):
+        # Both branches have to be in flight at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        scenario = (
+            Scenario("branches")
+            .step("user", barrier.wait)
+            .step("pet", barrier.wait)
+            .step("order", lambda user, pet: "placed", after=["user", "pet"])
+        )
+
+        assert scenario.run()["order"] == "placed"
+
+    @pytest.mark.positive
+    def test_critical_path_follows_the_slowest_dependency(self):
+        scenario = (
+            Scenario("critical path")
+            .step("fast", lambda: None)
+            .step("slow", lambda: time.sleep(0.05))
+            .step("join", lambda fast, slow: None, after=["fast", "slow"])
+        )
+        scenario.run()
+
+        assert scenario.critical_path() == ["slow", "join"]
+        assert "critical path: slow -> join" in scenario.report()
+
+    @pytest.mark.negative
+    def test_dependents_of_a_failed_step_are_skipped(self):
+        def fail():
+            raise AssertionError("add_pet returned 500")
+
+        scenario = (
+            Scenario("failure")
+            .step("pet", fail)
+            .step("order", lambda pet: "placed", after=["pet"])
+        )
+
+        with pytest.raises(AssertionError, match="returned 500"):
+            scenario.run()
+        assert scenario.steps["pet"].status == "failed"
+        assert scenario.steps["order"].status == "skipped"
+
+    @pytest.mark.negative
+    def test_dependencies_have_to_be_declared_first(self):
+        with pytest.raises(ValueError, match="undeclared"):
+            Scenario("order").step("order", lambda pet: None, after=["pet"])
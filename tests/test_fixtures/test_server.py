@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from fixtures.petstore.server import PetstoreServer
+
+
+class TestPetstoreServer:
+
+    @pytest.mark.positive
+    def test_writes_become_readable_after_the_lag(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("fixtures.petstore.server.time.monotonic", lambda: now[0])
+        server = PetstoreServer(consistency_lag=2.0)
+
+        status, _, _ = server.handle(
+            "POST", "/pet", body=json.dumps({"id": 7}).encode()
+        )
+        assert status == 200
+        assert server.handle("GET", "/pet/7")[0] == 404
+
+        now[0] += 2.0
+        assert server.handle("GET", "/pet/7")[:2] == (200, {"id": 7})
+
+    @pytest.mark.negative
+    def test_injected_errors(self):
+        server = PetstoreServer(error_rate=1.0, seed=1)
+
+        status, body, _ = server.handle("GET", "/user/logout")
+
+        assert status == 500
+        assert body["message"] == "something bad happened"
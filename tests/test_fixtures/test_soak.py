@@ -0,0 +1,92 @@
+import socket
+
+import pytest
+
+from fixtures.load import LoadConfig, parse_mix
+from fixtures.soak import (
+    SOAK_MIX,
+    TOLERANCES,
+    SoakMonitor,
+    open_descriptors,
+    run_soak,
+)
+
+
+def monitor_with(values, resource="fds", warmup=0) -> SoakMonitor:
+    monitor = SoakMonitor(apps=[], warmup=warmup)
+    monitor.snapshots = [
+        {
+            "elapsed": float(i),
+            "requests": (i + 1) * 100,
+            "traced_kb": 1000,
+            "fds": 10,
+            "sockets": 2,
+            "pools": 1,
+            "pooled_connections": 4,
+            resource: value,
+        }
+        for i, value in enumerate(values)
+    ]
+    return monitor
+
+
+class TestSoakMonitor:
+
+    @pytest.mark.negative
+    def test_steady_growth_is_flagged(self):
+        monitor = monitor_with([10, 11, 12, 13, 14, 15, 16, 17])
+
+        assert monitor.leaks() == ["fds grew from 10 to 16 over 700 requests"]
+
+    @pytest.mark.positive
+    def test_spikes_and_plateaus_are_not_flagged(self):
+        spikes = monitor_with([10, 30, 10, 30, 10, 30, 10, 30])
+        plateau = monitor_with(
+            [4000, 4000, 4300, 4200, 4300, 4300, 4250, 4300], "traced_kb"
+        )
+
+        assert spikes.leaks() == []
+        assert plateau.leaks() == []
+
+    @pytest.mark.positive
+    def test_warmup_snapshots_are_not_judged(self):
+        monitor = monitor_with([1, 5, 9, 10, 10, 10, 10, 10, 10, 10], warmup=2)
+
+        assert monitor.leaks() == []
+
+    @pytest.mark.positive
+    def test_report_columns_line_up(self):
+        header, row = monitor_with([10]).report().splitlines()[:2]
+
+        assert header.split() == ["elapsed", "requests", *TOLERANCES]
+        assert len(header) == len(row)
+
+    @pytest.mark.positive
+    def test_open_sockets_are_counted(self):
+        fds, sockets = open_descriptors()
+        if fds is None:
+            pytest.skip("/proc/self/fd is not available")
+        with socket.socket() as sock:
+            assert open_descriptors() == (fds + 1, sockets + 1)
+
+
+class TestRunSoak:
+
+    @pytest.mark.positive
+    def test_soak_run_takes_snapshots_and_finds_no_leak(self, url):
+        config = LoadConfig(
+            url=url,
+            mix=parse_mix(SOAK_MIX),
+            requests=100,
+            seed_entities=2,
+            local_server={},
+            seed=1,
+        )
+
+        result = run_soak(config, workers=2, interval=0.2, warmup=0)
+
+        assert result.load.total == 100
+        assert not result.load.errors
+        assert len(result.monitor.snapshots) >= 2
+        assert result.monitor.snapshots[-1]["requests"] >= 100
+        assert "sockets" in result.monitor.report()
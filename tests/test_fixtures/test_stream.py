@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from fixtures.stream import iter_json_array
+
+
+def chunks(text: str, size: int):
+    data = text.encode("utf-8")
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+class TestIterJsonArray:
+
+    @pytest.mark.positive
+    @pytest.mark.parametrize("size", [1, 3, 1024])
+    def test_elements_are_parsed_across_chunk_boundaries(self, size):
+        items = [{"id": 1, "name": "Мурка"}, 12345, "a, ]", [1, 2], None]
+
+        assert list(iter_json_array(chunks(json.dumps(items), size))) == items
+
+    @pytest.mark.positive
+    @pytest.mark.parametrize("size", [1, 2, 3, 5])
+    @pytest.mark.parametrize(
+        "text", ["[1.5, 2]", "[1e5, 2]", "[-12.25E-3,7]", "[0.5 , true, 1E+2 ]"]
+    )
+    def test_numbers_split_inside_their_text_are_parsed_whole(self, text, size):
+        assert list(iter_json_array(chunks(text, size))) == json.loads(text)
+
+    @pytest.mark.positive
+    def test_elements_are_yielded_before_the_body_is_complete(self):
+        def body():
+            yield b'[{"id": 1}, '
+            raise ConnectionError("download still running")
+
+        assert next(iter_json_array(body())) == {"id": 1}
+
+    @pytest.mark.negative
+    @pytest.mark.parametrize("text", ['{"id": 1}', '[{"id": 1}', "[1] 2"])
+    def test_malformed_bodies_are_rejected(self, text):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunks(text, 2)))
@@ -0,0 +1,40 @@
+import pytest
+
+from fixtures.waiter import Waiter
+
+
+class TestWaiter:
+
+    @pytest.mark.positive
+    def test_returns_as_soon_as_predicate_holds(self, clock):
+        waiter = Waiter(jitter=0, sleep=clock.sleep, clock=clock)
+        results = iter([404, 404, 200, 200])
+
+        result = waiter.until(lambda: next(results), lambda res: res == 200)
+
+        assert result == 200
+        assert clock.pauses == [0.2, 0.4]
+        assert waiter.records[-1].attempts == 3
+        assert waiter.records[-1].satisfied
+
+    @pytest.mark.positive
+    def test_backoff_is_capped_and_jittered_below_the_pause(self, clock):
+        waiter = Waiter(
+            timeout=100, max_delay=1.0, jitter=0.5, sleep=clock.sleep, clock=clock
+        )
+
+        waiter.until(lambda: 404, lambda res: False)
+
+        assert all(0 < pause <= 1.0 for pause in clock.pauses)
+        assert max(clock.pauses) > 0.5
+
+    @pytest.mark.negative
+    def test_stops_at_deadline_and_records_the_failure(self, clock):
+        waiter = Waiter(timeout=5, jitter=0, sleep=clock.sleep, clock=clock)
+
+        result = waiter.until(lambda: 404, lambda res: res == 200)
+
+        assert result == 404
+        assert clock.now == pytest.approx(5)
+        assert not waiter.records[-1].satisfied
+        assert waiter.records[-1].elapsed == pytest.approx(5)
@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+import allure
+
+from fixtures.petstore.pet.model import Pet
+
+
+@allure.epic("Pet Store API")
+@allure.feature("Async Clients")
+class TestAsync:
+
+    @pytest.mark.positive
+    @allure.story("Create Pets")
+    @allure.title("Add pets concurrently through the async client")
+    def test_add_pets_concurrently(self, app):
+        """
+        Test for adding several pets concurrently.
+        Steps:
+            1. Create pet objects with distinct IDs.
+            2. Add all pets to the store concurrently.
+            3. Assert that every response has status code 200.
+            4. Assert that every response is structured into a Pet object.
+        """
+        with allure.step("Create pet objects"):
+            pets = [Pet.random() for _ in range(10)]
+
+        async def add_pets():
+            try:
+                return await asyncio.gather(
+                    *(app.async_pet_api.add_pet(data=pet) for pet in pets)
+                )
+            finally:
+                await app.async_client.aclose()
+
+        with allure.step("Add pets to the store concurrently"):
+            responses = asyncio.run(add_pets())
+
+        with allure.step("Verify status codes are 200"):
+            assert [res.status_code for res in responses] == [200] * len(pets)
+
+        with allure.step("Verify response data are Pet objects"):
+            assert all(isinstance(res.data, Pet) for res in responses)
+            assert [res.data.id for res in responses] == [pet.id for pet in pets]
+
+    @pytest.mark.negative
+    @allure.story("Find Pets")
+    @allure.title("Streaming search is not offered on the async client")
+    def test_find_by_status_is_not_async(self, app):
+        """
+        Test that the blocking streamed search cannot be used from the event loop.
+        Steps:
+            1. Call find_by_status on the async pet API.
+            2. Assert that a TypeError points to the blocking helper.
+        """
+        with allure.step("Call find_by_status on the async pet API"):
+            with pytest.raises(TypeError, match="app.pet_api.find_by_status"):
+                app.async_pet_api.find_by_status("available")
@@ -1,8 +1,9 @@
-import time
 import logging
+from contextlib import closing
 import pytest
 import allure
 
+from common.attachments import attach
 from fixtures.petstore.pet.model import Pet, ApiResponse, Category
 
 
@@ -27,11 +28,11 @@ class TestPet:
 
         with allure.step("Add pet to the store"):
             res = app.pet_api.add_pet(data=data, type_response=Pet)
-            allure.attach(
-                str(data.__dict__), "Request Pet Data", allure.attachment_type.TEXT
-            )
-            allure.attach(
-                str(res.data.__dict__), "Response Pet Data", allure.attachment_type.TEXT
+            attach(str(data.to_dict()), "Request Pet Data", allure.attachment_type.TEXT)
+            attach(
+                str(res.data.to_dict()),
+                "Response Pet Data",
+                allure.attachment_type.TEXT,
             )
 
         with allure.step("Verify status code is 200"):
@@ -63,13 +64,11 @@ class TestPet:
                 tags=["test", "invalid"],
                 status="invalid_status",
             )
-            allure.attach(
-                str(data.__dict__), "Invalid Pet Data", allure.attachment_type.TEXT
-            )
+            attach(str(data.to_dict()), "Invalid Pet Data", allure.attachment_type.TEXT)
 
         with allure.step("Attempt to add the pet to the store"):
             response = app.pet_api.add_pet(data=data, type_response=ApiResponse)
-            allure.attach(response.text, "API Response", allure.attachment_type.TEXT)
+            attach(response.text, "API Response", allure.attachment_type.TEXT)
 
         with allure.step("Verify error status code (400 or 500)"):
             assert response.status_code in [
@@ -80,44 +79,18 @@ class TestPet:
     @pytest.mark.positive
     @allure.story("Retrieve Pets")
     @allure.title("Get pet by ID")
-    def test_get_pet_by_id(self, app):
+    def test_get_pet_by_id(self, app, pooled_pet):
         """
         Test for retrieving a pet by ID.
         Steps:
-            1. Create a new pet object.
-            2. Add pet to the store.
-            3. Retrieve the pet by its ID using a retry mechanism.
-            4. Assert that the response status code is 200.
-            5. Assert that the retrieved pet has the same ID and name.
+            1. Take a pet that is already in the store.
+            2. Retrieve the pet by its ID.
+            3. Assert that the response status code is 200.
+            4. Assert that the retrieved pet has the same ID and name.
         """
-        with allure.step("Create and add a new pet"):
-            data = Pet.random()
-            res_add = app.pet_api.add_pet(data=data, type_response=Pet)
-            assert res_add.status_code == 200, "Failed to add pet"
-            allure.attach(
-                str(res_add.data.__dict__),
-                "Created Pet Data",
-                allure.attachment_type.TEXT,
-            )
-            time.sleep(10)
-
-        @allure.step("Wait for pet to appear with ID {pet_id}")
-        def wait_for_pet_to_appear(pet_id, retries=5, delay=1):
-            for attempt in range(retries):
-                allure.attach(
-                    f"Attempt {attempt + 1}/{retries}",
-                    "Retry Information",
-                    allure.attachment_type.TEXT,
-                )
-                res_get = app.pet_api.get_by_id_pet(pet_id=pet_id, type_response=Pet)
-                if res_get.status_code == 200:
-                    return res_get
-                time.sleep(delay)
-            return res_get
-
-        with allure.step(f"Retrieve pet with ID {res_add.data.id}"):
-            res_get = wait_for_pet_to_appear(res_add.data.id)
-            allure.attach(
+        with allure.step(f"Retrieve pet with ID {pooled_pet.id}"):
+            res_get = app.pet_api.get_by_id_pet(pet_id=pooled_pet.id, type_response=Pet)
+            attach(
                 str(res_get.__dict__), "Get Pet Response", allure.attachment_type.TEXT
             )
 
@@ -128,10 +101,10 @@ class TestPet:
             assert isinstance(res_get.data, Pet), "Response data is not a Pet object"
 
         with allure.step("Verify pet ID matches"):
-            assert res_get.data.id == res_add.data.id, "Pet ID mismatch"
+            assert res_get.data.id == pooled_pet.id, "Pet ID mismatch"
 
         with allure.step("Verify pet name matches"):
-            assert res_get.data.name == data.name, "Pet name mismatch"
+            assert res_get.data.name == pooled_pet.name, "Pet name mismatch"
 
     @pytest.mark.negative
     @allure.story("Error Handling")
@@ -148,15 +121,13 @@ class TestPet:
         """
         with allure.step("Generate a non-existent pet ID"):
             non_existent_id = 999999999
-            allure.attach(
-                str(non_existent_id), "Non-existent ID", allure.attachment_type.TEXT
-            )
+            attach(str(non_existent_id), "Non-existent ID", allure.attachment_type.TEXT)
 
         with allure.step("Attempt to retrieve pet with non-existent ID"):
             response = app.pet_api.get_by_id_pet(
                 pet_id=non_existent_id, type_response=ApiResponse
             )
-            allure.attach(response.text, "API Response", allure.attachment_type.TEXT)
+            attach(response.text, "API Response", allure.attachment_type.TEXT)
 
         with allure.step("Verify response status code is 404"):
             assert (
@@ -169,105 +140,81 @@ class TestPet:
             ), "Response does not contain 'not found'"
 
     @pytest.mark.positive
+    @pytest.mark.mutates
     @allure.story("Update Pets")
     @allure.title("Update an existing pet")
-    def test_update_pet(self, app):
+    def test_update_pet(self, app, pooled_pet):
         """
         Test for updating a pet.
         Steps:
-            1. Create a new pet object.
-            2. Add pet to the store.
-            3. Modify the pet's name and status.
-            4. Update the pet through the API.
-            5. Assert that the update was successful.
-            6. Verify the updated fields match the expected values.
+            1. Take a pet that is already in the store.
+            2. Modify the pet's name and status.
+            3. Update the pet through the API.
+            4. Assert that the update was successful.
+            5. Verify the updated fields match the expected values.
         """
-        with allure.step("Create a new pet"):
-            new_pet = Pet.random()
-            allure.attach(
-                str(new_pet.__dict__), "Original Pet Data", allure.attachment_type.TEXT
-            )
-
-        with allure.step("Add pet to the store"):
-            created_pet = app.pet_api.add_pet(new_pet)
-            assert created_pet.status_code == 200, "Failed to add pet"
-            allure.attach(
-                str(created_pet.json()),
-                "Created Pet Response",
-                allure.attachment_type.JSON,
-            )
-            time.sleep(5)
+        attach(
+            str(pooled_pet.to_dict()), "Original Pet Data", allure.attachment_type.TEXT
+        )
 
         with allure.step("Modify pet's name and status"):
-            updated_pet = created_pet.json()
+            updated_pet = pooled_pet.to_dict()
             updated_pet["name"] = "UpdatedPetName"
             updated_pet["status"] = "sold"
-            allure.attach(
-                str(updated_pet), "Modified Pet Data", allure.attachment_type.TEXT
-            )
+            attach(str(updated_pet), "Modified Pet Data", allure.attachment_type.TEXT)
 
         with allure.step("Update the pet through API"):
             response = app.pet_api.update_pet(Pet(**updated_pet))
             assert response.status_code == 200, "Failed to update pet"
             updated_data = response.json()
-            allure.attach(
-                str(updated_data), "Update Response", allure.attachment_type.JSON
-            )
+            attach(str(updated_data), "Update Response", allure.attachment_type.JSON)
 
         with allure.step("Verify updated fields"):
-            assert updated_data["id"] == created_pet.json()["id"]
+            assert updated_data["id"] == pooled_pet.id
             assert updated_data["name"] == "UpdatedPetName"
             assert updated_data["status"] == "sold"
 
     @pytest.mark.positive
+    @pytest.mark.mutates
     @allure.story("Delete Pets")
     @allure.title("Delete a pet")
-    def test_delete_pet(self, app):
+    def test_delete_pet(self, app, pooled_pet):
         """
         Test for deleting a pet.
         Steps:
-            1. Create a new pet object.
-            2. Add pet to the store.
-            3. Delete the pet using its ID.
-            4. Try to retrieve the pet by ID.
-            5. Assert that the response status code for deletion is 200.
-            6. Assert that retrieving the pet after deletion returns a 404.
+            1. Take a pet that is already in the store.
+            2. Delete the pet using its ID.
+            3. Try to retrieve the pet by ID.
+            4. Assert that the response status code for deletion is 200.
+            5. Assert that retrieving the pet after deletion returns a 404.
         """
-        with allure.step("Create and add a new pet"):
-            data = Pet.random()
-            res_add = app.pet_api.add_pet(data=data, type_response=Pet)
-            assert res_add.status_code == 200
-            allure.attach(
-                str(res_add.data.__dict__),
-                "Created Pet Data",
-                allure.attachment_type.TEXT,
-            )
-
-        with allure.step("Wait for the pet to be fully created"):
-            time.sleep(3)
-
-        with allure.step(f"Delete pet with ID {res_add.data.id}"):
-            res_delete = app.pet_api.delete_pet(pet_id=res_add.data.id)
+        with allure.step(f"Delete pet with ID {pooled_pet.id}"):
+            res_delete = app.pet_api.delete_pet(pet_id=pooled_pet.id)
             assert res_delete.status_code == 200, "Delete request failed"
             logging.info(f"Delete response: {res_delete.json()}")
-            allure.attach(
+            attach(
                 str(res_delete.json()), "Delete Response", allure.attachment_type.JSON
             )
 
         with allure.step("Attempt to retrieve the deleted pet"):
-            res_get = app.pet_api.get_by_id_pet(pet_id=data.id, type_response=Pet)
-            allure.attach(
+            res_get = app.waiter.until(
+                lambda: app.pet_api.get_by_id_pet(
+                    pet_id=pooled_pet.id, type_response=Pet
+                ),
+                lambda res: res.status_code == 404,
+                description=f"pet {pooled_pet.id} is gone",
+            )
+            attach(
                 str(res_get.status_code),
                 "Get Deleted Pet Status Code",
                 allure.attachment_type.TEXT,
             )
-            time.sleep(10)
 
             if res_get.status_code == 200:
                 logging.warning(
                     f"Pet exists after deletion, response: {res_get.json()}"
                 )
-                allure.attach(
+                attach(
                     str(res_get.json()), "Pet Still Exists", allure.attachment_type.JSON
                 )
 
@@ -290,11 +237,9 @@ class TestPet:
         """
         with allure.step("Attempt to delete pet with non-existent ID"):
             non_existent_id = 999999999
-            allure.attach(
-                str(non_existent_id), "Non-existent ID", allure.attachment_type.TEXT
-            )
+            attach(str(non_existent_id), "Non-existent ID", allure.attachment_type.TEXT)
             response = app.pet_api.delete_pet(pet_id=non_existent_id)
-            allure.attach(
+            attach(
                 str(response.status_code),
                 "Delete Response Code",
                 allure.attachment_type.TEXT,
@@ -304,3 +249,75 @@ class TestPet:
             assert (
                 response.status_code == 404
             ), f"Expected: 404, Received: {response.status_code}"
+
+    @pytest.mark.positive
+    @allure.story("Create Pets")
+    @allure.title("Add and delete pets in a batch")
+    def test_add_and_delete_pets_in_batch(self, app):
+        """
+        Test for the batch helpers.
+        Steps:
+            1. Create several pet objects.
+            2. Add them with bounded concurrency.
+            3. Assert that every pet was added and results keep the input order.
+            4. Delete them with bounded concurrency.
+        """
+        with allure.step("Create pet objects"):
+            pets = [Pet.random() for _ in range(10)]
+
+        with allure.step("Add the pets concurrently"):
+            results = app.pet_api.add_pets(pets, concurrency=4)
+            assert all(result.ok for result in results)
+            assert [result.response.data.id for result in results] == [
+                pet.id for pet in pets
+            ]
+
+        with allure.step("Wait for the pets to be readable"):
+            for pet in pets:
+                app.waiter.until(
+                    lambda: app.pet_api.get_by_id_pet(pet_id=pet.id),
+                    lambda res: res.status_code == 200,
+                    description=f"pet {pet.id} is readable",
+                )
+
+        with allure.step("Delete the pets concurrently"):
+            results = app.pet_api.delete_pets([pet.id for pet in pets], concurrency=4)
+            assert [result.response.status_code for result in results] == [200] * 10
+
+    @pytest.mark.positive
+    @allure.story("Find Pets")
+    @allure.title("Find pets by status")
+    def test_find_pets_by_status(self, app, request):
+        """
+        Test for finding pets by status.
+        Steps:
+            1. Add a pet with status "pending".
+            2. Stream the pending pets until the new one is listed.
+            3. Assert that every listed pet is a structured Pet with status "pending".
+        """
+        with allure.step("Add a pending pet"):
+            data = Pet.random()
+            data.status = "pending"
+            app.pet_api.add_pet(data=data)
+            request.addfinalizer(lambda: app.pet_api.delete_pet(data.id))
+
+        def pending_pets():
+            pets = []
+            with closing(app.pet_api.find_by_status("pending")) as stream:
+                for pet in stream:
+                    pets.append(pet)
+                    if pet.id == data.id:
+                        break  # The rest of the list is not downloaded
+            return pets
+
+        with allure.step("Stream pending pets until the new pet is listed"):
+            pets = app.waiter.until(
+                pending_pets,
+                lambda pets: bool(pets) and pets[-1].id == data.id,
+                description=f"pet {data.id} is listed as pending",
+            )
+
+        with allure.step("Verify the listed pets"):
+            assert pets[-1].id == data.id
+            assert all(isinstance(pet, Pet) for pet in pets)
+            assert all(pet.status == "pending" for pet in pets)
@@ -1,8 +1,8 @@
-import time
 import pytest
 import logging
 import allure
 
+from common.attachments import attach
 from fixtures.petstore.store.model import Order
 
 
@@ -24,19 +24,19 @@ class TestStore:
         """
         with allure.step("Create a new order object"):
             data = Order.random()
-            allure.attach(
-                str(data.__dict__), "Order Request Data", allure.attachment_type.TEXT
+            attach(
+                str(data.to_dict()), "Order Request Data", allure.attachment_type.TEXT
             )
 
         with allure.step("Add the order to the store"):
             res = app.store_api.add_order(data=data)
-            allure.attach(
+            attach(
                 str(res.status_code),
                 "Response Status Code",
                 allure.attachment_type.TEXT,
             )
             if hasattr(res, "text"):
-                allure.attach(res.text, "Response Body", allure.attachment_type.TEXT)
+                attach(res.text, "Response Body", allure.attachment_type.TEXT)
 
         with allure.step("Verify response status code is 200"):
             assert res.status_code == 200
@@ -50,48 +50,26 @@ class TestStore:
     @pytest.mark.positive
     @allure.story("Retrieve Orders")
     @allure.title("Get order by ID")
-    def test_get_order_by_id(self, app):
+    def test_get_order_by_id(self, app, pooled_order):
         """
         Test for retrieving an order by its ID.
         Steps:
-            1. Create a new order object.
-            2. Add the order to the store.
-            3. Retrieve the order by its ID.
-            4. Verify that the response status code is 200.
-            5. Validate the retrieved order's ID.
+            1. Take an order that is already in the store.
+            2. Retrieve the order by its ID.
+            3. Verify that the response status code is 200.
+            4. Validate the retrieved order's ID.
         """
-        with allure.step("Create and add a new order"):
-            data = Order.random()
-            allure.attach(
-                str(data.__dict__), "Order Request Data", allure.attachment_type.TEXT
-            )
-            res_add = app.store_api.add_order(data=data)
-            assert res_add.status_code == 200
-            allure.attach(
-                str(res_add.data.__dict__),
-                "Created Order Data",
-                allure.attachment_type.TEXT,
-            )
-
-        with allure.step("Wait for order to be processed"):
-            time.sleep(5)
-
-        with allure.step(f"Retrieve order with ID {res_add.data.id}"):
+        with allure.step(f"Retrieve order with ID {pooled_order.id}"):
             res_get = app.store_api.get_order_by_id(
-                order_id=res_add.data.id, type_response=Order
+                order_id=pooled_order.id, type_response=Order
             )
-            allure.attach(
+            attach(
                 str(res_get.status_code),
                 "Get Response Status",
                 allure.attachment_type.TEXT,
             )
             if hasattr(res_get, "text"):
-                allure.attach(
-                    res_get.text, "Get Response Body", allure.attachment_type.TEXT
-                )
-
-        with allure.step("Wait for response processing"):
-            time.sleep(5)
+                attach(res_get.text, "Get Response Body", allure.attachment_type.TEXT)
 
         with allure.step("Verify get request status code is 200"):
             assert res_get.status_code == 200, "GET request failed"
@@ -102,7 +80,7 @@ class TestStore:
             ), "Response data is not an Order object"
 
         with allure.step("Verify order ID matches"):
-            assert res_get.data.id == data.id, "Order ID does not match"
+            assert res_get.data.id == pooled_order.id, "Order ID does not match"
 
     @pytest.mark.negative
     @allure.story("Error Handling")
@@ -116,78 +94,61 @@ class TestStore:
         """
         with allure.step("Attempt to get order with invalid ID"):
             invalid_order_id = 999999
-            allure.attach(
+            attach(
                 str(invalid_order_id), "Invalid Order ID", allure.attachment_type.TEXT
             )
             res_get = app.store_api.get_order_by_id(order_id=invalid_order_id)
-            allure.attach(
+            attach(
                 str(res_get.status_code),
                 "Response Status Code",
                 allure.attachment_type.TEXT,
             )
             if hasattr(res_get, "text"):
-                allure.attach(
-                    res_get.text, "Response Body", allure.attachment_type.TEXT
-                )
+                attach(res_get.text, "Response Body", allure.attachment_type.TEXT)
 
         with allure.step("Verify response status code is 404"):
             assert res_get.status_code == 404, "Expected 404 for non-existent order"
 
     @pytest.mark.positive
+    @pytest.mark.mutates
     @allure.story("Delete Orders")
     @allure.title("Delete an order")
-    def test_delete_order(self, app):
+    def test_delete_order(self, app, pooled_order):
         """
         Test for deleting an order.
         Steps:
-            1. Create a new order object.
-            2. Add the order to the store.
-            3. Delete the order.
-            4. Try to retrieve the deleted order by ID.
-            5. Verify that the deletion was successful.
-            6. Confirm that the deleted order no longer exists (should return 404).
+            1. Take an order that is already in the store.
+            2. Delete the order.
+            3. Try to retrieve the deleted order by ID.
+            4. Verify that the deletion was successful.
+            5. Confirm that the deleted order no longer exists (should return 404).
         """
-        with allure.step("Create and add a new order"):
-            data = Order.random()
-            allure.attach(
-                str(data.__dict__), "Order Request Data", allure.attachment_type.TEXT
-            )
-            res_add = app.store_api.add_order(data=data)
-            assert res_add.status_code == 200  # or 201
-            allure.attach(
-                str(res_add.data.__dict__),
-                "Created Order Data",
-                allure.attachment_type.TEXT,
-            )
-
-        with allure.step("Wait for order to be processed"):
-            time.sleep(5)
-
-        with allure.step(f"Delete order with ID {res_add.data.id}"):
-            res_delete = app.store_api.delete_order(order_id=res_add.data.id)
+        with allure.step(f"Delete order with ID {pooled_order.id}"):
+            res_delete = app.store_api.delete_order(order_id=pooled_order.id)
             assert res_delete.status_code == 200, "Deletion failed"
-            allure.attach(
+            attach(
                 str(res_delete.json()), "Delete Response", allure.attachment_type.JSON
             )
             logging.info(f"Delete response: {res_delete.json()}")
 
         with allure.step("Attempt to retrieve the deleted order"):
-            res_get = app.store_api.get_order_by_id(order_id=data.id)
-            allure.attach(
+            res_get = app.waiter.until(
+                lambda: app.store_api.get_order_by_id(order_id=pooled_order.id),
+                lambda res: res.status_code == 404,
+                description=f"order {pooled_order.id} is gone",
+            )
+            attach(
                 str(res_get.status_code),
                 "Get Deleted Order Status",
                 allure.attachment_type.TEXT,
             )
-            time.sleep(10)
-        with allure.step("Wait for response processing"):
-            time.sleep(5)
 
         with allure.step("Verify order is no longer available"):
             if res_get.status_code == 200:
                 logging.warning(
                     f"Order still exists after deletion, response: {res_get.json()}"
                 )
-                allure.attach(
+                attach(
                     str(res_get.json()),
                     "Order Still Exists",
                     allure.attachment_type.JSON,
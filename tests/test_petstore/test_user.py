@@ -1,7 +1,8 @@
-import time
 import pytest
 import allure
 
+from common.attachments import attach
+from fixtures.petstore.pet.model import ApiResponse
 from fixtures.petstore.user.model import User
 
 
@@ -14,54 +15,43 @@ class TestUser:
     def test_add_user(self, app):
         with allure.step("Create a new random user object"):
             data = User.random()
-            allure.attach(
-                str(data.__dict__), "User Request Data", allure.attachment_type.TEXT
+            attach(
+                str(data.to_dict()), "User Request Data", allure.attachment_type.TEXT
             )
 
         with allure.step("Add the user to the system"):
-            res = app.user_api.add_user(data=data)
-            allure.attach(
+            res = app.user_api.add_user(data=data, type_response=ApiResponse)
+            attach(
                 str(res.status_code),
                 "Response Status Code",
                 allure.attachment_type.TEXT,
             )
             if hasattr(res, "text"):
-                allure.attach(res.text, "Response Body", allure.attachment_type.TEXT)
-
-        time.sleep(5)
+                attach(res.text, "Response Body", allure.attachment_type.TEXT)
 
         with allure.step("Verify status code is 200"):
             assert res.status_code == 200
 
-        with allure.step("Verify response is a User object"):
-            assert isinstance(res.data, User)
+        with allure.step("Verify response is an ApiResponse object"):
+            assert isinstance(res.data, ApiResponse)
 
-        with allure.step("Verify username matches"):
-            assert res.data.username == data.username
+        with allure.step("Verify response message is the user ID"):
+            assert res.data.message == str(data.id)
 
     @pytest.mark.positive
     @allure.story("Get User")
     @allure.title("Retrieve a user by username")
-    def test_get_user_by_username(self, app):
-        with allure.step("Create and add a new user"):
-            data = User.random()
-            res_add = app.user_api.add_user(data=data)
-            assert res_add.status_code == 200
-
-        time.sleep(10)
-
+    def test_get_user_by_username(self, app, pooled_user):
         with allure.step("Get user by username"):
-            res_get = app.user_api.get_user_by_username(username=data.username)
-            allure.attach(
+            res_get = app.user_api.get_user_by_username(username=pooled_user.username)
+            attach(
                 str(res_get.status_code),
                 "Response Status Code",
                 allure.attachment_type.TEXT,
             )
 
-            time.sleep(5)
-
             assert res_get.status_code == 200
-            assert res_get.data.username == data.username
+            assert res_get.data.username == pooled_user.username
 
     @pytest.mark.negative
     @allure.story("Get User")
@@ -73,47 +63,40 @@ class TestUser:
             assert res.status_code == 404
 
     @pytest.mark.positive
+    @pytest.mark.mutates
     @allure.story("Update User")
     @allure.title("Update an existing user's information")
-    def test_update_user(self, app):
-        with allure.step("Create and add a user"):
-            data = User.random()
-            created_user = app.user_api.add_user(data)
-            assert created_user.status_code == 200
-
+    def test_update_user(self, app, pooled_user):
         with allure.step("Update user's first and last name"):
-            updated_user = created_user.data.to_dict()
+            updated_user = pooled_user.to_dict()
             updated_user["firstName"] = "UpdatedFirstName"
             updated_user["lastName"] = "UpdatedLastName"
 
         with allure.step("Submit update request"):
             response = app.user_api.update_user(User(**updated_user))
             assert response.status_code == 200
-            time.sleep(5)
 
         with allure.step("Get updated user and verify changes"):
-            res_get = app.user_api.get_user_by_username(
-                username=updated_user["username"]
+            res_get = app.waiter.until(
+                lambda: app.user_api.get_user_by_username(
+                    username=updated_user["username"]
+                ),
+                lambda res: res.status_code == 200
+                and res.data.firstName == "UpdatedFirstName",
+                description=f"user {updated_user['username']} is updated",
             )
-            time.sleep(10)
             assert res_get.status_code == 200
             get_user_data = res_get.data.to_dict()
             assert get_user_data["firstName"] == "UpdatedFirstName"
             assert get_user_data["lastName"] == "UpdatedLastName"
 
     @pytest.mark.positive
+    @pytest.mark.mutates
     @allure.story("Delete User")
     @allure.title("Delete an existing user")
-    def test_delete_user(self, app):
-        with allure.step("Create and add a user"):
-            data = User.random()
-            res_add = app.user_api.add_user(data=data, type_response=User)
-            assert res_add.status_code == 200
-
-        time.sleep(5)
-
+    def test_delete_user(self, app, pooled_user):
         with allure.step("Delete the user by username"):
-            res_delete = app.user_api.delete_user(username=data.username)
+            res_delete = app.user_api.delete_user(username=pooled_user.username)
             assert res_delete.status_code == 200
 
     @pytest.mark.negative
@@ -134,7 +117,12 @@ class TestUser:
             res_add = app.user_api.add_user(data=data, type_response=User)
             assert res_add.status_code == 200
 
-        time.sleep(5)
+        with allure.step("Wait for the user to be readable"):
+            app.waiter.until(
+                lambda: app.user_api.get_user_by_username(username=data.username),
+                lambda res: res.status_code == 200,
+                description=f"user {data.username} is readable",
+            )
 
         with allure.step("Login with user's credentials"):
             res_login = app.user_api.login(
@@ -149,3 +137,49 @@ class TestUser:
         with allure.step("Logout from the system"):
             res_logout = app.user_api.logout()
             assert res_logout.status_code == 200
+
+    @pytest.mark.positive
+    @allure.story("Create User")
+    @allure.title("Add several users with createWithArray")
+    def test_create_users_with_array(self, app):
+        with allure.step("Create random user objects"):
+            users = [User.random() for _ in range(3)]
+
+        with allure.step("Add the users in one request"):
+            res = app.user_api.create_with_array(users)
+            assert res.status_code == 200
+
+        with allure.step("Verify every user is readable"):
+            for user in users:
+                res_get = app.waiter.until(
+                    lambda: app.user_api.get_user_by_username(username=user.username),
+                    lambda res: res.status_code == 200,
+                    description=f"user {user.username} is readable",
+                )
+                assert res_get.data.username == user.username
+
+    @pytest.mark.positive
+    @allure.story("Create User")
+    @allure.title("Add and delete users in bulk")
+    def test_add_and_delete_users_in_bulk(self, app):
+        with allure.step("Create random user objects"):
+            users = [User.random() for _ in range(25)]
+
+        with allure.step("Add the users through createWithList in chunks"):
+            results = app.user_api.add_users(users, chunk_size=10, concurrency=3)
+            assert [result.item for result in results] == users
+            assert all(result.ok for result in results)
+
+        with allure.step("Wait for the last user to be readable"):
+            res_get = app.waiter.until(
+                lambda: app.user_api.get_user_by_username(username=users[-1].username),
+                lambda res: res.status_code == 200,
+                description=f"user {users[-1].username} is readable",
+            )
+            assert res_get.status_code == 200
+
+        with allure.step("Delete the users concurrently"):
+            results = app.user_api.delete_users(
+                [user.username for user in users], concurrency=5
+            )
+            assert all(result.ok for result in results)
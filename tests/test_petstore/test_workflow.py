@@ -0,0 +1,116 @@
+import allure
+import pytest
+
+from fixtures.petstore.pet.model import ApiResponse, Pet
+from fixtures.petstore.store.model import Order
+from fixtures.petstore.user.model import User
+from fixtures.scenario import Scenario
+
+
+def readable(app, read, description):
+    return app.waiter.until(
+        read, lambda res: res.status_code == 200, description=description
+    )
+
+
+def cleanup(app, scenario: Scenario, user: User, pet: Pet, order: Order):
+    """
+    Deletes the entities the add steps of scenario may have created, the order before its pet
+    """
+    # A step that raised, e.g. on a read timeout, may still have created its entity
+    created = {
+        name for name, record in scenario.steps.items() if record.status != "skipped"
+    }
+    deletes = Scenario("Delete the created entities")
+    if "add_order" in created:
+        deletes.step(
+            "delete_order", lambda: app.store_api.delete_order(order_id=order.id)
+        )
+    if "add_pet" in created:
+        deletes.step(
+            "delete_pet",
+            lambda **_: app.pet_api.delete_pet(pet_id=pet.id),
+            after=["delete_order"] if "delete_order" in deletes.steps else [],
+        )
+    if "add_user" in created:
+        deletes.step(
+            "delete_user", lambda: app.user_api.delete_user(username=user.username)
+        )
+    deletes.run()
+
+
+@allure.epic("Pet Store API")
+@allure.feature("Workflows")
+class TestWorkflow:
+
+    @pytest.mark.positive
+    @allure.story("Multi-entity Workflow")
+    @allure.title("A user buys a new pet")
+    def test_user_orders_a_new_pet(self, request, app):
+        """
+        Workflow across the user, pet and store APIs.
+        The user and the pet are created concurrently; the order waits for the pet only.
+        Steps:
+            1. Create a user and a pet.
+            2. Wait until both are readable.
+            3. Place an order for the pet.
+            4. Wait until the order is readable and check it references the pet.
+            5. Delete whatever was created, also when a step failed.
+        """
+        user, pet = User.random(), Pet.random()
+        order = Order.random()
+        order.petId = pet.id
+
+        scenario = (
+            Scenario("User orders a new pet")
+            .step(
+                "add_user",
+                lambda: app.user_api.add_user(data=user, type_response=ApiResponse),
+            )
+            .step("add_pet", lambda: app.pet_api.add_pet(data=pet))
+            .step(
+                "user_readable",
+                lambda add_user: readable(
+                    app,
+                    lambda: app.user_api.get_user_by_username(username=user.username),
+                    f"user {user.username} is readable",
+                ),
+                after=["add_user"],
+            )
+            .step(
+                "pet_readable",
+                lambda add_pet: readable(
+                    app,
+                    lambda: app.pet_api.get_by_id_pet(pet_id=add_pet.data.id),
+                    f"pet {pet.id} is readable",
+                ),
+                after=["add_pet"],
+            )
+            .step(
+                "add_order",
+                lambda pet_readable: app.store_api.add_order(data=order),
+                after=["pet_readable"],
+            )
+            .step(
+                "order_readable",
+                lambda add_order: readable(
+                    app,
+                    lambda: app.store_api.get_order_by_id(order_id=add_order.data.id),
+                    f"order {order.id} is readable",
+                ),
+                after=["add_order"],
+            )
+        )
+        request.addfinalizer(lambda: cleanup(app, scenario, user, pet, order))
+        results = scenario.run()
+
+        with allure.step("Verify every call succeeded"):
+            failed = {
+                name: res.status_code
+                for name, res in results.items()
+                if res.status_code != 200
+            }
+            assert not failed, f"unexpected status codes: {failed}"
+
+        with allure.step("Verify the order references the pet"):
+            assert results["order_readable"].data.petId == pet.id